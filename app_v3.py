@@ -1,5 +1,6 @@
 import os
 import uuid
+import hashlib
 import requests
 import streamlit as st
 from pathlib import Path
@@ -9,6 +10,7 @@ import time
 import sys
 from PIL import Image
 import io
+from datetime import datetime, timedelta, timezone
 
 # Configure logging
 logging.basicConfig(
@@ -32,18 +34,37 @@ from streamlit.components.v1 import html as st_html
 OUTPUT_DIR = "output"
 IMAGES_DIR = "images_to_process"
 
-@st.cache_data(ttl=3600)
-def get_thumbnail_url(project_id: int, page_id: int, token: str, base_url: str) -> str:
-    """Cached function to get thumbnail URL from backend."""
+THUMBNAIL_URL_MARGIN = timedelta(minutes=5)  # Refetch signed URLs this long before they expire
+
+def get_thumbnail_urls(project_id: int, page_ids: tuple, token: str, base_url: str) -> dict:
+    """
+    Get the thumbnail URLs of a page listing in one backend call.
+
+    Results are kept in the session until shortly before the first URL
+    expires; the backend may return cached URLs that were signed earlier,
+    so a fixed lifetime would outlive them.
+    """
+    if not page_ids:
+        return {}
+    cache = st.session_state.setdefault('thumbnail_urls', {})
+    key = (project_id, page_ids, token, base_url)
+    now = datetime.now(timezone.utc)
+    cached = cache.get(key)
+    if cached and (cached[1] is None or cached[1] - THUMBNAIL_URL_MARGIN > now):
+        return cached[0]
     try:
         from api_client import APIClient
         api = APIClient(base_url=base_url)
         api.token = token
-        url_data = api.get_download_url(project_id, page_id, file_type="original")
-        return url_data.get('url') if url_data else None
+        result = api.get_download_urls(project_id, file_type="original", page_ids=list(page_ids))
     except Exception as e:
-        logger.error(f"Failed to fetch thumbnail for page {page_id}: {e}")
-        return None
+        logger.error(f"Failed to fetch thumbnails for project {project_id}: {e}")
+        return {}
+    # Drop expired listings so the session cache does not grow without bound
+    for stale in [k for k, (_, expires_at) in cache.items() if expires_at and expires_at - THUMBNAIL_URL_MARGIN <= now]:
+        del cache[stale]
+    cache[key] = (result["urls"], result["expires_at"])
+    return result["urls"]
 
 def get_pdf_thumbnail(pdf_path: str, width: int = 200) -> Image.Image:
     """Convert first page of PDF to thumbnail image."""
@@ -137,6 +158,10 @@ def init_state():
     # NEW: Pagination state
     if 'current_page_offset' not in st.session_state:
         st.session_state.current_page_offset = 0
+    if 'page_cursor' not in st.session_state:
+        st.session_state.page_cursor = None  # after_page_number of the current view (None: use the offset)
+    if 'next_page_cursor' not in st.session_state:
+        st.session_state.next_page_cursor = None
     if 'page_size' not in st.session_state:
         st.session_state.page_size = 20  # Show 20 pages at a time
     if 'total_pages_count' not in st.session_state:
@@ -216,6 +241,37 @@ def render_auth_page():
                         else:
                             st.error(f"❌ Signup failed: {error_msg}")
 
+def assign_page_number(filename, existing_numbers):
+    """Pick a page number from the filename, or the next free number."""
+    import re
+    page_number = None
+    
+    # Robust patterns - strictly looking for page indicators or end-of-string numbers
+    patterns = [
+        r'page\s*[-_]?\s*(\d+)',    # page1, page-1, page_1
+        r'p\s*[-_]?\s*(\d+)',       # p1, p-1, p_1
+        r'[_-](\d+)\.[a-zA-Z0-9]+$', # _1.jpg, -1.jpg (at end of file)
+        r'^(\d+)\.[a-zA-Z0-9]+$'     # 1.jpg (start of file)
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, filename, re.IGNORECASE)
+        if match:
+            try:
+                extracted_num = int(match.group(1))
+                # Only use it if it's not already taken
+                if extracted_num not in existing_numbers:
+                    page_number = extracted_num
+                    break
+            except ValueError:
+                continue
+    
+    # If no valid page number found or collision, use next available
+    if page_number is None:
+        max_page = max(existing_numbers, default=0)
+        page_number = max_page + 1
+    return page_number
+
 def add_page(uploaded_file, role='page'):
     if not uploaded_file:
         return
@@ -249,34 +305,7 @@ def add_page(uploaded_file, role='page'):
     except:
         pass
 
-    # Extract page number from filename
-    import re
-    page_number = None
-    
-    # Robust patterns - strictly looking for page indicators or end-of-string numbers
-    patterns = [
-        r'page\s*[-_]?\s*(\d+)',    # page1, page-1, page_1
-        r'p\s*[-_]?\s*(\d+)',       # p1, p-1, p_1
-        r'[_-](\d+)\.[a-zA-Z0-9]+$', # _1.jpg, -1.jpg (at end of file)
-        r'^(\d+)\.[a-zA-Z0-9]+$'     # 1.jpg (start of file)
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, uploaded_file.name, re.IGNORECASE)
-        if match:
-            try:
-                extracted_num = int(match.group(1))
-                # Only use it if it's not already taken
-                if extracted_num not in existing_numbers:
-                    page_number = extracted_num
-                    break
-            except ValueError:
-                continue
-    
-    # If no valid page number found or collision, use next available
-    if page_number is None:
-        max_page = max(existing_numbers, default=0)
-        page_number = max_page + 1
+    page_number = assign_page_number(uploaded_file.name, existing_numbers)
     
     logger.info(f"Assigning page number {page_number} to {uploaded_file.name}")
     
@@ -351,6 +380,79 @@ def add_page(uploaded_file, role='page'):
         st.session_state['pages'].append(page_info)
         return page_info
 
+def add_pages(uploaded_files, role='page'):
+    """Upload several page images at once (direct to storage, or in one backend request)."""
+    if not uploaded_files:
+        return []
+    if len(uploaded_files) == 1:
+        return [add_page(uploaded_files[0], role)]
+    
+    if not st.session_state.current_project:
+        st.error("Please select or create a project first")
+        return []
+    
+    existing_numbers = {p.get('page_number') for p in st.session_state['pages'] if p.get('page_number')}
+    
+    # Save locally first and assign page numbers
+    staged = []
+    for uploaded_file in uploaded_files:
+        uid = uuid.uuid4().hex[:8]
+        path = os.path.join(IMAGES_DIR, f"{uid}_{uploaded_file.name}")
+        with open(path, 'wb') as f:
+            f.write(uploaded_file.getbuffer())
+        page_number = assign_page_number(uploaded_file.name, existing_numbers)
+        existing_numbers.add(page_number)
+        staged.append((uid, path, uploaded_file.name, page_number))
+    
+    logger.info(f"Bulk uploading {len(staged)} pages")
+    
+    handles = []
+    try:
+        api = get_api_client()
+        handles = [open(path, 'rb') for _, path, _, _ in staged]
+        files = [(name, handle) for (_, _, name, _), handle in zip(staged, handles)]
+        page_numbers = [page_number for _, _, _, page_number in staged]
+        try:
+            # Images go straight to storage; the API only creates the pages
+            result = api.upload_pages_direct(
+                project_id=st.session_state.current_project['id'],
+                files=files,
+                page_numbers=page_numbers
+            )
+        except Exception as e:
+            logger.warning(f"Direct upload failed ({e}), falling back to bulk upload")
+            for handle in handles:
+                handle.seek(0)
+            result = api.upload_pages_bulk(
+                project_id=st.session_state.current_project['id'],
+                files=files,
+                page_numbers=page_numbers
+            )
+    except Exception as e:
+        logger.warning(f"Bulk upload failed ({e}), uploading pages one by one")
+        return [add_page(f, role) for f in uploaded_files]
+    finally:
+        for handle in handles:
+            handle.close()
+    
+    backend_ids = {p['page_number']: p['id'] for p in result['pages']}
+    added = []
+    for uid, path, name, page_number in staged:
+        page_info = {
+            'id': uid,
+            'page_id': backend_ids.get(page_number),  # Backend page ID
+            'path': path,
+            'name': name,
+            'role': role,
+            'status': 'uploaded',
+            'page_number': page_number,
+            'results': None,
+            'error': None
+        }
+        st.session_state['pages'].append(page_info)
+        added.append(page_info)
+    return added
+
 def download_page_image(page):
     """Download page image from backend to local storage if needed."""
     # If we already have a local path, use it
@@ -491,13 +593,6 @@ def process_page_task(page_idx):
                             output_pdf_path=pdf_path
                         )
                         logger.info(f"Backend responded: {updated_page.get('status')}")
-                    
-                        # Update project completed count
-                        current_completed = st.session_state.current_project.get('completed_pages', 0)
-                        api.update_project(
-                            project_id=st.session_state.current_project['id'],
-                            completed_pages=current_completed + 1
-                        )
                 except Exception as e:
                     logger.warning(f"Failed to save to backend: {e}")
             if not os.path.exists(pdf_path):
@@ -552,6 +647,7 @@ def render_sidebar():
                     st.session_state['pages'] = []
                     st.session_state.pages_loaded_from_backend = False
                     st.session_state.current_page_offset = 0
+                    st.session_state.page_cursor = None
                     st.session_state.status_filter = None
                     st.session_state.total_pages_count = 0
                     logger.info(f"Auto-selected first project: {first_project['title']}")
@@ -577,6 +673,7 @@ def render_sidebar():
                         st.session_state.pages_loaded_from_backend = False
                         # IMPORTANT: Reset pagination when switching projects
                         st.session_state.current_page_offset = 0
+                        st.session_state.page_cursor = None
                         st.session_state.status_filter = None
                         st.session_state.total_pages_count = 0
                         st.success(f"✅ Loaded: {project['title']}")
@@ -703,9 +800,9 @@ def render_sidebar():
             if proj.get('completed_pages', 0) > 0:
                 if st.button("📚 Download Complete Book", type="primary", use_container_width=True):
                     try:
-                        with st.spinner("Merging PDFs..."):
+                        with st.spinner("Exporting book..."):
                             api = get_api_client()
-                            pdf_data = api.download_complete_book(proj['id'])
+                            pdf_data = api.export_book(proj['id'])
                             
                             # Offer download
                             st.download_button(
@@ -722,19 +819,41 @@ def render_sidebar():
         
         st.markdown("---")
         st.header("Upload")
-        uploaded = st.file_uploader("Add Pages", type=['jpg', 'jpeg', 'png'], accept_multiple_files=True)
+        uploaded = st.file_uploader("Add Pages", type=['jpg', 'jpeg', 'png', 'pdf', 'tif', 'tiff'], accept_multiple_files=True)
         if uploaded:
+            documents = [f for f in uploaded if f.name.lower().endswith(('.pdf', '.tif', '.tiff'))]
+            uploaded = [f for f in uploaded if f not in documents]
+            for f in documents:
+                # Multi-page scans are split into pages by the backend
+                if not st.session_state.current_project:
+                    st.error("Please select or create a project first")
+                    break
+                try:
+                    api = get_api_client()
+                    result = api.ingest_document(
+                        st.session_state.current_project['id'],
+                        f,
+                        f.name
+                    )
+                    st.success(f"📚 {f.name} is being split into pages starting at page {result['start_page']}")
+                    st.session_state.pages_loaded_from_backend = False
+                except Exception as e:
+                    st.error(f"Failed to ingest {f.name}: {e}")
+            new_files = []
+            known_hashes = {p.get('image_hash') for p in st.session_state['pages'] if p.get('image_hash')}
             for f in uploaded:
-                # Check if page already exists (by name for local pages, or filename match for backend pages)
+                # Check if page already exists (by name for local pages, by content or filename for backend pages)
                 page_name = f.name
-                already_exists = any(
+                already_exists = hashlib.sha256(f.getvalue()).hexdigest() in known_hashes or any(
                     p.get('name') == page_name or 
                     (p.get('original_image_path', '').endswith(page_name))
                     for p in st.session_state['pages']
                 )
                 if not already_exists:
-                    add_page(f)
-            st.success(f"Added {len(uploaded)} pages")
+                    new_files.append(f)
+            add_pages(new_files)
+            if uploaded:
+                st.success(f"Added {len(uploaded)} pages")
             
         st.markdown("---")
         if st.button("Clear All Pages"):
@@ -758,16 +877,20 @@ def render_page_list():
             page_size = st.session_state.page_size
             status_filter = st.session_state.status_filter
 
-            # Fetch paginated pages from backend
+            # Fetch paginated pages from backend (summary rows: the list never shows the full text).
+            # Pages reached with "Next" continue from the previous view's cursor instead of an offset
             result = api.list_pages(
                 project_id,
                 skip=offset,
                 limit=page_size,
-                status_filter=status_filter
+                status_filter=status_filter,
+                after_page_number=st.session_state.page_cursor,
+                fields="summary"
             )
 
             backend_pages = result['pages']
             total_count = result['total']
+            st.session_state.next_page_cursor = result.get('next_cursor')
 
             logger.info(f"Loaded {len(backend_pages)} pages from backend (total: {total_count}, offset: {offset})")
             # Log each page status for debugging
@@ -868,6 +991,7 @@ def render_page_list():
         if selected_page_size != current_page_size:
             st.session_state.page_size = selected_page_size
             st.session_state.current_page_offset = 0  # Reset to first page
+            st.session_state.page_cursor = None
             st.session_state.pages_loaded_from_backend = False
             st.rerun()
 
@@ -886,6 +1010,7 @@ def render_page_list():
         if selected_filter != current_filter:
             st.session_state.status_filter = None if selected_filter == "All" else selected_filter
             st.session_state.current_page_offset = 0  # Reset to first page when filtering
+            st.session_state.page_cursor = None
             st.session_state.pages_loaded_from_backend = False
             st.rerun()
 
@@ -895,12 +1020,14 @@ def render_page_list():
     with pagination_col1:
         if st.button("⏮️ First", disabled=offset == 0, key="first_page"):
             st.session_state.current_page_offset = 0
+            st.session_state.page_cursor = None
             st.session_state.pages_loaded_from_backend = False
             st.rerun()
 
     with pagination_col2:
         if st.button("◀️ Prev", disabled=offset == 0, key="prev_page"):
             st.session_state.current_page_offset = max(0, offset - page_size)
+            st.session_state.page_cursor = None
             st.session_state.pages_loaded_from_backend = False
             st.rerun()
 
@@ -909,7 +1036,12 @@ def render_page_list():
 
     with pagination_col4:
         if st.button("Next ▶️", disabled=offset + page_size >= total, key="next_page"):
-            st.session_state.current_page_offset = min(total - page_size, offset + page_size)
+            if st.session_state.next_page_cursor is not None:
+                st.session_state.current_page_offset = offset + page_size
+                st.session_state.page_cursor = st.session_state.next_page_cursor
+            else:
+                st.session_state.current_page_offset = min(total - page_size, offset + page_size)
+                st.session_state.page_cursor = None
             st.session_state.pages_loaded_from_backend = False
             st.rerun()
 
@@ -917,6 +1049,7 @@ def render_page_list():
         if st.button("Last ⏭️", disabled=offset + page_size >= total, key="last_page"):
             last_page_offset = ((total - 1) // page_size) * page_size
             st.session_state.current_page_offset = last_page_offset
+            st.session_state.page_cursor = None
             st.session_state.pages_loaded_from_backend = False
             st.rerun()
 
@@ -1141,6 +1274,18 @@ def render_page_list():
             except Exception as e:
                 st.error(f"Failed to reprocess: {e}")
 
+    # Thumbnail URLs for every backend page without a local file, in one request
+    thumb_urls = {}
+    project_id = (st.session_state.get('current_project') or {}).get('id')
+    token = st.session_state.get('token')
+    if project_id and token:
+        remote_ids = []
+        for p in st.session_state['pages']:
+            local_path = p.get('path') or p.get('original_image_path', '')
+            if isinstance(p.get('id'), int) and not (local_path and os.path.exists(local_path)):
+                remote_ids.append(p['id'])
+        thumb_urls = get_thumbnail_urls(int(project_id), tuple(remote_ids), token, get_api_client().base_url)
+
     # Page list
     for i, page in enumerate(st.session_state['pages']):
         # Handle both backend pages and local pages
@@ -1214,20 +1359,14 @@ def render_page_list():
                     shown = True
             
             if not shown:
-                # Try to get from backend using cached function
-                project_id = st.session_state.get('current_project', {}).get('id')
-                page_id = page.get('id')
-                token = st.session_state.get('token')
-                
-                if project_id and page_id and token:
+                # Use the batch-fetched backend URL
+                thumb_url = thumb_urls.get(page.get('id'))
+                if thumb_url:
                     try:
-                        api = get_api_client()
-                        thumb_url = get_thumbnail_url(int(project_id), int(page_id), token, api.base_url)
-                        if thumb_url:
-                            st.image(thumb_url, width=80)
-                            shown = True
+                        st.image(thumb_url, width=80)
+                        shown = True
                     except Exception as e:
-                        logger.debug(f"Thumbnail fetch error for page {page_id}: {e}")
+                        logger.debug(f"Thumbnail fetch error for page {page.get('id')}: {e}")
                 
                 if not shown:
                     st.markdown(f"**P{i+1}**")
@@ -1260,19 +1399,13 @@ def render_page_list():
                     
                     # 2. Try to fetch from backend if we have page ID
                     if not shown:
-                        project_id = st.session_state.get('current_project', {}).get('id')
-                        page_id = page.get('id')
-                        token = st.session_state.get('token')
-                        
-                        if project_id and page_id and token:
+                        thumb_url = thumb_urls.get(page.get('id'))
+                        if thumb_url:
                             try:
-                                api = get_api_client()
-                                thumb_url = get_thumbnail_url(int(project_id), int(page_id), token, api.base_url)
-                                if thumb_url:
-                                    st.image(thumb_url, width=200, caption=f"Page {page.get('page_number', i+1)} (Original)")
-                                    shown = True
+                                st.image(thumb_url, width=200, caption=f"Page {page.get('page_number', i+1)} (Original)")
+                                shown = True
                             except Exception as e:
-                                logger.debug(f"Thumbnail error for page {page_id}: {e}")
+                                logger.debug(f"Thumbnail error for page {page.get('id')}: {e}")
                     
                     # 3. Show placeholder if nothing worked
                     if not shown:
@@ -3,13 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 import json
-import requests
 
 from app.database import get_db
 from app.models.db_models import User, Project, Page
 from app.api.dependencies import get_current_user
 from app.services.storage import storage_service
-from app.config import settings
 
 router = APIRouter(prefix="/projects/{project_id}/pages/{page_id}/artifacts", tags=["artifacts"])
 
@@ -32,20 +30,8 @@ def _load_artifacts_json(project_id: int, page_number: int) -> Dict[str, Any]:
     """Load artifacts JSON from storage outputs."""
     blob_path = f"projects/{project_id}/outputs/page_{page_number}_artifacts.json"
     try:
-        if settings.use_local_storage:
-            local_path = storage_service.get_local_path(blob_path, is_output=True)
-            if not local_path or not local_path.endswith(".json"):
-                raise FileNotFoundError("Artifact JSON path invalid")
-            with open(local_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        else:
-            signed = storage_service.get_signed_url(settings.gcs_bucket_outputs, blob_path, expiration=300)
-            # Signed URL may be file:// for local mode; requests handles http/https
-            data_path = signed.replace("file://", "")
-            resp = requests.get(data_path)
-            if resp.status_code != 200:
-                raise FileNotFoundError(f"Artifact JSON not found: {resp.status_code}")
-            return resp.json() if resp.headers.get("content-type", "").startswith("application/json") else json.loads(resp.text)
+        # Read the blob directly instead of signing a URL and fetching it over HTTP
+        return json.loads(storage_service.read_output_bytes(blob_path))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Artifacts not found: {e}")
 
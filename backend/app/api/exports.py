@@ -0,0 +1,121 @@
+"""Book export API endpoints."""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.config import settings
+from app.models.db_models import User
+from app.api.dependencies import get_current_user
+from app.api.pages import verify_project_access
+from app.services.book_assembly import book_assembler
+from app.services.storage import storage_service
+from app.tasks.export import export_book_task, export_blob_paths
+from celery.result import AsyncResult
+from app.celery_app import celery_app
+
+router = APIRouter(prefix="/projects/{project_id}/exports", tags=["exports"])
+
+
+def _download_urls(paths: dict) -> dict:
+    """Signed download URLs for the stored files of an export."""
+    return {
+        name.replace("_path", "_url"): storage_service.get_signed_url(settings.gcs_bucket_outputs, path)
+        for name, path in paths.items()
+    }
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+def start_book_export(
+    project_id: int,
+    include_artifacts: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start building the complete book in the background.
+
+    The task ID is derived from the current page outputs, so repeating the
+    request while an export is running returns the same task, and an export
+    that is already stored is returned as ready straight away.
+    """
+    verify_project_access(project_id, current_user, db)
+
+    pages = book_assembler.current_pages(db, project_id)
+    if not pages:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No completed pages found"
+        )
+
+    export_key = book_assembler.fingerprint(pages, include_artifacts)
+    task_id = f"export_{project_id}_{export_key}"
+    paths = export_blob_paths(project_id, export_key, include_artifacts)
+
+    if all(storage_service.output_exists(path) for path in paths.values()):
+        return {
+            "task_id": task_id,
+            "status": "completed",
+            "export_key": export_key,
+            "pages": len(pages),
+            **_download_urls(paths)
+        }
+
+    task = AsyncResult(task_id, app=celery_app)
+    if task.state not in ('PENDING', 'STARTED', 'PROGRESS'):
+        # Finished (and since cleaned up) or failed earlier: run it again
+        task.forget()
+    if task.state == 'PENDING':
+        export_book_task.apply_async(
+            args=[project_id, include_artifacts],
+            task_id=task_id
+        )
+
+    return {
+        "task_id": task_id,
+        "status": "queued",
+        "export_key": export_key,
+        "pages": len(pages)
+    }
+
+
+@router.get("/{task_id}")
+def get_book_export(
+    project_id: int,
+    task_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the progress of an export, with download URLs once it is complete."""
+    verify_project_access(project_id, current_user, db)
+
+    if not task_id.startswith(f"export_{project_id}_"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found"
+        )
+
+    task = AsyncResult(task_id, app=celery_app)
+
+    if task.state == 'PENDING':
+        return {"task_id": task_id, "status": "pending"}
+    if task.state == 'PROGRESS':
+        return {
+            "task_id": task_id,
+            "status": "processing",
+            "stage": task.info.get('stage'),
+            "current": task.info.get('current', 0),
+            "total": task.info.get('total', 1)
+        }
+    if task.state == 'FAILURE':
+        return {"task_id": task_id, "status": "failed", "error": str(task.info)}
+    if task.state != 'SUCCESS':
+        return {"task_id": task_id, "status": task.state.lower()}
+
+    result = task.result
+    paths = {name: result[name] for name in ("book_path", "artifacts_path") if result.get(name)}
+    return {
+        "task_id": task_id,
+        "status": "completed",
+        "export_key": result["export_key"],
+        "pages": result["pages"],
+        **_download_urls(paths)
+    }
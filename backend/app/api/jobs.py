@@ -1,11 +1,14 @@
 """Job management API endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from typing import Optional
 from app.database import get_db
-from app.models.db_models import User, Page, PageStatus
+from app.models.db_models import User, Project, Page, PageStatus
 from app.api.dependencies import get_current_user
-from app.tasks.translation import process_page_task, process_batch_task
+from app.services.page_lease import page_leases
+from app.tasks.scheduler import dispatch_page_jobs, queue_pages
+from app.tasks.translation import queue_interactive_page
 from celery.result import AsyncResult
 from app.celery_app import celery_app
 
@@ -15,10 +18,16 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 @router.post("/process-page/{page_id}")
 def queue_page_processing(
     page_id: int,
+    force: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Queue a page for async processing."""
+    """
+    Queue a page for async processing.
+
+    A page that is already being processed is not queued again, and a page
+    whose stored result is up to date is skipped by the worker unless `force`.
+    """
     # Get page and verify ownership
     page = db.query(Page).filter(Page.id == page_id).first()
     if not page:
@@ -28,15 +37,18 @@ def queue_page_processing(
     if page.project.user_id != current_user.id:
         raise HTTPException(403, "Access denied")
     
-    # Update page status
-    page.status = PageStatus.QUEUED
-    db.commit()
+    if page_leases.is_held(page):
+        return {
+            "task_id": f"page_{page_id}",
+            "page_id": page_id,
+            "status": "processing"
+        }
     
-    # Queue task
-    task = process_page_task.apply_async(
-        args=[page_id, page.project_id],
-        task_id=f"page_{page_id}"
-    )
+    # Mark the page QUEUED and publish its task (status restored if that fails)
+    try:
+        task = queue_interactive_page(db, page, force=force)
+    except Exception:
+        raise HTTPException(503, "Could not queue the page, try again")
     
     return {
         "task_id": task.id,
@@ -51,29 +63,41 @@ def queue_batch_processing(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Queue multiple pages for processing."""
-    # Verify all pages exist and user owns them
-    pages = db.query(Page).filter(Page.id.in_(page_ids)).all()
+    """
+    Queue multiple pages for processing.
+
+    Pages being processed right now are left alone. The pages join the
+    fair-share backlog and are admitted asynchronously.
+    """
+    page_ids = list(dict.fromkeys(page_ids))
+
+    # Verify all pages exist and user owns them (one query per request, not per page)
+    owners = db.query(
+        Page.project_id, Project.user_id, func.count(Page.id)
+    ).join(
+        Project, Project.id == Page.project_id
+    ).filter(
+        Page.id.in_(page_ids)
+    ).group_by(Page.project_id, Project.user_id).all()
     
-    if len(pages) != len(page_ids):
+    if sum(count for _, _, count in owners) != len(page_ids):
         raise HTTPException(404, "Some pages not found")
     
-    for page in pages:
-        if page.project.user_id != current_user.id:
-            raise HTTPException(403, "Access denied")
-        page.status = PageStatus.QUEUED
+    if any(user_id != current_user.id for _, user_id, _ in owners):
+        raise HTTPException(403, "Access denied")
     
-    db.commit()
+    queued_ids = []
+    for project_id, _, _ in owners:
+        queued_ids += queue_pages(db, project_id, Page.id.in_(page_ids))
     
-    # Get project_id (all pages should be from same project)
-    project_id = pages[0].project_id
+    db.commit()
     
-    # Queue batch task
-    task = process_batch_task.apply_async(args=[project_id, page_ids])
+    # Admit pages from the backlog (returns immediately)
+    task = dispatch_page_jobs.delay()
     
     return {
         "task_id": task.id,
-        "page_ids": page_ids,
+        "page_ids": queued_ids,
         "status": "queued"
     }
 
@@ -87,7 +111,6 @@ def queue_by_status(
 ):
     """Queue all pages in a project matching specific statuses."""
     # Verify project ownership
-    from app.models.db_models import Project
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(404, "Project not found")
@@ -105,13 +128,11 @@ def queue_by_status(
     if not status_enums:
         raise HTTPException(400, "No valid statuses provided")
 
-    # Get all pages with matching statuses
-    pages = db.query(Page).filter(
-        Page.project_id == project_id,
-        Page.status.in_(status_enums)
-    ).all()
+    # Queue all pages with matching statuses (except pages being processed right now)
+    page_ids = queue_pages(db, project_id, Page.status.in_(status_enums))
 
-    if not pages:
+    if not page_ids:
+        db.rollback()
         return {
             "task_id": None,
             "page_ids": [],
@@ -119,15 +140,10 @@ def queue_by_status(
             "message": "No pages found with specified statuses"
         }
 
-    # Update status to QUEUED
-    page_ids = [p.id for p in pages]
-    for page in pages:
-        page.status = PageStatus.QUEUED
-
     db.commit()
 
-    # Queue batch task
-    task = process_batch_task.apply_async(args=[project_id, page_ids])
+    # Admit pages from the backlog (returns immediately)
+    task = dispatch_page_jobs.delay()
 
     return {
         "task_id": task.id,
@@ -1,13 +1,23 @@
 """Page management API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 from app.database import get_db
-from app.models.db_models import User, Project, Page, PageStatus, ProjectStatus
-from app.models.schemas import PageResponse, PageListResponse, PageUpdate
+from app.models.db_models import User, Project, Page, PageContent, PageStatus, ProjectStatus, ProjectPageCount
+from app.models.schemas import (
+    PageResponse, PageListResponse, PageUpdate,
+    UploadInitRequest, UploadInitResponse, UploadFinalizeRequest
+)
 from app.api.dependencies import get_current_user
-from app.services.storage import storage_service
-from datetime import datetime
+from app.services.auth import create_upload_token, decode_upload_token
+from app.services.storage import staging_blob_path, storage_service
+from app.services.content_store import content_store
+from app.config import settings
+from datetime import datetime, timezone
 
 router = APIRouter(prefix="/projects/{project_id}/pages", tags=["pages"])
 
@@ -28,6 +38,18 @@ def verify_project_access(project_id: int, user: User, db: Session) -> Project:
     return project
 
 
+def _flush_new_pages(db: Session):
+    """Insert pending pages; a page number taken concurrently (after the existence check) is a 400."""
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Page number already exists in this project"
+        )
+
+
 @router.post("", response_model=PageResponse, status_code=status.HTTP_201_CREATED)
 async def upload_page(
     project_id: int,
@@ -52,29 +74,25 @@ async def upload_page(
             detail=f"Page {page_number} already exists in this project"
         )
     
-    # Upload to GCS
-    gcs_path = storage_service.upload_original_image(
-        file.file,
-        project_id,
-        page_number,
-        file.filename
-    )
+    # Store by content hash (identical images are only uploaded once), off the event loop
+    content = await storage_service.run_async(content_store.store, db, file.file, file.filename)
     
     # Create page record
     new_page = Page(
         project_id=project_id,
         page_number=page_number,
-        original_image_path=gcs_path,
+        original_image_path=content.blob_path,
+        image_hash=content.sha256,
         status=PageStatus.UPLOADED
     )
     
     db.add(new_page)
     
-    # Update project totals
-    project.total_pages += 1
+    # Page counters are kept by the database (see ProjectPageCount)
     if project.status == ProjectStatus.CREATED:
         project.status = ProjectStatus.PROCESSING
     
+    _flush_new_pages(db)
     db.commit()
     db.refresh(new_page)
     
@@ -84,33 +102,396 @@ async def upload_page(
     return new_page
 
 
-@router.get("", response_model=PageListResponse)
+@router.post("/bulk", response_model=PageListResponse, status_code=status.HTTP_201_CREATED)
+async def upload_pages_bulk(
+    project_id: int,
+    files: List[UploadFile] = File(...),
+    page_numbers: Optional[List[int]] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload many page images in one request.
+
+    Files are spooled to disk as the multipart body streams in, hashed and
+    written to storage concurrently (duplicates are stored once), and all
+    pages plus the project total are created in a single transaction.
+
+    Args:
+        project_id: Project ID
+        files: Page images, in page order
+        page_numbers: Page number for each file (default: numbered after the last existing page)
+    """
+    # Verify access
+    project = verify_project_access(project_id, current_user, db)
+
+    if page_numbers:
+        if len(page_numbers) != len(files):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="page_numbers must have one entry per file"
+            )
+        if len(set(page_numbers)) != len(page_numbers):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate page numbers in request"
+            )
+
+        # One existence query for the whole batch
+        existing = db.query(Page.page_number).filter(
+            Page.project_id == project_id,
+            Page.page_number.in_(page_numbers)
+        ).all()
+        if existing:
+            taken = ", ".join(str(row.page_number) for row in sorted(existing))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Pages already exist in this project: {taken}"
+            )
+    else:
+        last_page = db.query(func.max(Page.page_number)).filter(
+            Page.project_id == project_id
+        ).scalar() or 0
+        page_numbers = list(range(last_page + 1, last_page + 1 + len(files)))
+
+    # Hash and write to storage concurrently (bounded so one request cannot take
+    # every thread); content that is already stored is not uploaded again
+    stored = await storage_service.run_async(
+        content_store.store_many,
+        db,
+        [
+            (upload.file, upload.filename or f"page_{page_number}.jpg")
+            for upload, page_number in zip(files, page_numbers)
+        ],
+        settings.upload_concurrency
+    )
+
+    new_pages = [
+        Page(
+            project_id=project_id,
+            page_number=page_number,
+            original_image_path=content.blob_path,
+            image_hash=content.sha256,
+            status=PageStatus.UPLOADED
+        )
+        for page_number, content in zip(page_numbers, stored)
+    ]
+    db.add_all(new_pages)
+
+    # Page counters are kept by the database (see ProjectPageCount)
+    if project.status == ProjectStatus.CREATED:
+        project.status = ProjectStatus.PROCESSING
+
+    _flush_new_pages(db)
+    page_ids = [page.id for page in new_pages]
+    db.commit()
+
+    pages = db.query(Page).options(selectinload(Page.content)).filter(
+        Page.id.in_(page_ids)
+    ).order_by(Page.page_number).all()
+    return {"pages": pages, "total": len(pages)}
+
+
+@router.post("/ingest", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_document(
+    project_id: int,
+    file: UploadFile = File(...),
+    start_page: Optional[int] = Form(None),
+    dpi: Optional[int] = Form(None),
+    auto_process: bool = Form(True),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Ingest a multi-page PDF or TIFF as a book.
+
+    The document is streamed to storage and a background task rasterizes it
+    page by page, creating the pages in bulk and queueing them for processing.
+
+    Args:
+        project_id: Project ID
+        file: Multi-page PDF or TIFF
+        start_page: Page number of the first document page (default: after the last existing page)
+        dpi: Rasterization resolution for PDF pages (default: server setting)
+        auto_process: Queue the created pages for translation
+    """
+    from app.tasks.ingest import ingest_document_task, SUPPORTED_EXTENSIONS
+
+    # Verify access
+    verify_project_access(project_id, current_user, db)
+
+    filename = file.filename or "document.pdf"
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF and TIFF documents can be ingested"
+        )
+
+    if dpi is not None and not 72 <= dpi <= 600:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="dpi must be between 72 and 600"
+        )
+
+    if start_page is None:
+        last_page = db.query(func.max(Page.page_number)).filter(
+            Page.project_id == project_id
+        ).scalar()
+        start_page = (last_page or 0) + 1
+
+    # Stream the document to storage
+    document_path = await storage_service.run_async(
+        storage_service.upload_source_document,
+        file.file,
+        project_id,
+        filename
+    )
+
+    task = ingest_document_task.apply_async(
+        args=[project_id, document_path, start_page, dpi, auto_process]
+    )
+
+    return {
+        "task_id": task.id,
+        "document_path": document_path,
+        "start_page": start_page,
+        "status": "queued"
+    }
+
+
+@router.post("/uploads", response_model=UploadInitResponse)
+def start_direct_uploads(
+    project_id: int,
+    upload_request: UploadInitRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start direct uploads of page images, bypassing the API servers.
+
+    Returns one resumable upload session per file: the client PUTs the bytes
+    straight to storage (in Content-Range chunks, resuming after a 308), then
+    calls /uploads/finalize with the upload IDs to create the pages.
+    """
+    # Verify access
+    verify_project_access(project_id, current_user, db)
+
+    files = upload_request.files
+    if not files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No files to upload"
+        )
+
+    empty = [f.filename for f in files if f.size == 0]
+    if empty:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Empty files: {', '.join(empty)}"
+        )
+
+    requested = [f.page_number for f in files if f.page_number is not None]
+    if len(set(requested)) != len(requested):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate page numbers in request"
+        )
+
+    # Number unassigned files after the last existing (or requested) page
+    next_page = max(requested + [db.query(func.max(Page.page_number)).filter(
+        Page.project_id == project_id
+    ).scalar() or 0]) + 1
+    page_numbers = []
+    for f in files:
+        if f.page_number is None:
+            page_numbers.append(next_page)
+            next_page += 1
+        else:
+            page_numbers.append(f.page_number)
+
+    existing = db.query(Page.page_number).filter(
+        Page.project_id == project_id,
+        Page.page_number.in_(page_numbers)
+    ).all()
+    if existing:
+        taken = ", ".join(str(row.page_number) for row in sorted(existing))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Pages already exist in this project: {taken}"
+        )
+
+    origin = request.headers.get("origin")
+
+    def start(item):
+        info, page_number = item
+        extension = os.path.splitext(info.filename)[1].lower() or ".jpg"
+        blob_path = staging_blob_path(project_id, extension)
+        upload_id = create_upload_token({
+            "project_id": project_id,
+            "page_number": page_number,
+            "blob_path": blob_path,
+            "size": info.size
+        })
+        upload_url = storage_service.create_resumable_upload(
+            blob_path, info.content_type, info.size, origin
+        ) or str(request.url_for("local_resumable_upload", upload_id=upload_id))
+        return {"upload_id": upload_id, "page_number": page_number, "upload_url": upload_url}
+
+    # Session creation is one storage API call per file
+    with ThreadPoolExecutor(max_workers=settings.upload_concurrency) as executor:
+        uploads = list(executor.map(start, zip(files, page_numbers)))
+
+    return {"uploads": uploads, "expires_in": settings.upload_session_expire_minutes * 60}
+
+
+@router.post("/uploads/finalize", response_model=PageListResponse, status_code=status.HTTP_201_CREATED)
+def finalize_direct_uploads(
+    project_id: int,
+    finalize_request: UploadFinalizeRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create the pages for completed direct uploads.
+
+    All pages and the project total are created in one transaction; a
+    background task then moves the images into content-addressed storage
+    (and queues the pages for processing if auto_process is set).
+    """
+    from app.tasks.ingest import adopt_uploaded_pages_task
+
+    # Verify access
+    project = verify_project_access(project_id, current_user, db)
+
+    claims = [decode_upload_token(upload_id) for upload_id in finalize_request.upload_ids]
+    if not claims:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No uploads to finalize"
+        )
+    if any(claim["project_id"] != project_id for claim in claims):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload belongs to a different project"
+        )
+
+    page_numbers = [claim["page_number"] for claim in claims]
+    if len(set(page_numbers)) != len(page_numbers):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate page numbers in request"
+        )
+
+    existing = db.query(Page.page_number).filter(
+        Page.project_id == project_id,
+        Page.page_number.in_(page_numbers)
+    ).all()
+    if existing:
+        taken = ", ".join(str(row.page_number) for row in sorted(existing))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Pages already exist in this project: {taken}"
+        )
+
+    # Every upload must have fully arrived in storage
+    with ThreadPoolExecutor(max_workers=settings.upload_concurrency) as executor:
+        sizes = list(executor.map(storage_service.original_size, [claim["blob_path"] for claim in claims]))
+    for claim, size in zip(claims, sizes):
+        if size is None or (claim.get("size") is not None and size != claim["size"]):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload for page {claim['page_number']} is not complete"
+            )
+
+    new_pages = [
+        Page(
+            project_id=project_id,
+            page_number=claim["page_number"],
+            original_image_path=claim["blob_path"],
+            status=PageStatus.UPLOADED
+        )
+        for claim in claims
+    ]
+    db.add_all(new_pages)
+
+    # Page counters are kept by the database (see ProjectPageCount)
+    if project.status == ProjectStatus.CREATED:
+        project.status = ProjectStatus.PROCESSING
+
+    _flush_new_pages(db)
+    page_ids = [page.id for page in new_pages]
+    db.commit()
+
+    adopt_uploaded_pages_task.apply_async(
+        args=[project_id, page_ids, finalize_request.auto_process]
+    )
+
+    pages = db.query(Page).options(selectinload(Page.content)).filter(
+        Page.id.in_(page_ids)
+    ).order_by(Page.page_number).all()
+    return {"pages": pages, "total": len(pages)}
+
+
+# Columns returned by the summary listing: everything except the large text fields
+PAGE_SUMMARY_COLUMNS = (
+    Page.id, Page.project_id, Page.page_number, Page.status,
+    Page.original_image_path, Page.image_hash, Page.output_pdf_path, Page.error_message,
+    Page.quality_score, Page.quality_level, PageContent.quality_issues.label("quality_issues"),
+    Page.detected_language, Page.language_confidence,
+    Page.created_at, Page.updated_at, Page.processed_at, Page.replaced_at,
+)
+
+
+@router.get("", response_model=PageListResponse, response_model_exclude_unset=True)
 def list_pages(
     project_id: int,
     skip: int = 0,
     limit: int = 20,  # Default to 20 pages per request for better performance
     status_filter: str = None,  # Optional: filter by status (e.g., "COMPLETED", "NEEDS_REVIEW")
+    after_page_number: Optional[int] = None,  # Keyset cursor: next_cursor of the previous response
+    include_total: bool = True,
+    fields: str = "full",  # "full" or "summary" (without OCR/translation text)
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     List pages in a project with pagination and optional filtering.
 
+    Pages are ordered by page number. Passing the previous response's
+    `next_cursor` as `after_page_number` continues right after it using the
+    (project_id, page_number) index, however deep into the book; `skip` is
+    ignored then. `next_cursor` is None on the last page.
+
     Args:
         project_id: Project ID
         skip: Number of pages to skip (for pagination)
         limit: Maximum number of pages to return (default: 20, max: 500)
         status_filter: Optional status filter (UPLOADED, PROCESSING, COMPLETED, FAILED, NEEDS_REVIEW)
+        after_page_number: Return pages after this page number
+        include_total: Include the number of matching pages (read from the project counters)
+        fields: "summary" leaves out ocr_text, translated_text and quality_recommendations
     """
     # Verify access
-    verify_project_access(project_id, current_user, db)
+    project = verify_project_access(project_id, current_user, db)
+
+    if fields not in ("full", "summary"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields must be 'full' or 'summary'"
+        )
 
     # Limit the maximum page size to prevent overload
-    limit = min(limit, 500)
+    limit = max(1, min(limit, 500))
 
     # Build query with optional status filter
-    query = db.query(Page).filter(Page.project_id == project_id)
+    if fields == "summary":
+        query = db.query(*PAGE_SUMMARY_COLUMNS).outerjoin(PageContent, PageContent.page_id == Page.id)
+    else:
+        query = db.query(Page).options(selectinload(Page.content))
+    query = query.filter(Page.project_id == project_id)
 
+    valid_statuses = []
     if status_filter:
         # Handle multiple statuses separated by comma
         statuses = [s.strip().upper() for s in status_filter.split(',')]
@@ -118,13 +499,87 @@ def list_pages(
         if valid_statuses:
             query = query.filter(Page.status.in_(valid_statuses))
 
-    # Get total count before pagination
-    total = query.count()
+    # Apply pagination and ordering (one extra row tells whether more follow)
+    query = query.order_by(Page.page_number)
+    if after_page_number is not None:
+        query = query.filter(Page.page_number > after_page_number)
+    else:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = rows[limit - 1].page_number if len(rows) > limit else None
+    rows = rows[:limit]
+    pages = [row._asdict() for row in rows] if fields == "summary" else rows
+
+    # Totals come from the maintained counters instead of a COUNT over pages
+    total = None
+    if include_total:
+        if valid_statuses:
+            total = db.query(func.coalesce(func.sum(ProjectPageCount.pages), 0)).filter(
+                ProjectPageCount.project_id == project_id,
+                ProjectPageCount.status.in_(valid_statuses)
+            ).scalar()
+        else:
+            total = project.total_pages or 0
 
-    # Apply pagination and ordering
-    pages = query.order_by(Page.page_number).offset(skip).limit(limit).all()
+    return {"pages": pages, "total": total, "next_cursor": next_cursor}
 
-    return {"pages": pages, "total": total}
+
+@router.get("/download-urls")
+def get_download_urls(
+    project_id: int,
+    file_type: str = "original",  # "pdf" or "original"
+    page_ids: Optional[List[int]] = Query(None),
+    skip: int = 0,
+    limit: int = 100,
+    status_filter: str = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get signed URLs for the files of a whole page listing in one request.
+
+    Pages are selected either by `page_ids` or with the same skip/limit/status
+    filter as the page list. Pages without the requested file are omitted.
+
+    Returns:
+        Dict with 'urls' (page ID -> URL), 'expires_at' (UTC time the first
+        of them expires; null for local storage) and 'expires_in' seconds
+        until then. URLs may come from the server's signing cache, so clients
+        caching them must go by 'expires_at', not a fixed lifetime.
+    """
+    # Verify access
+    verify_project_access(project_id, current_user, db)
+
+    path_column = Page.output_pdf_path if file_type == "pdf" else Page.original_image_path
+    query = db.query(Page.id, path_column.label("path")).filter(
+        Page.project_id == project_id,
+        path_column.isnot(None)
+    )
+
+    if page_ids:
+        query = query.filter(Page.id.in_(page_ids))
+    else:
+        if status_filter:
+            statuses = [s.strip().upper() for s in status_filter.split(',')]
+            valid_statuses = [s for s in statuses if s in PageStatus.__members__]
+            if valid_statuses:
+                query = query.filter(Page.status.in_(valid_statuses))
+        query = query.order_by(Page.page_number).offset(skip).limit(min(limit, 500))
+
+    rows = query.all()
+    bucket = settings.gcs_bucket_outputs if file_type == "pdf" else settings.gcs_bucket_originals
+    signed, expires_at = storage_service.get_signed_urls_expiring(
+        bucket, [row.path for row in rows], expiration=3600
+    )
+
+    return {
+        "urls": {row.id: signed[row.path] for row in rows},
+        "expires_at": expires_at,
+        "expires_in": (
+            max(0, int((expires_at - datetime.now(timezone.utc)).total_seconds())) if expires_at else 3600
+        )
+    }
 
 
 @router.get("/{page_id}", response_model=PageResponse)
@@ -275,36 +730,27 @@ async def replace_page_image(
             detail="Page not found"
         )
 
-    # Store previous status to adjust project counts
-    was_completed = page.status in [PageStatus.COMPLETED, PageStatus.NEEDS_REVIEW]
-
-    # Upload new image to storage
-    new_gcs_path = storage_service.upload_original_image(
+    # Store new image by content hash and drop the reference to the old one
+    content = await storage_service.run_async(
+        content_store.store,
+        db,
         file.file,
-        project_id,
-        page.page_number,
         file.filename or f"page_{page.page_number}_replaced.jpg"
     )
+    content_store.release(db, [page.image_hash])
 
     # Reset page status and clear previous results
-    page.original_image_path = new_gcs_path
+    page.original_image_path = content.blob_path
+    page.image_hash = content.sha256
     page.status = PageStatus.UPLOADED
     page.error_message = None
     page.quality_score = None
     page.quality_level = None
-    page.quality_issues = None
-    page.quality_recommendations = None
-    page.ocr_text = None
-    page.translated_text = None
+    page.content = None  # OCR, translation and quality notes
     page.output_pdf_path = None
     page.processed_at = None
     page.replaced_at = datetime.utcnow()
 
-    # Update project completed count if this was previously completed
-    if was_completed:
-        project = page.project
-        project.completed_pages = max(0, project.completed_pages - 1)
-
     db.commit()
     db.refresh(page)
 
@@ -333,14 +779,9 @@ def delete_page(
             detail="Page not found"
         )
     
-    # Delete from database
+    # Delete from database (the image itself is garbage-collected once unreferenced)
+    content_store.release(db, [page.image_hash])
     db.delete(page)
-    
-    # Update project totals
-    project.total_pages -= 1
-    if page.status == PageStatus.COMPLETED:
-        project.completed_pages -= 1
-    
     db.commit()
     
     # TODO: Delete files from GCS in background task
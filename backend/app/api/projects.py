@@ -1,5 +1,5 @@
 """Project management API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
@@ -70,6 +70,33 @@ def get_project(
     return project
 
 
+@router.get("/{project_id}/page-counts")
+def get_project_page_counts(
+    project_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Number of the project's pages per status (read from counters, no scan of pages)."""
+    from app.services.project_counters import project_counters
+
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    return {
+        "project_id": project_id,
+        "total_pages": project.total_pages,
+        "counts": project_counters.counts(db, project_id)
+    }
+
+
 @router.patch("/{project_id}", response_model=ProjectResponse)
 def update_project(
     project_id: int,
@@ -106,6 +133,7 @@ def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -121,13 +149,24 @@ def delete_project(
             detail="Project not found"
         )
     
+    # Drop the pages' image references (shared images are garbage-collected once unreferenced)
+    from app.services.content_store import content_store
+    hashes = db.query(Page.image_hash).filter(
+        Page.project_id == project_id,
+        Page.image_hash.isnot(None)
+    ).all()
+    content_store.release(db, [row.image_hash for row in hashes])
+    
     # Delete from database (cascade will handle pages)
     db.delete(project)
     db.commit()
     
-    # TODO: Delete files from GCS in background task
-    # from app.services.storage import storage_service
-    # storage_service.delete_project_files(project_id)
+    from app.services.book_assembly import book_assembler
+    book_assembler.invalidate(project_id)
+    
+    # Delete the project's files after the response is sent (batched for GCS)
+    from app.services.storage import storage_service
+    background_tasks.add_task(storage_service.delete_project_files_async, project_id)
     
     return None
 
@@ -138,13 +177,9 @@ def download_complete_book(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Merge all completed page PDFs into a single book."""
-    from PyPDF2 import PdfMerger
-    from pathlib import Path
+    """Stream the merged book of all completed pages (rebuilt incrementally)."""
     from fastapi.responses import FileResponse
-    import logging
-    
-    logger = logging.getLogger(__name__)
+    from app.services.book_assembly import book_assembler
     
     project = db.query(Project).filter(
         Project.id == project_id,
@@ -154,65 +189,17 @@ def download_complete_book(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get all completed pages in order
-    pages = db.query(Page).filter(
-        Page.project_id == project_id,
-        Page.status == PageStatus.COMPLETED,
-        Page.output_pdf_path.isnot(None)
-    ).order_by(Page.page_number).all()
+    try:
+        book_path = book_assembler.assemble(db, project_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to merge PDFs: {str(e)}")
     
-    if not pages:
+    if not book_path:
         raise HTTPException(status_code=404, detail="No completed pages found")
     
-    # Merge PDFs
-    merger = PdfMerger()
-    
-    import tempfile
-    import os
-    
-    # Create a temporary directory to hold downloaded PDFs
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            from app.services.storage import storage_service
-            
-            for page in pages:
-                # Get the actual file path
-                if storage_service.use_local:
-                    pdf_path = storage_service.get_local_path(page.output_pdf_path, is_output=True)
-                else:
-                    # Download from GCS to temp file
-                    try:
-                        blob_path = page.output_pdf_path
-                        blob = storage_service.outputs_bucket.blob(blob_path)
-                        local_filename = os.path.join(temp_dir, f"page_{page.page_number}.pdf")
-                        print(f"[Storage] Downloading {blob_path} to {local_filename}...")
-                        blob.download_to_filename(local_filename, timeout=60)
-                        print("[Storage] Download complete.")
-                        pdf_path = local_filename
-                    except Exception as e:
-                        logger.error(f"Failed to download PDF from GCS for page {page.page_number}: {e}")
-                        pdf_path = None
-                
-                if pdf_path and Path(pdf_path).exists():
-                    merger.append(pdf_path)
-                else:
-                    logger.warning(f"PDF not found for page {page.page_number}: {pdf_path}")
-            
-            # Save merged PDF
-            output_filename = f"{project.title.replace(' ', '_')}_complete.pdf"
-            output_path = Path("output") / output_filename
-            output_path.parent.mkdir(exist_ok=True)
-            
-            merger.write(str(output_path))
-            merger.close()
-            
-            # Return file for download
-            return FileResponse(
-                path=str(output_path),
-                media_type="application/pdf",
-                filename=output_filename
-            )
-            
-        except Exception as e:
-            merger.close()
-            raise HTTPException(status_code=500, detail=f"Failed to merge PDFs: {str(e)}")
+    # FileResponse streams the cached book in chunks
+    return FileResponse(
+        path=book_path,
+        media_type="application/pdf",
+        filename=f"{project.title.replace(' ', '_')}_complete.pdf"
+    )
@@ -1,10 +1,12 @@
 """Task management API endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from typing import Optional, List
 from app.database import get_db
-from app.models.db_models import User, Project, Page
+from app.models.db_models import User, Project, Page, PageStatus
 from app.api.dependencies import get_current_user
+from app.services.page_lease import page_leases
 from app.api.pages import verify_project_access
 from celery.result import AsyncResult
 from app.celery_app import celery_app
@@ -29,6 +31,7 @@ class BatchProcessRequest(BaseModel):
 def queue_page_processing(
     project_id: int,
     page_id: int,
+    force: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -48,13 +51,23 @@ def queue_page_processing(
             detail="Page not found"
         )
     
-    # Queue the task
-    from app.tasks.translation import process_page_task
-    task = process_page_task.delay(page_id, project_id)
+    if page_leases.is_held(page):
+        return {
+            "task_id": f"page_{page_id}",
+            "status": "processing",
+            "page_id": page_id,
+            "page_number": page.page_number
+        }
     
-    # Update page status
-    page.status = 'queued'
-    db.commit()
+    # Mark the page QUEUED and publish its task (status restored if that fails)
+    from app.tasks.translation import queue_interactive_page
+    try:
+        task = queue_interactive_page(db, page, force=force)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not queue the page, try again"
+        )
     
     return {
         "task_id": task.id,
@@ -75,32 +88,33 @@ def queue_batch_processing(
     # Verify access
     verify_project_access(project_id, current_user, db)
     
+    requested_ids = list(dict.fromkeys(request.page_ids))
+    
     # Verify all pages exist
-    pages = db.query(Page).filter(
-        Page.id.in_(request.page_ids),
+    found = db.query(func.count(Page.id)).filter(
+        Page.id.in_(requested_ids),
         Page.project_id == project_id
-    ).all()
+    ).scalar()
     
-    if len(pages) != len(request.page_ids):
+    if found != len(requested_ids):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Some page IDs are invalid"
         )
     
-    # Queue the batch task
-    from app.tasks.translation import process_batch_task
-    task = process_batch_task.delay(project_id, request.page_ids)
-    
-    # Update all pages to queued status
-    for page in pages:
-        page.status = 'queued'
+    # Update pages to queued status (pages being processed right now are left alone)
+    from app.tasks.scheduler import dispatch_page_jobs, queue_pages
+    page_ids = queue_pages(db, project_id, Page.id.in_(requested_ids))
     db.commit()
     
+    # Admit pages from the backlog (returns immediately)
+    task = dispatch_page_jobs.delay()
+    
     return {
         "task_id": task.id,
         "status": "queued",
-        "total_pages": len(request.page_ids),
-        "page_ids": request.page_ids
+        "total_pages": len(page_ids),
+        "page_ids": page_ids
     }
 
 
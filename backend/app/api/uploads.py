@@ -0,0 +1,79 @@
+"""Local stand-in for direct-to-storage resumable uploads."""
+import os
+import re
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from app.services.auth import decode_upload_token
+from app.services.storage import storage_service
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)")
+
+
+def _incomplete(received: int) -> Response:
+    """308 Resume Incomplete, with the persisted byte range like GCS."""
+    headers = {"Range": f"bytes=0-{received - 1}"} if received else {}
+    return Response(status_code=308, headers=headers)
+
+
+@router.put("/local/{upload_id}", name="local_resumable_upload")
+async def local_resumable_upload(upload_id: str, request: Request):
+    """
+    Receive a direct upload when storage is local.
+
+    Implements the subset of the GCS resumable upload protocol the clients
+    use, so they upload the same way in both modes:
+    - PUT with `Content-Range: bytes {first}-{last}/{total}` appends a chunk
+      (the total may be `*` until the last chunk);
+    - PUT with `Content-Range: bytes */{total}` and no body asks for status;
+    - PUT without Content-Range uploads the whole file at once.
+    Incomplete uploads answer 308 with a `Range` header of the bytes persisted.
+    The upload ID itself authorizes the upload, like a GCS session URL.
+    """
+    if not storage_service.use_local:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    claims = decode_upload_token(upload_id)
+    final_path = storage_service.get_local_path(claims["blob_path"], is_output=False)
+    part_path = f"{final_path}.part"
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+
+    if os.path.exists(final_path):
+        return Response(status_code=status.HTTP_200_OK)
+
+    received = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    content_range = request.headers.get("content-range")
+
+    if content_range:
+        match = CONTENT_RANGE.fullmatch(content_range.strip())
+        if not match:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Range")
+        first, _, total = match.groups()
+        total = None if total == "*" else int(total)
+
+        if first is not None:
+            if int(first) != received:
+                # Client is out of sync: tell it where to resume
+                return _incomplete(received)
+            with open(part_path, "ab") as f:
+                async for chunk in request.stream():
+                    await storage_service.run_async(f.write, chunk)
+            received = os.path.getsize(part_path)
+
+        if total == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
+        if total is None or received < total:
+            return _incomplete(received)
+        if received > total:
+            os.remove(part_path)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload larger than declared size")
+    else:
+        with open(part_path, "wb") as f:
+            async for chunk in request.stream():
+                await storage_service.run_async(f.write, chunk)
+        if not os.path.getsize(part_path):
+            os.remove(part_path)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
+
+    os.replace(part_path, final_path)
+    return Response(status_code=status.HTTP_200_OK)
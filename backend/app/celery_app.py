@@ -1,6 +1,7 @@
 """Celery application for async task processing."""
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from app.config import settings
 
 # Create Celery app
@@ -8,9 +9,20 @@ celery_app = Celery(
     "book_translator",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=['app.tasks.translation', 'app.tasks.health_check']
+    include=['app.tasks.translation', 'app.tasks.health_check', 'app.tasks.ingest', 'app.tasks.export', 'app.tasks.scheduler']
 )
 
+# Queues: single pages a user is waiting on never sit behind bulk work
+QUEUE_INTERACTIVE = 'interactive'
+QUEUE_BATCH = 'batch'
+QUEUE_EXPORTS = 'exports'
+QUEUE_MAINTENANCE = 'maintenance'
+
+# Redis priorities run from 0 (first) to 9 (last)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 3
+PRIORITY_LOWEST = 9
+
 # Celery configuration
 celery_app.conf.update(
     task_serializer='json',
@@ -23,23 +35,70 @@ celery_app.conf.update(
     task_soft_time_limit=3300,  # 55 minutes soft limit
     worker_prefetch_multiplier=1,  # Process one task at a time
     worker_max_tasks_per_child=50,  # Restart worker after 50 tasks
+    task_default_queue=QUEUE_BATCH,
+    task_default_priority=PRIORITY_DEFAULT,
+    # Redis emulates priorities with one list per step; consume strictly by priority
+    broker_transport_options={
+        'priority_steps': list(range(PRIORITY_LOWEST + 1)),
+        'sep': ':',
+        'queue_order_strategy': 'priority',
+    },
 )
 
-# Task routes - Using default 'celery' queue for all tasks
-# celery_app.conf.task_routes = {
-#     'app.tasks.translation.process_page_task': {'queue': 'translation'},
-#     'app.tasks.translation.process_batch_task': {'queue': 'translation'},
-# }
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs):
+    """Build the storage and model clients in each new worker process, off the task path."""
+    import threading
+    from app.services.storage import warm_up_storage
+    warm_up_storage()
+    try:
+        # src/ is put on sys.path by app.tasks.translation, imported before the pool forks
+        from clients import warm_up_clients
+    except ImportError:
+        return
+    threading.Thread(target=warm_up_clients, name="clients-warm-up", daemon=True).start()
+
+
+# Task routes (enqueue_page overrides the page task's queue for bulk work)
+celery_app.conf.task_routes = {
+    'app.tasks.translation.process_page_task': {'queue': QUEUE_INTERACTIVE},
+    'app.tasks.translation.process_batch_task': {'queue': QUEUE_BATCH},
+    'app.tasks.ingest.*': {'queue': QUEUE_BATCH},
+    'app.tasks.export.*': {'queue': QUEUE_EXPORTS},
+    'app.tasks.health_check.*': {'queue': QUEUE_MAINTENANCE},
+    'app.tasks.scheduler.*': {'queue': QUEUE_MAINTENANCE},
+}
 
 # Celery Beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
+    'dispatch-page-jobs': {
+        'task': 'app.tasks.scheduler.dispatch_page_jobs',
+        'schedule': settings.scheduler_dispatch_interval,
+    },
+    'recover-expired-leases': {
+        'task': 'app.tasks.health_check.recover_expired_leases',
+        'schedule': settings.lease_recovery_interval,
+    },
     'recover-stuck-pages-every-5-minutes': {
         'task': 'app.tasks.health_check.recover_stuck_pages',
         'schedule': 300.0,  # Every 5 minutes (in seconds)
     },
+    'reconcile-project-counters': {
+        'task': 'app.tasks.health_check.reconcile_project_counters',
+        'schedule': settings.counter_reconcile_interval,
+    },
     'cleanup-old-errors-daily': {
         'task': 'app.tasks.health_check.cleanup_old_errors',
         'schedule': crontab(hour=2, minute=0),  # Daily at 2 AM
     },
+    'cleanup-unreferenced-content-daily': {
+        'task': 'app.tasks.health_check.cleanup_unreferenced_content',
+        'schedule': crontab(hour=3, minute=0),  # Daily at 3 AM
+    },
+    'cleanup-stale-staging-daily': {
+        'task': 'app.tasks.health_check.cleanup_stale_staging',
+        'schedule': crontab(hour=4, minute=0),  # Daily at 4 AM
+    },
 }
 
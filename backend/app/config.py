@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     
     # Storage
     use_local_storage: bool = True
+    storage_download_concurrency: int = 8  # Parallel downloads when prefetching outputs
+    signed_url_cache_margin: int = 300  # Stop reusing a cached signed URL this many seconds before it expires
+    signed_url_cache_size: int = 10000  # Maximum cached signed URLs per process
+    storage_io_workers: int = 16  # Threads serving blocking storage calls for async endpoints
+    storage_max_concurrent_ops: int = 32  # Storage calls in flight per API process (queued beyond)
     
     # Google Cloud Storage (optional if using local storage)
     gcs_bucket_originals: str = "dev-bucket-originals"
@@ -26,10 +31,31 @@ class Settings(BaseSettings):
     sendgrid_api_key: str = "dev-sendgrid-key"
     from_email: str = "noreply@example.com"
     
+    # Uploads
+    upload_concurrency: int = 8  # Concurrent storage writes per bulk upload request
+    upload_session_expire_minutes: int = 24 * 60  # Direct (resumable) upload sessions
+    
+    # Multi-page document ingestion
+    ingest_dpi: int = 300  # Rasterization resolution for PDF pages
+    ingest_workers: int = 4  # Pages rasterized in parallel
+    ingest_batch_size: int = 20  # Pages rasterized, stored and inserted per batch
+    
+    # Merged book cache (default: <local storage>/cache/books)
+    book_cache_dir: str = ""
+    
     # Redis & Celery
     redis_url: str = "redis://localhost:6379/0"
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
+    batch_priority_band: int = 25  # Pages of one bulk submission per priority step
+    scheduler_user_max_running: int = 8  # Bulk pages in flight per user (fair-share quota)
+    scheduler_max_in_flight: int = 64  # Bulk pages in flight across all users
+    scheduler_dispatch_interval: float = 15.0  # Seconds between backlog sweeps (pages also admit on completion)
+    page_lease_seconds: int = 90  # Processing lease per page, renewed by the worker's heartbeat
+    page_heartbeat_interval: float = 20.0  # Seconds between lease renewals
+    page_max_attempts: int = 3  # Lost-worker retries before a page is marked FAILED
+    lease_recovery_interval: float = 10.0  # Seconds between expired-lease sweeps
+    counter_reconcile_interval: float = 3600.0  # Seconds between project page counter reconciliations
     
     # CORS
     allowed_origins: str = "http://localhost:8501"
@@ -2,7 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.api import auth, projects, pages, tasks, jobs, artifacts
+from app.api import auth, projects, pages, tasks, jobs, artifacts, exports, uploads
 from app.database import engine, Base
 
 # Create database tables
@@ -24,6 +24,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def warm_up_services():
+    """Build the storage client in the background so startup stays fast."""
+    from app.services.storage import warm_up_storage
+    warm_up_storage()
+
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(projects.router)
@@ -31,6 +38,8 @@ app.include_router(pages.router)
 app.include_router(tasks.router)
 app.include_router(jobs.router)
 app.include_router(artifacts.router)
+app.include_router(exports.router)
+app.include_router(uploads.router)
 
 
 @app.get("/")
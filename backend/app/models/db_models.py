@@ -1,5 +1,6 @@
 """Database models for users, projects, and pages."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Float
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, Float, DDL, Index, UniqueConstraint, event
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -24,6 +25,12 @@ class PageStatus(str, enum.Enum):
     NEEDS_REVIEW = "NEEDS_REVIEW"  # Quality check failed, needs manual review
 
 
+class PageJobStatus(str, enum.Enum):
+    """Fair-share scheduler backlog entry status."""
+    PENDING = "PENDING"  # Waiting for a slot
+    DISPATCHED = "DISPATCHED"  # Sent to Celery, holds one of the user's slots
+
+
 class User(Base):
     """User account table."""
     __tablename__ = "users"
@@ -69,9 +76,22 @@ class Project(Base):
     pages = relationship("Page", back_populates="project", cascade="all, delete-orphan")
 
 
+def _content_field(name: str):
+    """Page attribute stored on its PageContent row (the row is created on first write)."""
+    return association_proxy("content", name, creator=lambda value: PageContent(**{name: value}))
+
+
 class Page(Base):
     """Individual page within a project."""
     __tablename__ = "pages"
+    __table_args__ = (
+        # Page lookups and ordered listings of a project (also guards against duplicate page numbers)
+        UniqueConstraint("project_id", "page_number", name="uq_pages_project_id_page_number"),
+        # Status-filtered listings and queueing of a project, in page order
+        Index("ix_pages_project_id_status_page_number", "project_id", "status", "page_number"),
+        # Stuck-page sweeps (status + age)
+        Index("ix_pages_status_updated_at", "status", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -81,24 +101,31 @@ class Page(Base):
     
     # File paths (relative to GCS bucket)
     original_image_path = Column(String(500), nullable=False)  # GCS path to original image
+    image_hash = Column(String(64), ForeignKey("content_blobs.sha256"), nullable=True, index=True)  # SHA-256 of the original image
     output_pdf_path = Column(String(500), nullable=True)  # GCS path to translated PDF
     
     # Processing results
     status = Column(Enum(PageStatus, values_callable=lambda obj: [e.value for e in obj]), default=PageStatus.UPLOADED, nullable=False)
-    ocr_text = Column(Text, nullable=True)  # Original OCR text
-    translated_text = Column(Text, nullable=True)  # Translated text
+    ocr_text = _content_field("ocr_text")  # Original OCR text
+    translated_text = _content_field("translated_text")  # Translated text
     error_message = Column(Text, nullable=True)  # Error if processing failed
 
     # Quality verification
     quality_score = Column(Integer, nullable=True)  # 0-100 quality score
     quality_level = Column(String(50), nullable=True)  # Excellent, Good, Acceptable, Poor, Failed
-    quality_issues = Column(Text, nullable=True)  # JSON array of quality issues
-    quality_recommendations = Column(Text, nullable=True)  # JSON array of recommendations
+    quality_issues = _content_field("quality_issues")  # JSON array of quality issues
+    quality_recommendations = _content_field("quality_recommendations")  # JSON array of recommendations
 
     # Language detection (per-page)
     detected_language = Column(String(10), nullable=True)  # Detected language for this page
     language_confidence = Column(Float, nullable=True)  # Detection confidence (0-1)
 
+    # Idempotent processing
+    lease_owner = Column(String(64), nullable=True)  # Task execution currently processing the page
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Lease is free once this passes
+    result_fingerprint = Column(String(64), nullable=True)  # Inputs (image, settings, pipeline version) of the stored result
+    attempts = Column(Integer, default=0, nullable=False)  # Processing runs started since the page last finished (lost-worker retries)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -107,3 +134,134 @@ class Page(Base):
 
     # Relationships
     project = relationship("Project", back_populates="pages")
+    content = relationship(
+        "PageContent", uselist=False, back_populates="page",
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class PageContent(Base):
+    """
+    Large text results of a page, kept out of the pages row.
+
+    Status polling, counting, listing and the recovery sweeps read only the
+    narrow pages row; these columns are loaded when a Page's text attributes
+    are first accessed (or eagerly with selectinload(Page.content)).
+    """
+    __tablename__ = "page_contents"
+
+    page_id = Column(Integer, ForeignKey("pages.id", ondelete="CASCADE"), primary_key=True)
+    ocr_text = Column(Text, nullable=True)  # Original OCR text
+    translated_text = Column(Text, nullable=True)  # Translated text
+    quality_issues = Column(Text, nullable=True)  # JSON array of quality issues
+    quality_recommendations = Column(Text, nullable=True)  # JSON array of recommendations
+
+    # Relationships
+    page = relationship("Page", back_populates="content")
+
+
+class ContentBlob(Base):
+    """Content-addressed original image, shared by every page with identical bytes."""
+    __tablename__ = "content_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    blob_path = Column(String(500), nullable=False)  # GCS path: content/{sha[:2]}/{sha}{ext}
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)  # Pages referencing this content
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class PageJob(Base):
+    """Bulk page request waiting in (or admitted from) the fair-share scheduler backlog."""
+    __tablename__ = "page_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_id = Column(Integer, ForeignKey("pages.id", ondelete="CASCADE"), unique=True, nullable=False)  # One live job per page
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(Enum(PageJobStatus, values_callable=lambda obj: [e.value for e in obj]), default=PageJobStatus.PENDING, nullable=False, index=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class ProjectPageCount(Base):
+    """Number of a project's pages in one status (maintained by triggers on pages, see below)."""
+    __tablename__ = "project_page_counts"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(PageStatus, values_callable=lambda obj: [e.value for e in obj]), primary_key=True)
+    pages = Column(Integer, default=0, nullable=False)
+
+
+# Page counters. Statement-level triggers turn every INSERT/UPDATE/DELETE on
+# pages into one delta per (project, status) and apply it, in the same
+# transaction, to project_page_counts and to projects.total_pages /
+# completed_pages. Bulk status updates therefore cost one counter write per
+# project and status, and no code path has to remember to count.
+_APPLY_PAGE_COUNT_DELTA = """
+        WITH delta AS (
+            SELECT project_id, status, sum(n) AS n
+            FROM ({changed}) AS changed
+            GROUP BY project_id, status
+            HAVING sum(n) <> 0
+            ORDER BY project_id, status
+        ), counted AS (
+            INSERT INTO project_page_counts AS c (project_id, status, pages)
+            SELECT project_id, status, n FROM delta
+            ON CONFLICT (project_id, status) DO UPDATE SET pages = c.pages + EXCLUDED.pages
+        )
+        UPDATE projects AS p SET
+            total_pages = COALESCE(p.total_pages, 0) + s.total,
+            completed_pages = COALESCE(p.completed_pages, 0) + s.completed
+        FROM (
+            SELECT project_id,
+                   sum(n) AS total,
+                   COALESCE(sum(n) FILTER (WHERE status = 'COMPLETED'), 0) AS completed
+            FROM delta
+            GROUP BY project_id
+        ) AS s
+        WHERE p.id = s.project_id AND (s.total <> 0 OR s.completed <> 0);"""
+
+PAGE_COUNT_TRIGGERS = f"""
+CREATE OR REPLACE FUNCTION count_project_pages() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN{_APPLY_PAGE_COUNT_DELTA.format(
+        changed="SELECT project_id, status, 1 AS n FROM new_pages")}
+    ELSIF TG_OP = 'DELETE' THEN{_APPLY_PAGE_COUNT_DELTA.format(
+        changed="SELECT project_id, status, -1 AS n FROM old_pages")}
+    ELSE{_APPLY_PAGE_COUNT_DELTA.format(
+        changed="SELECT project_id, status, 1 AS n FROM new_pages "
+                "UNION ALL SELECT project_id, status, -1 AS n FROM old_pages")}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pages_count_insert ON pages;
+CREATE TRIGGER pages_count_insert AFTER INSERT ON pages
+    REFERENCING NEW TABLE AS new_pages
+    FOR EACH STATEMENT EXECUTE FUNCTION count_project_pages();
+
+DROP TRIGGER IF EXISTS pages_count_update ON pages;
+CREATE TRIGGER pages_count_update AFTER UPDATE ON pages
+    REFERENCING OLD TABLE AS old_pages NEW TABLE AS new_pages
+    FOR EACH STATEMENT EXECUTE FUNCTION count_project_pages();
+
+DROP TRIGGER IF EXISTS pages_count_delete ON pages;
+CREATE TRIGGER pages_count_delete AFTER DELETE ON pages
+    REFERENCING OLD TABLE AS old_pages
+    FOR EACH STATEMENT EXECUTE FUNCTION count_project_pages();
+"""
+
+# New databases get the triggers with their tables; existing ones via migrations/add_page_counters.py.
+# Elsewhere (e.g. SQLite) the counters are kept by the periodic reconciliation only.
+event.listen(
+    ProjectPageCount.__table__,
+    "after_create",
+    DDL(PAGE_COUNT_TRIGGERS).execute_if(dialect="postgresql")
+)
@@ -107,14 +107,15 @@ class PageResponse(BaseModel):
     page_number: int
     status: PageStatusEnum
     original_image_path: str
+    image_hash: Optional[str] = None
     output_pdf_path: Optional[str]
-    ocr_text: Optional[str]
-    translated_text: Optional[str]
+    ocr_text: Optional[str] = None  # Left out of summary listings
+    translated_text: Optional[str] = None  # Left out of summary listings
     error_message: Optional[str]
     quality_score: Optional[int] = None
     quality_level: Optional[str] = None
     quality_issues: Optional[str] = None
-    quality_recommendations: Optional[str] = None
+    quality_recommendations: Optional[str] = None  # Left out of summary listings
     detected_language: Optional[str] = None
     language_confidence: Optional[float] = None
     created_at: datetime
@@ -128,4 +129,33 @@ class PageResponse(BaseModel):
 
 class PageListResponse(BaseModel):
     pages: List[PageResponse]
-    total: int
+    total: Optional[int] = None  # None when the listing was requested without a total
+    next_cursor: Optional[int] = None  # after_page_number for the next listing page
+
+
+# Direct upload schemas
+class UploadFileInfo(BaseModel):
+    filename: str
+    size: Optional[int] = None  # Bytes (lets storage reject truncated uploads)
+    content_type: str = "image/jpeg"
+    page_number: Optional[int] = None  # Default: numbered after the last existing page
+
+
+class UploadInitRequest(BaseModel):
+    files: List[UploadFileInfo]
+
+
+class UploadSession(BaseModel):
+    upload_id: str  # Signed token naming the staged file; passed back to finalize
+    page_number: int
+    upload_url: str  # Resumable upload session URL (PUT with Content-Range)
+
+
+class UploadInitResponse(BaseModel):
+    uploads: List[UploadSession]
+    expires_in: int
+
+
+class UploadFinalizeRequest(BaseModel):
+    upload_ids: List[str]
+    auto_process: bool = False
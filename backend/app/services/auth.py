@@ -51,3 +51,23 @@ def decode_access_token(token: str) -> dict:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def create_upload_token(claims: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """Create a signed token naming a staged direct upload (never valid as an access token)."""
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.upload_session_expire_minutes))
+    return jwt.encode({**claims, "typ": "upload", "exp": expire}, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_upload_token(token: str) -> dict:
+    """Decode and verify a direct upload token."""
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        payload = {}
+    if payload.get("typ") != "upload" or "blob_path" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired upload ID"
+        )
+    return payload
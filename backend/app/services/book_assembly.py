@@ -0,0 +1,197 @@
+"""Incremental assembly of per-project merged book PDFs."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.db_models import Page, PageStatus
+from app.services.storage import LOCAL_STORAGE_PATH, storage_service
+
+logger = logging.getLogger(__name__)
+
+
+class BookAssembler:
+    """
+    Keeps a merged book PDF per project and updates it incrementally.
+
+    The cached book is stored with a manifest recording, for every page, the
+    output it was built from (path + processed_at version) and where its pages
+    sit in the merged file, plus the identity (size, mtime, inode) and hash
+    of the book it describes. On the next request only pages whose output
+    changed (or that are new) are fetched; every unchanged page is copied
+    straight out of the cached book.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or settings.book_cache_dir or os.path.join(
+            LOCAL_STORAGE_PATH, "cache", "books"
+        )
+        self._locks: Dict[int, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, project_id: int) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(project_id, threading.Lock())
+
+    def book_path(self, project_id: int) -> str:
+        return os.path.join(self.cache_dir, str(project_id), "book.pdf")
+
+    def _manifest_path(self, project_id: int) -> str:
+        return os.path.join(self.cache_dir, str(project_id), "manifest.json")
+
+    def _load_manifest(self, project_id: int) -> List[Dict]:
+        manifest_path = self._manifest_path(project_id)
+        if not os.path.exists(manifest_path) or not os.path.exists(self.book_path(project_id)):
+            return []
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("book") != self._file_identity(self.book_path(project_id)):
+                # Book and manifest are replaced one after the other; a crash in
+                # between (or an older manifest) leaves them out of step
+                logger.warning(f"Book manifest for project {project_id} does not match the cached book")
+                return []
+            return manifest.get("pages", [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable book manifest for project {project_id}: {e}")
+            return []
+
+    @staticmethod
+    def _file_identity(path: str) -> Dict:
+        """Size, modification time and inode of a file: cheap to compare on every load."""
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _entry(page) -> Dict:
+        return {
+            "page_number": page.page_number,
+            "source": page.output_pdf_path,
+            "version": page.processed_at.isoformat() if page.processed_at else "",
+        }
+
+    def current_pages(self, db: Session, project_id: int) -> List[Dict]:
+        """Manifest entries for the completed pages the book should contain, in order."""
+        pages = db.query(
+            Page.page_number, Page.output_pdf_path, Page.processed_at
+        ).filter(
+            Page.project_id == project_id,
+            Page.status == PageStatus.COMPLETED,
+            Page.output_pdf_path.isnot(None)
+        ).order_by(Page.page_number).all()
+        return [self._entry(page) for page in pages]
+
+    @staticmethod
+    def fingerprint(pages: List[Dict], include_artifacts: bool = False) -> str:
+        """Stable key for a book built from exactly these page outputs."""
+        payload = json.dumps({"pages": pages, "artifacts": include_artifacts}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def assemble(self, db: Session, project_id: int,
+                 progress: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
+        """
+        Bring the cached book up to date and return its path.
+
+        Args:
+            db: Database session
+            project_id: Project whose completed pages make up the book
+            progress: Optional callback(pages_done, pages_total) while merging
+
+        Returns None when the project has no completed pages.
+        """
+        from PyPDF2 import PdfReader, PdfWriter
+
+        desired = self.current_pages(db, project_id)
+        if not desired:
+            return None
+
+        with self._lock(project_id):
+            book_path = self.book_path(project_id)
+            cached = self._load_manifest(project_id)
+            key = lambda e: (e["page_number"], e["source"], e["version"])
+            if [key(e) for e in cached] == [key(e) for e in desired]:
+                return book_path
+
+            reusable = {key(e): e for e in cached}
+            to_fetch = [entry for entry in desired if key(entry) not in reusable]
+            os.makedirs(os.path.dirname(book_path), exist_ok=True)
+
+            writer = PdfWriter()
+            manifest = []
+            reused = fetched = 0
+            cached_reader = PdfReader(book_path) if cached else None
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # Changed pages download in parallel and arrive in book order
+                downloads = storage_service.iter_output_downloads(
+                    [entry["source"] for entry in to_fetch], temp_dir
+                )
+                for done, entry in enumerate(desired):
+                    if progress:
+                        progress(done, len(desired))
+                    start = len(writer.pages)
+                    previous = reusable.get(key(entry))
+
+                    if previous is not None:
+                        # Unchanged page: copy its range out of the cached book
+                        writer.append(cached_reader, pages=(previous["start"], previous["start"] + previous["count"]))
+                        reused += 1
+                    else:
+                        _, pdf_path = next(downloads)
+                        if not pdf_path:
+                            logger.warning(f"PDF not found for page {entry['page_number']}: {entry['source']}")
+                            continue
+                        writer.append(pdf_path)
+                        fetched += 1
+
+                    manifest.append({**entry, "start": start, "count": len(writer.pages) - start})
+
+                # Write both files aside first, so concurrent readers never see a
+                # partial book and a failed write leaves the cached pair untouched
+                fd, temp_book = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(book_path))
+                fd_manifest, temp_manifest = tempfile.mkstemp(suffix=".json", dir=os.path.dirname(book_path))
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        writer.write(f)
+                    writer.close()
+                    # os.replace keeps the inode and timestamps, so the identity
+                    # taken now matches the book once it is in place
+                    with os.fdopen(fd_manifest, "w", encoding="utf-8") as f:
+                        json.dump({
+                            "pages": manifest,
+                            "book": self._file_identity(temp_book),
+                            "book_sha256": self._file_digest(temp_book)
+                        }, f)
+                    os.replace(temp_book, book_path)
+                    os.replace(temp_manifest, self._manifest_path(project_id))
+                except BaseException:
+                    for path in (temp_book, temp_manifest):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    raise
+
+            logger.info(f"Assembled book for project {project_id}: {reused} pages reused, {fetched} fetched")
+            return book_path
+
+    def invalidate(self, project_id: int):
+        """Drop the cached book for a project."""
+        with self._lock(project_id):
+            for path in (self._manifest_path(project_id), self.book_path(project_id)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+# Global book assembler instance
+book_assembler = BookAssembler()
@@ -0,0 +1,310 @@
+"""Content-addressed storage of original page images."""
+import hashlib
+import logging
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.config import settings
+from app.models.db_models import ContentBlob
+from app.services.storage import storage_service
+
+logger = logging.getLogger(__name__)
+
+# Every content object: content/{sha[:2]}/{sha}{ext} (see ContentStore.blob_path)
+CONTENT_GLOB = "content/*/*"
+
+
+class StoredContent(NamedTuple):
+    """An original image stored under its content hash."""
+    sha256: str
+    blob_path: str
+    size_bytes: int
+
+
+class ContentStore:
+    """
+    Stores original images once per distinct content.
+
+    Images are keyed by their SHA-256 and written to
+    content/{sha[:2]}/{sha}{ext} in the originals bucket. The content_blobs
+    table counts the pages referencing each hash: identical uploads
+    (re-uploads, duplicate pages, retries) only add a reference, and a blob
+    is deleted once nothing has referenced it for a grace period.
+
+    Reference changes are made in the caller's session, so they commit (or
+    roll back) together with the page rows that hold them.
+    """
+
+    @staticmethod
+    def hash_file(file: BinaryIO) -> Tuple[str, int]:
+        """SHA-256 hex digest and size of a file object (read in chunks, then rewound)."""
+        digest = hashlib.sha256()
+        size = 0
+        file.seek(0)
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        file.seek(0)
+        return digest.hexdigest(), size
+
+    @staticmethod
+    def blob_path(sha256: str, filename: Optional[str]) -> str:
+        extension = os.path.splitext(filename or "")[1].lower() or ".jpg"
+        return f"content/{sha256[:2]}/{sha256}{extension}"
+
+    def store_many(self, db: Session, files: List[Tuple[BinaryIO, str]],
+                   max_workers: int = None) -> List[StoredContent]:
+        """
+        Store a batch of images and add one reference per file.
+
+        Files are hashed concurrently; only content without a live blob is
+        uploaded (once, even if repeated within the batch).
+
+        Args:
+            db: Database session (committed by the caller)
+            files: (file object, original filename) pairs
+            max_workers: Parallel hash/upload workers (default: settings.upload_concurrency)
+
+        Returns:
+            StoredContent per file, in input order
+        """
+        if not files:
+            return []
+
+        max_workers = max_workers or settings.upload_concurrency
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            hashes = list(executor.map(lambda item: self.hash_file(item[0]), files))
+
+            # Content that is already stored and referenced needs no upload
+            live = self._live_paths(db, {sha for sha, _ in hashes})
+
+            stored = []
+            uploads = {}
+            for (file, filename), (sha, size) in zip(files, hashes):
+                path = live.get(sha)
+                if path is None:
+                    if sha not in uploads:
+                        uploads[sha] = (file, self.blob_path(sha, filename))
+                    path = uploads[sha][1]
+                stored.append(StoredContent(sha, path, size))
+
+            # Uploads are idempotent (the path is the content hash) and run
+            # outside any row lock; references are added once they are stored
+            self._hold_dead(db, uploads)
+            list(executor.map(
+                lambda item: storage_service.upload_original_content(*item),
+                uploads.values()
+            ))
+
+        self._add_all_references(db, stored)
+
+        if uploads:
+            logger.info(f"Stored {len(uploads)} new images ({len(files) - len(uploads)} deduplicated)")
+        return stored
+
+    def adopt_many(self, db: Session, staged_paths: List[str],
+                   max_workers: int = None) -> List[Optional[StoredContent]]:
+        """
+        Bring originals that clients uploaded directly into content-addressed storage.
+
+        Each staged file is hashed; content without a live blob is copied
+        (server-side) to its content path. The staged files are left in place
+        for the caller to delete once its transaction has committed.
+
+        Returns:
+            StoredContent per staged path, in input order; None for files
+            that could not be read (missing or unreadable), which are skipped
+            without failing the rest of the batch
+        """
+        if not staged_paths:
+            return []
+
+        max_workers = max_workers or settings.upload_concurrency
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            def hash_staged(item: Tuple[int, str]) -> Optional[Tuple[str, int]]:
+                index, path = item
+                try:
+                    local_path = storage_service.download_original(
+                        path, os.path.join(temp_dir, f"{index}{os.path.splitext(path)[1]}")
+                    )
+                    with open(local_path, "rb") as f:
+                        result = self.hash_file(f)
+                except Exception as e:
+                    logger.warning(f"Cannot adopt staged upload {path}: {e}")
+                    return None
+                if local_path.startswith(temp_dir):
+                    os.remove(local_path)
+                return result
+
+            hashes = list(executor.map(hash_staged, enumerate(staged_paths)))
+
+            live = self._live_paths(db, {hashed[0] for hashed in hashes if hashed})
+
+            stored = []
+            copies = {}
+            for path, hashed in zip(staged_paths, hashes):
+                if hashed is None:
+                    stored.append(None)
+                    continue
+                sha, size = hashed
+                target = live.get(sha)
+                if target is None:
+                    if sha not in copies:
+                        copies[sha] = (path, self.blob_path(sha, path))
+                    target = copies[sha][1]
+                stored.append(StoredContent(sha, target, size))
+
+            self._hold_dead(db, copies)
+            list(executor.map(
+                lambda item: storage_service.copy_original(*item),
+                copies.values()
+            ))
+
+        self._add_all_references(db, [content for content in stored if content])
+
+        adopted = sum(1 for content in stored if content)
+        logger.info(f"Adopted {adopted} uploads ({adopted - len(copies)} deduplicated)")
+        return stored
+
+    def store(self, db: Session, file: BinaryIO, filename: str) -> StoredContent:
+        """Store one image and add a reference to it."""
+        return self.store_many(db, [(file, filename)])[0]
+
+    def _live_paths(self, db: Session, hashes: Set[str]) -> Dict[str, str]:
+        """Blob paths of the hashes that are stored and referenced."""
+        return {
+            sha: path for sha, path in db.query(ContentBlob.sha256, ContentBlob.blob_path).filter(
+                ContentBlob.sha256.in_(hashes),
+                ContentBlob.ref_count > 0
+            )
+        }
+
+    def _hold_dead(self, db: Session, hashes: Iterable[str]):
+        """
+        Keep collect_garbage away from dead blobs about to be stored again.
+
+        Their rows' updated_at is bumped in a short transaction of its own,
+        committed before the upload starts: a collection that has not locked
+        them yet no longer finds them old enough, and one that already holds
+        them finishes first (the upload then recreates the object). Live
+        blobs need nothing - they can only be collected a full grace period
+        after their last reference is released. (Callers store before they
+        release, so the caller's own session never holds these rows.)
+        """
+        hashes = list(hashes)
+        if not hashes:
+            return
+        with db.get_bind().begin() as connection:
+            connection.execute(
+                ContentBlob.__table__.update().where(
+                    ContentBlob.sha256.in_(hashes),
+                    ContentBlob.ref_count <= 0
+                ).values(updated_at=func.now())
+            )
+
+    def _add_all_references(self, db: Session, stored: List[StoredContent]):
+        """Add one reference per stored file (in hash order, so concurrent batches lock rows alike)."""
+        for content, count in sorted(Counter(stored).items()):
+            self._add_references(db, content, count)
+
+    def _add_references(self, db: Session, content: StoredContent, count: int):
+        """Insert the blob row or bump its reference count (single atomic upsert)."""
+        values = {
+            "sha256": content.sha256,
+            "blob_path": content.blob_path,
+            "size_bytes": content.size_bytes,
+            "ref_count": count,
+        }
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            blob = db.query(ContentBlob).filter(ContentBlob.sha256 == content.sha256).with_for_update().first()
+            if blob:
+                blob.ref_count = ContentBlob.ref_count + count
+            else:
+                db.add(ContentBlob(**values))
+            db.flush()
+            return
+
+        stmt = insert(ContentBlob).values(**values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ContentBlob.sha256],
+            set_={
+                "ref_count": ContentBlob.ref_count + count,
+                # A dead blob may have just been re-uploaded (possibly under another extension)
+                "blob_path": stmt.excluded.blob_path,
+                "updated_at": func.now()
+            }
+        ))
+
+    def release(self, db: Session, hashes: Iterable[Optional[str]]):
+        """Drop one reference per hash (None entries - legacy pages - are ignored)."""
+        for sha, count in Counter(h for h in hashes if h).items():
+            # updated_at starts the grace period before the blob can be collected
+            db.query(ContentBlob).filter(ContentBlob.sha256 == sha).update(
+                {ContentBlob.ref_count: ContentBlob.ref_count - count, ContentBlob.updated_at: func.now()},
+                synchronize_session=False
+            )
+
+    def collect_garbage(self, db: Session, grace: timedelta = timedelta(days=1)) -> int:
+        """
+        Delete blobs that have been unreferenced for longer than `grace`.
+
+        Also deletes content objects older than `grace` that no row points
+        at: uploads whose references were never committed (the request
+        failed or rolled back after storing the image).
+
+        Returns:
+            Number of objects deleted
+        """
+        cutoff = datetime.now(timezone.utc) - grace
+        # Rows being revived are skipped: _hold_dead bumps updated_at, and the
+        # conditions are re-checked once each row lock is taken
+        candidates = db.query(ContentBlob.sha256, ContentBlob.blob_path).filter(
+            ContentBlob.ref_count <= 0,
+            ContentBlob.updated_at < cutoff
+        ).with_for_update(skip_locked=True).all()
+
+        if candidates:
+            # Objects go first, while the rows are still locked: an upload of the
+            # same content waits for this transaction and then finds no row
+            storage_service.delete_originals([path for _, path in candidates])
+            db.query(ContentBlob).filter(
+                ContentBlob.sha256.in_([sha for sha, _ in candidates])
+            ).delete(synchronize_session=False)
+        db.commit()
+
+        return len(candidates) + self._collect_orphans(db, cutoff)
+
+    def _collect_orphans(self, db: Session, cutoff: datetime, batch_size: int = 500) -> int:
+        """Delete content objects last written before `cutoff` that no blob row points at."""
+        objects = storage_service.list_originals(CONTENT_GLOB, older_than=cutoff)
+        orphans = []
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start:start + batch_size]
+            known = {
+                path for (path,) in db.query(ContentBlob.blob_path).filter(
+                    ContentBlob.sha256.in_({os.path.splitext(os.path.basename(path))[0] for path in batch})
+                )
+            }
+            orphans += [path for path in batch if path not in known]
+        db.rollback()
+
+        # Re-checked per object: an upload may have rewritten one since the listing
+        deleted = storage_service.delete_originals_older_than(orphans, cutoff)
+        if deleted:
+            logger.info(f"Deleted {deleted} content objects without a blob row")
+        return deleted
+
+# Global content store instance
+content_store = ContentStore()
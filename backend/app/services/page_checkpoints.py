@@ -0,0 +1,66 @@
+"""Stage checkpoints of page processing, kept in the outputs bucket."""
+import json
+import logging
+from typing import Optional
+from app.services.storage import storage_service
+
+logger = logging.getLogger(__name__)
+
+
+class StorageCheckpoint:
+    """
+    Checkpoint for BookTranslator (see src/checkpoints.py) stored under
+    projects/{project_id}/checkpoints/{page_id}/{fingerprint}/.
+
+    The folder is keyed by the page's result fingerprint, so a run only ever
+    resumes from stages computed with the same image, settings and pipeline
+    version. Saving is best effort: a storage error costs the checkpoint,
+    never the page.
+    """
+
+    def __init__(self, project_id: int, page_id: int, fingerprint: str):
+        self.prefix = f"{self.page_prefix(project_id, page_id)}{fingerprint[:16]}/"
+
+    @staticmethod
+    def page_prefix(project_id: int, page_id: int) -> str:
+        return f"projects/{project_id}/checkpoints/{page_id}/"
+
+    @classmethod
+    def clear(cls, project_id: int, page_id: int):
+        """Delete every checkpoint of a page (once its result is stored)."""
+        try:
+            storage_service.delete_output_prefix(cls.page_prefix(project_id, page_id))
+        except Exception as e:
+            logger.warning(f"Failed to delete checkpoints of page {page_id}: {e}")
+
+    def load(self, stage: str) -> Optional[dict]:
+        try:
+            return json.loads(storage_service.read_output_bytes(f"{self.prefix}{stage}.json"))
+        except ValueError as e:
+            # A corrupt checkpoint is recomputed, like a missing one
+            logger.warning(f"Ignoring unreadable checkpoint of stage '{stage}': {e}")
+            return None
+        except Exception:
+            return None
+
+    def save(self, stage: str, data: dict):
+        try:
+            storage_service.write_output_bytes(
+                f"{self.prefix}{stage}.json",
+                json.dumps(data, ensure_ascii=False).encode("utf-8"),
+                content_type="application/json"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint stage '{stage}': {e}")
+
+    def save_file(self, stage: str, name: str, local_path: str):
+        try:
+            storage_service.upload_output_file(local_path, f"{self.prefix}{stage}/{name}")
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint file '{name}' of stage '{stage}': {e}")
+
+    def load_file(self, stage: str, name: str, local_path: str) -> bool:
+        try:
+            return storage_service.download_output(f"{self.prefix}{stage}/{name}", local_path)
+        except Exception:
+            return False
@@ -0,0 +1,207 @@
+"""Processing leases and result fingerprints for pages."""
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.config import settings
+from app.database import SessionLocal
+from app.models.db_models import Page, PageStatus, Project
+
+logger = logging.getLogger(__name__)
+
+# Bump when a pipeline change should invalidate results of unchanged pages
+PIPELINE_VERSION = "2026.10.1"
+
+
+class PageLeases:
+    """
+    Makes page processing idempotent.
+
+    - A lease on the page row (lease_owner / lease_expires_at), taken with a
+      single conditional UPDATE, guarantees that at most one task processes a
+      page at a time; duplicate deliveries or clicks find it held and stop.
+      Leases are short and renewed by a heartbeat while the task runs, so a
+      dead worker's page is noticed within seconds (see expire()).
+    - A fingerprint of everything that determines the result (image content,
+      project translation settings, pipeline version) is stored with the
+      result, so a request for an unchanged page is answered without calling
+      any model.
+    """
+
+    @staticmethod
+    def new_owner() -> str:
+        """Unique lease owner for one task execution."""
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def fingerprint(page: Page, project: Project) -> str:
+        """SHA-256 over the inputs that determine a page's result."""
+        inputs = {
+            # Legacy pages without a content hash are identified by their file
+            "image": page.image_hash or page.original_image_path,
+            "source_language": project.source_language or "auto",
+            "target_language": project.target_language or "en",
+            "book_context": project.book_context or "",
+            "pipeline_version": PIPELINE_VERSION,
+        }
+        encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def is_held(page: Page, now: Optional[datetime] = None) -> bool:
+        """Whether a task currently holds the page's lease."""
+        if page.lease_expires_at is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        expires_at = page.lease_expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at > now
+
+    @staticmethod
+    def available_filter(now: Optional[datetime] = None):
+        """SQL condition matching pages whose lease is free (never taken or expired)."""
+        now = now or datetime.now(timezone.utc)
+        return or_(Page.lease_expires_at.is_(None), Page.lease_expires_at < now)
+
+    def acquire(self, db: Session, page_id: int, owner: str) -> bool:
+        """
+        Take the page's lease and mark it PROCESSING, unless another task holds it.
+
+        Commits. Returns True if the lease was taken.
+        """
+        now = datetime.now(timezone.utc)
+        taken = db.query(Page).filter(
+            Page.id == page_id,
+            self.available_filter(now)
+        ).update({
+            Page.lease_owner: owner,
+            Page.lease_expires_at: now + timedelta(seconds=settings.page_lease_seconds),
+            Page.status: PageStatus.PROCESSING,
+            Page.attempts: func.coalesce(Page.attempts, 0) + 1
+        }, synchronize_session=False)
+        db.commit()
+        return taken == 1
+
+    def renew(self, db: Session, page_id: int, owner: str) -> bool:
+        """Extend the lease if this owner still holds it. Commits. Returns False if it was lost."""
+        renewed = db.query(Page).filter(
+            Page.id == page_id,
+            Page.lease_owner == owner
+        ).update({
+            Page.lease_expires_at: datetime.now(timezone.utc) + timedelta(seconds=settings.page_lease_seconds)
+        }, synchronize_session=False)
+        db.commit()
+        return renewed == 1
+
+    def fence(self, db: Session, page_id: int, owner: str) -> bool:
+        """
+        Lock the page row and check that this owner still holds the lease.
+
+        Call right before committing a result: while the row lock is held
+        the lease cannot be expired and handed to another task, so a worker
+        that lost its lease (missed renewals, then got requeued) never
+        overwrites the newer run. Does not commit.
+        """
+        current = db.query(Page.lease_owner).filter(Page.id == page_id).with_for_update().scalar()
+        return current == owner
+
+    def heartbeat(self, page_id: int, owner: str) -> "LeaseHeartbeat":
+        """Start renewing the lease in the background until stop() is called."""
+        heartbeat = LeaseHeartbeat(self, page_id, owner)
+        heartbeat.start()
+        return heartbeat
+
+    def expire(self, db: Session) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Take back pages whose lease ran out (their worker died or hung).
+
+        Two set-based UPDATEs: pages that used up `page_max_attempts` are
+        marked FAILED; the others are put back to QUEUED and returned for
+        the caller to requeue (after committing). Resumed runs pick up the
+        stage checkpoints of the lost run.
+
+        Returns:
+            ((page_id, project_id) pairs to requeue, number of pages failed)
+        """
+        now = datetime.now(timezone.utc)
+        expired = (
+            Page.status == PageStatus.PROCESSING,
+            Page.lease_expires_at < now
+        )
+        released = {Page.lease_owner: None, Page.lease_expires_at: None}
+
+        failed = db.query(Page).filter(
+            *expired,
+            func.coalesce(Page.attempts, 0) >= settings.page_max_attempts
+        ).update({
+            **released,
+            Page.status: PageStatus.FAILED,
+            Page.attempts: 0,
+            Page.error_message: f"Worker lost {settings.page_max_attempts} times while processing this page"
+        }, synchronize_session=False)
+
+        requeued = db.execute(
+            update(Page).where(*expired).values({
+                **released,
+                Page.status: PageStatus.QUEUED,
+                Page.error_message: "Worker lost during processing; requeued automatically"
+            }).returning(Page.id, Page.project_id).execution_options(synchronize_session=False)
+        ).all()
+        return [tuple(row) for row in requeued], failed
+
+    def release(self, db: Session, page_id: int, owner: str):
+        """Give up the lease if this owner still holds it. Commits."""
+        db.query(Page).filter(
+            Page.id == page_id,
+            Page.lease_owner == owner
+        ).update({
+            Page.lease_owner: None,
+            Page.lease_expires_at: None
+        }, synchronize_session=False)
+        db.commit()
+
+
+class LeaseHeartbeat:
+    """Background thread renewing one page lease (with its own session) every `page_heartbeat_interval` seconds."""
+
+    def __init__(self, leases: PageLeases, page_id: int, owner: str):
+        self.leases = leases
+        self.page_id = page_id
+        self.owner = owner
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat-{page_id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        db = SessionLocal()
+        try:
+            while not self._stop.wait(settings.page_heartbeat_interval):
+                try:
+                    if not self.leases.renew(db, self.page_id, self.owner):
+                        self.lost = True
+                        logger.warning(f"Lost the lease on page {self.page_id}; it may be processed again")
+                        return
+                except Exception as e:
+                    # A missed beat is tolerated as long as the lease has not run out
+                    db.rollback()
+                    logger.warning(f"Lease heartbeat for page {self.page_id} failed: {e}")
+        finally:
+            db.close()
+
+
+# Global page lease manager
+page_leases = PageLeases()
@@ -0,0 +1,97 @@
+"""Per-project page counters."""
+import logging
+from typing import Dict
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.models.db_models import Page, PageStatus, Project, ProjectPageCount
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectCounters:
+    """
+    Reads and repairs the page counters of projects.
+
+    On PostgreSQL the counters (project_page_counts and the projects'
+    total_pages / completed_pages) are updated by triggers in the same
+    transaction as the page change, so reading them never needs a COUNT over
+    pages. reconcile() recomputes them periodically to correct any drift
+    (rows changed with triggers disabled, databases without the triggers).
+    """
+
+    def counts(self, db: Session, project_id: int) -> Dict[str, int]:
+        """Number of the project's pages per status."""
+        counts = {status.value: 0 for status in PageStatus}
+        for status, pages in db.query(ProjectPageCount.status, ProjectPageCount.pages).filter(
+            ProjectPageCount.project_id == project_id
+        ):
+            counts[PageStatus(status).value] = pages
+        return counts
+
+    def reconcile(self, db: Session) -> int:
+        """
+        Recompute every counter from the pages table and fix those that drifted.
+
+        Two grouped queries read the actual and stored counts; only counters
+        that differ are written. On PostgreSQL the counters table is locked
+        first, so page changes committing meanwhile wait instead of being
+        overwritten. The caller commits.
+
+        Returns:
+            Number of counters corrected
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("LOCK TABLE project_page_counts IN EXCLUSIVE MODE"))
+
+        actual = {
+            (project_id, PageStatus(status)): pages
+            for project_id, status, pages in db.query(
+                Page.project_id, Page.status, func.count(Page.id)
+            ).group_by(Page.project_id, Page.status)
+        }
+        stored = {
+            (project_id, PageStatus(status)): pages
+            for project_id, status, pages in db.query(
+                ProjectPageCount.project_id, ProjectPageCount.status, ProjectPageCount.pages
+            )
+        }
+
+        corrected = 0
+        for key in actual.keys() | stored.keys():
+            pages = actual.get(key, 0)
+            if stored.get(key) == pages:
+                continue
+            project_id, status = key
+            if key in stored:
+                db.query(ProjectPageCount).filter(
+                    ProjectPageCount.project_id == project_id,
+                    ProjectPageCount.status == status
+                ).update({ProjectPageCount.pages: pages}, synchronize_session=False)
+            else:
+                db.add(ProjectPageCount(project_id=project_id, status=status, pages=pages))
+            corrected += 1
+
+        totals = {}
+        for (project_id, status), pages in actual.items():
+            total, completed = totals.get(project_id, (0, 0))
+            totals[project_id] = (total + pages, completed + (pages if status == PageStatus.COMPLETED else 0))
+
+        for project_id, total_pages, completed_pages in db.query(
+            Project.id, Project.total_pages, Project.completed_pages
+        ):
+            total, completed = totals.get(project_id, (0, 0))
+            if (total_pages, completed_pages) != (total, completed):
+                db.query(Project).filter(Project.id == project_id).update({
+                    Project.total_pages: total,
+                    Project.completed_pages: completed
+                }, synchronize_session=False)
+                corrected += 1
+
+        if corrected:
+            logger.warning(f"Corrected {corrected} drifted project page counters")
+        return corrected
+
+
+# Global counters instance
+project_counters = ProjectCounters()
@@ -0,0 +1,182 @@
+"""Fair-share admission of bulk page jobs into Celery."""
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, List, NamedTuple
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.config import settings
+from app.models.db_models import Page, PageJob, PageJobStatus, PageStatus, Project
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key held while admitting jobs (arbitrary, app-wide)
+DISPATCH_LOCK_KEY = 42150042
+
+
+class AdmittedJob(NamedTuple):
+    """A backlog entry admitted for processing."""
+    page_id: int
+    project_id: int
+
+
+class FairShareScheduler:
+    """
+    Persistent backlog for bulk page processing.
+
+    Bulk requests (batch/status queueing, document ingestion, direct uploads)
+    record one page_jobs row per page instead of enqueueing everything at
+    once. dispatch() then admits pages into Celery:
+    - at most `scheduler_user_max_running` pages in flight per user;
+    - at most `scheduler_max_in_flight` bulk pages in flight overall;
+    - round-robin across projects, starting with the projects that have the
+      fewest pages in flight, so a large book cannot crowd out small ones.
+
+    Jobs are deleted when their page task finishes, which frees the slot.
+    Single-page (interactive) requests bypass the backlog.
+    """
+
+    def submit(self, db: Session, project_id: int, page_ids: Iterable[int]) -> int:
+        """
+        Add pages of a project to the backlog (pages with a live job are skipped).
+
+        Made in the caller's session, so the backlog commits together with the
+        pages' QUEUED status.
+
+        Returns:
+            Number of jobs added
+        """
+        page_ids = list(dict.fromkeys(page_ids))
+        if not page_ids:
+            return 0
+
+        user_id = db.query(Project.user_id).filter(Project.id == project_id).scalar()
+        rows = [
+            {"page_id": page_id, "project_id": project_id, "user_id": user_id}
+            for page_id in page_ids
+        ]
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            live = {
+                page_id for (page_id,) in
+                db.query(PageJob.page_id).filter(PageJob.page_id.in_(page_ids))
+            }
+            rows = [row for row in rows if row["page_id"] not in live]
+            db.bulk_insert_mappings(PageJob, rows)
+            return len(rows)
+
+        result = db.execute(
+            insert(PageJob).values(rows).on_conflict_do_nothing(index_elements=[PageJob.page_id])
+        )
+        return result.rowcount
+
+    def release(self, db: Session, page_id: int) -> bool:
+        """Finish the page's job, freeing its slot. Returns False if it had none."""
+        return db.query(PageJob).filter(
+            PageJob.page_id == page_id,
+            PageJob.status == PageJobStatus.DISPATCHED
+        ).delete(synchronize_session=False) > 0
+
+    def reap(self, db: Session) -> int:
+        """
+        Drop jobs whose page moved on outside the scheduler.
+
+        Pending jobs need their page still QUEUED (it may have been processed
+        interactively or reset meanwhile); dispatched jobs need it QUEUED or
+        PROCESSING (a worker may have died before releasing the slot).
+        """
+        stale = [
+            job_id for (job_id,) in db.query(PageJob.id).join(Page, Page.id == PageJob.page_id).filter(or_(
+                and_(PageJob.status == PageJobStatus.PENDING, Page.status != PageStatus.QUEUED),
+                and_(PageJob.status == PageJobStatus.DISPATCHED,
+                     Page.status.notin_([PageStatus.QUEUED, PageStatus.PROCESSING]))
+            ))
+        ]
+        if stale:
+            db.query(PageJob).filter(PageJob.id.in_(stale)).delete(synchronize_session=False)
+        return len(stale)
+
+    def dispatch(self, db: Session) -> List[AdmittedJob]:
+        """
+        Admit as many pending jobs as the quotas allow and mark them dispatched.
+
+        Dispatchers run concurrently (every finished page dispatches), so on
+        PostgreSQL a transaction-scoped advisory lock serializes them: each one
+        counts the running jobs only after the previous one committed its
+        admissions, and the quotas hold. Pending rows are still claimed with
+        SELECT ... FOR UPDATE SKIP LOCKED. The caller commits (releasing the
+        lock) and then enqueues the returned pages.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": DISPATCH_LOCK_KEY})
+
+        running_by_user = dict(
+            db.query(PageJob.user_id, func.count(PageJob.id))
+            .filter(PageJob.status == PageJobStatus.DISPATCHED)
+            .group_by(PageJob.user_id)
+        )
+        running_by_project = dict(
+            db.query(PageJob.project_id, func.count(PageJob.id))
+            .filter(PageJob.status == PageJobStatus.DISPATCHED)
+            .group_by(PageJob.project_id)
+        )
+        capacity = settings.scheduler_max_in_flight - sum(running_by_user.values())
+        if capacity <= 0:
+            return []
+
+        # Projects with waiting pages, least served first
+        waiting = db.query(
+            PageJob.project_id, PageJob.user_id, func.min(PageJob.id)
+        ).filter(
+            PageJob.status == PageJobStatus.PENDING
+        ).group_by(PageJob.project_id, PageJob.user_id).all()
+        waiting.sort(key=lambda row: (running_by_project.get(row[0], 0), row[2]))
+
+        user_slots = {
+            user_id: max(0, settings.scheduler_user_max_running - running_by_user.get(user_id, 0))
+            for _, user_id, _ in waiting
+        }
+
+        # Each project's next candidates, in submission order
+        candidates = {}
+        for project_id, user_id, _ in waiting:
+            limit = min(user_slots[user_id], capacity)
+            if limit <= 0:
+                continue
+            candidates[project_id] = (user_id, db.query(PageJob.id, PageJob.page_id).filter(
+                PageJob.project_id == project_id,
+                PageJob.status == PageJobStatus.PENDING
+            ).order_by(PageJob.id).limit(limit).with_for_update(skip_locked=True).all())
+
+        # Round-robin: one page per project per round
+        admitted = []
+        job_ids = []
+        while capacity > 0 and candidates:
+            for project_id in list(candidates):
+                user_id, jobs = candidates[project_id]
+                if not jobs or user_slots[user_id] <= 0:
+                    del candidates[project_id]
+                    continue
+                job_id, page_id = jobs.pop(0)
+                job_ids.append(job_id)
+                admitted.append(AdmittedJob(page_id, project_id))
+                user_slots[user_id] -= 1
+                capacity -= 1
+                if capacity <= 0:
+                    break
+
+        if job_ids:
+            db.query(PageJob).filter(PageJob.id.in_(job_ids)).update({
+                PageJob.status: PageJobStatus.DISPATCHED,
+                PageJob.dispatched_at: datetime.now(timezone.utc)
+            }, synchronize_session=False)
+        return admitted
+
+
+# Global scheduler instance
+fair_scheduler = FairShareScheduler()
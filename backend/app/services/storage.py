@@ -1,10 +1,20 @@
 """Google Cloud Storage service for file uploads."""
-from google.cloud import storage
+import asyncio
 from app.config import settings
 import os
-from typing import BinaryIO
-from datetime import timedelta
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from datetime import datetime, timedelta, timezone
 import shutil
+import tempfile
+import fnmatch
+import glob
+import re
+import uuid
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 def _initialize_gcs_client_with_timeout(credentials_path: str, timeout: int = 30):
@@ -15,6 +25,8 @@ def _initialize_gcs_client_with_timeout(credentials_path: str, timeout: int = 30
         Exception: For other initialization errors.
     """
     def init():
+        # Imported here: google.cloud.storage is slow to import and unused in local mode
+        from google.cloud import storage
         return storage.Client.from_service_account_json(credentials_path)
 
     executor = ThreadPoolExecutor(max_workers=1)
@@ -28,6 +40,23 @@ def _initialize_gcs_client_with_timeout(credentials_path: str, timeout: int = 30
     finally:
         executor.shutdown(wait=False)
 
+# Root of local storage (originals/, outputs/, cache/)
+LOCAL_STORAGE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "storage"))
+
+# Direct uploads land in projects/{id}/staging/ until adopted into content storage
+STAGING_GLOB = "projects/*/staging/*"
+
+
+def staging_blob_path(project_id: int, extension: str) -> str:
+    """New unique path for a direct upload of one page image."""
+    return f"projects/{project_id}/staging/{uuid.uuid4().hex}{extension}"
+
+
+def is_staged(blob_path: Optional[str]) -> bool:
+    """Whether an original is a direct upload that has not been adopted yet."""
+    return bool(blob_path) and fnmatch.fnmatchcase(blob_path, STAGING_GLOB)
+
+
 class StorageService:
     """Service for managing file uploads to Google Cloud Storage."""
     
@@ -39,10 +68,23 @@ class StorageService:
         self.use_local = settings.use_local_storage
         
         # Setup local storage paths
-        self.local_base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "storage"))
+        self.local_base_path = LOCAL_STORAGE_PATH
         os.makedirs(os.path.join(self.local_base_path, "originals"), exist_ok=True)
         os.makedirs(os.path.join(self.local_base_path, "outputs"), exist_ok=True)
         
+        # Non-blocking API: blocking calls run on a bounded pool, and at most
+        # storage_max_concurrent_ops are in flight per process
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=settings.storage_io_workers,
+            thread_name_prefix="storage-io"
+        )
+        self._io_semaphore = asyncio.Semaphore(settings.storage_max_concurrent_ops)
+        
+        # Signed URL cache: (bucket, blob_path, expiration) -> (url, reuse_until)
+        # (bucket, blob, expiration) -> (URL, reuse-until monotonic time, wall-clock expiry)
+        self._signed_urls: Dict[Tuple[str, str, int], Tuple[str, float, datetime]] = {}
+        self._signed_url_lock = threading.Lock()
+        
         # GCS setup (if not using local)
         self.client = None
         self.originals_bucket = None
@@ -63,6 +105,17 @@ class StorageService:
         else:
             print(f"📁 Using local storage: {self.local_base_path}")
     
+    async def run_async(self, func: Callable, *args, **kwargs):
+        """
+        Await a blocking storage call without stalling the event loop.
+        
+        Use from async endpoints, e.g.
+        `await storage_service.run_async(storage_service.upload_source_document, file, ...)`.
+        """
+        async with self._io_semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._io_executor, partial(func, *args, **kwargs))
+    
     def upload_original_image(
         self, 
         file: BinaryIO, 
@@ -92,6 +145,154 @@ class StorageService:
             blob.upload_from_file(file, rewind=True)
             return blob_path
     
+    def upload_original_content(self, file: BinaryIO, blob_path: str) -> str:
+        """
+        Upload an original to a content-addressed path (content/{sha[:2]}/{sha}{ext}).
+
+        The caller picks the path from the content hash; see content_store.
+
+        Returns:
+            File path (GCS path or local path)
+        """
+        if self.use_local:
+            local_path = os.path.join(self.local_base_path, "originals", blob_path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            # Write-then-rename so a concurrent reader never sees a partial file
+            temp_path = f"{local_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                shutil.copyfileobj(file, f)
+            os.replace(temp_path, local_path)
+            return blob_path
+        else:
+            blob = self.originals_bucket.blob(blob_path)
+            blob.upload_from_file(file, rewind=True)
+            return blob_path
+
+    def create_resumable_upload(
+        self,
+        blob_path: str,
+        content_type: str,
+        size: Optional[int] = None,
+        origin: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Start a resumable upload session for an original, for a client to upload to directly.
+
+        Returns:
+            GCS session URL, or None in local mode (the API serves a stand-in
+            implementing the same protocol under /uploads/local)
+        """
+        if self.use_local:
+            return None
+        blob = self.originals_bucket.blob(blob_path)
+        return blob.create_resumable_upload_session(content_type=content_type, size=size, origin=origin)
+
+    def original_size(self, blob_path: str) -> Optional[int]:
+        """Size in bytes of a stored original, or None if it does not exist."""
+        if self.use_local:
+            local_path = self.get_local_path(blob_path, is_output=False)
+            return os.path.getsize(local_path) if os.path.exists(local_path) else None
+        else:
+            blob = self.originals_bucket.get_blob(blob_path)
+            return blob.size if blob else None
+
+    def copy_original(self, source_path: str, destination_path: str) -> str:
+        """Copy an original within the originals bucket (server-side for GCS)."""
+        if self.use_local:
+            destination = self.get_local_path(destination_path, is_output=False)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(self.get_local_path(source_path, is_output=False), destination)
+        else:
+            self.originals_bucket.copy_blob(
+                self.originals_bucket.blob(source_path),
+                self.originals_bucket,
+                destination_path
+            )
+        return destination_path
+
+    def delete_original(self, blob_path: str):
+        """Delete a file from the originals bucket (or local originals folder)."""
+        if self.use_local:
+            local_path = self.get_local_path(blob_path, is_output=False)
+            if os.path.exists(local_path):
+                os.remove(local_path)
+        else:
+            from google.api_core.exceptions import NotFound
+            try:
+                self.originals_bucket.blob(blob_path).delete()
+            except NotFound:
+                pass
+
+    def list_originals(self, pattern: str, older_than: datetime) -> List[str]:
+        """
+        Originals matching a glob pattern (e.g. STAGING_GLOB) last modified before `older_than`.
+
+        `*` does not cross `/`. In local mode this includes the partial
+        (`.part`) files of unfinished uploads.
+        """
+        if self.use_local:
+            root = os.path.join(self.local_base_path, "originals")
+            cutoff = older_than.timestamp()
+            return [
+                os.path.relpath(path, root).replace(os.sep, "/")
+                for path in glob.glob(os.path.join(root, pattern))
+                if os.path.isfile(path) and os.path.getmtime(path) < cutoff
+            ]
+        return [
+            blob.name
+            for blob in self.client.list_blobs(self.originals_bucket, match_glob=pattern)
+            if blob.updated < older_than
+        ]
+
+    def upload_source_document(
+        self,
+        file: BinaryIO,
+        project_id: int,
+        filename: str
+    ) -> str:
+        """
+        Stream a multi-page source document (PDF/TIFF) to storage.
+        
+        The file is copied in chunks, so large scans are never held in memory.
+        It is stored under a generated name (only the file extension is kept),
+        so concurrent ingests of equally named files never overwrite each other
+        and a client-supplied name cannot point outside the project folder.
+        
+        Returns:
+            File path (GCS path or local path)
+        """
+        extension = os.path.splitext(os.path.basename(filename or ""))[1].lower()
+        if not re.fullmatch(r"\.[a-z0-9]{1,8}", extension):
+            extension = ""
+        blob_path = f"projects/{project_id}/sources/{uuid.uuid4().hex}{extension}"
+        
+        if self.use_local:
+            local_path = os.path.join(self.local_base_path, "originals", blob_path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, 'wb') as f:
+                shutil.copyfileobj(file, f, length=1024 * 1024)
+            return blob_path
+        else:
+            blob = self.originals_bucket.blob(blob_path)
+            # Chunked resumable upload instead of a single in-memory request
+            blob.chunk_size = 8 * 1024 * 1024
+            blob.upload_from_file(file, rewind=True)
+            return blob_path
+    
+    def download_original(self, blob_path: str, destination: str) -> str:
+        """
+        Make an original (image or source document) available on local disk.
+        
+        Returns:
+            Local path to read from (the stored file itself in local mode)
+        """
+        if self.use_local:
+            return self.get_local_path(blob_path, is_output=False)
+        else:
+            blob = self.originals_bucket.blob(blob_path)
+            blob.download_to_filename(destination, timeout=300)
+            return destination
+    
     def upload_output_pdf(
         self, 
         file_path: str, 
@@ -143,10 +344,160 @@ class StorageService:
             blob.upload_from_filename(file_path)
             return blob_path
     
+    def upload_export(
+        self,
+        file_path: str,
+        project_id: int,
+        export_key: str,
+        filename: str
+    ) -> str:
+        """
+        Upload a finished export (merged book, artifacts bundle) to outputs.
+        
+        Path: projects/{project_id}/exports/{export_key}/{filename}
+        """
+        blob_path = f"projects/{project_id}/exports/{export_key}/{filename}"
+        
+        if self.use_local:
+            local_path = os.path.join(self.local_base_path, "outputs", blob_path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            shutil.copy2(file_path, local_path)
+            return blob_path
+        else:
+            blob = self.outputs_bucket.blob(blob_path)
+            blob.upload_from_filename(file_path)
+            return blob_path
+    
+    def output_exists(self, blob_path: str) -> bool:
+        """Check whether a file exists in the outputs bucket (or local outputs folder)."""
+        if self.use_local:
+            return os.path.exists(self.get_local_path(blob_path, is_output=True))
+        else:
+            return self.outputs_bucket.blob(blob_path).exists()
+    
+    def read_output_bytes(self, blob_path: str) -> bytes:
+        """Read a file from the outputs bucket (or local outputs folder) into memory."""
+        if self.use_local:
+            with open(self.get_local_path(blob_path, is_output=True), 'rb') as f:
+                return f.read()
+        else:
+            return self.outputs_bucket.blob(blob_path).download_as_bytes(timeout=60)
+    
+    def write_output_bytes(self, blob_path: str, data: bytes, content_type: str = "application/octet-stream"):
+        """Write an in-memory file to the outputs bucket (or local outputs folder)."""
+        if self.use_local:
+            with self._replace_local_output(blob_path) as temp_path:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+        else:
+            self.outputs_bucket.blob(blob_path).upload_from_string(data, content_type=content_type)
+    
+    def upload_output_file(self, file_path: str, blob_path: str):
+        """Upload a local file to the outputs bucket (or copy it to the local outputs folder)."""
+        if self.use_local:
+            with self._replace_local_output(blob_path) as temp_path:
+                shutil.copy2(file_path, temp_path)
+        else:
+            self.outputs_bucket.blob(blob_path).upload_from_filename(file_path)
+    
+    @contextmanager
+    def _replace_local_output(self, blob_path: str) -> Iterator[str]:
+        """
+        Temp path to write a local output to; it replaces the output on success.
+
+        Like a GCS upload, readers see the old file or the new one, never a
+        partially written one (a crash leaves at most a stray temp file).
+        """
+        local_path = self.get_local_path(blob_path, is_output=True)
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(local_path))
+        os.close(fd)
+        try:
+            yield temp_path
+            os.replace(temp_path, local_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def download_output(self, blob_path: str, destination: str) -> bool:
+        """Download a file from outputs to `destination`. Returns False if it does not exist."""
+        if self.use_local:
+            local_path = self.get_local_path(blob_path, is_output=True)
+            if not os.path.exists(local_path):
+                return False
+            shutil.copy2(local_path, destination)
+            return True
+        else:
+            from google.api_core.exceptions import NotFound
+            try:
+                self.outputs_bucket.blob(blob_path).download_to_filename(destination, timeout=60)
+                return True
+            except NotFound:
+                if os.path.exists(destination):
+                    os.remove(destination)
+                return False
+    
+    def delete_output_prefix(self, prefix: str):
+        """Delete every output file under a folder prefix (e.g. 'projects/1/checkpoints/7/')."""
+        if self.use_local:
+            local_path = self.get_local_path(prefix.rstrip("/"), is_output=True)
+            if os.path.isdir(local_path):
+                shutil.rmtree(local_path)
+        else:
+            self._delete_blobs(list(self.outputs_bucket.list_blobs(prefix=prefix)))
+    
+    def iter_output_downloads(
+        self,
+        blob_paths: List[str],
+        destination_dir: str,
+        max_workers: int = None
+    ) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        Download output files concurrently, yielding them in input order.
+        
+        A bounded window of downloads runs ahead of the consumer, so the first
+        file can be used (e.g. merged) while later ones are still in flight,
+        without ever downloading the whole list up front.
+        
+        Yields:
+            (index, local_path) - local_path is None if the download failed
+        """
+        if self.use_local:
+            for index, blob_path in enumerate(blob_paths):
+                local_path = self.get_local_path(blob_path, is_output=True)
+                yield index, local_path if os.path.exists(local_path) else None
+            return
+        
+        max_workers = max_workers or settings.storage_download_concurrency
+        window = max_workers * 2
+        
+        def download(index: int, blob_path: str) -> Optional[str]:
+            local_path = os.path.join(destination_dir, f"{index}_{os.path.basename(blob_path)}")
+            try:
+                self.outputs_bucket.blob(blob_path).download_to_filename(local_path, timeout=60)
+                return local_path
+            except Exception as e:
+                print(f"[Storage] Failed to download {blob_path}: {e}")
+                return None
+        
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, blob_path in enumerate(blob_paths):
+                pending.append((index, executor.submit(download, index, blob_path)))
+                if len(pending) >= window:
+                    done_index, future = pending.popleft()
+                    yield done_index, future.result()
+            while pending:
+                done_index, future = pending.popleft()
+                yield done_index, future.result()
+    
     def get_signed_url(self, bucket_name: str, blob_path: str, expiration: int = 3600) -> str:
         """
         Generate a signed URL for downloading a file.
         
+        URLs are cached and reused until shortly before they expire, so
+        repeated requests for the same file skip V4 signing.
+        
         Args:
             bucket_name: Name of the GCS bucket (or "originals"/"outputs" for local)
             blob_path: Path to the blob in the bucket
@@ -155,21 +506,80 @@ class StorageService:
         Returns:
             Signed URL or local file path
         """
+        return self.get_signed_urls(bucket_name, [blob_path], expiration)[blob_path]
+    
+    def get_signed_urls(self, bucket_name: str, blob_paths: List[str], expiration: int = 3600) -> Dict[str, str]:
+        """
+        Signed download URLs for many files of one bucket.
+        
+        Returns:
+            Dict mapping each blob path to its signed URL (or local file URL)
+        """
+        return self.get_signed_urls_expiring(bucket_name, blob_paths, expiration)[0]
+    
+    def get_signed_urls_expiring(self, bucket_name: str, blob_paths: List[str],
+                                 expiration: int = 3600) -> Tuple[Dict[str, str], Optional[datetime]]:
+        """
+        Signed download URLs for many files of one bucket, and when they expire.
+        
+        A cached URL was signed earlier and expires before a fresh one would,
+        so callers that cache the URLs themselves must use the returned time
+        rather than `expiration`.
+        
+        Returns:
+            (dict mapping each blob path to its URL, earliest expiry of those
+            URLs in UTC - None for local file URLs, which never expire)
+        """
         if self.use_local:
-            # Return local file path
             folder = "originals" if "originals" in bucket_name else "outputs"
-            local_path = os.path.join(self.local_base_path, folder, blob_path)
-            return f"file://{local_path}"
-        else:
-            # Generate GCS signed URL
+            return {
+                blob_path: f"file://{os.path.join(self.local_base_path, folder, blob_path)}"
+                for blob_path in blob_paths
+            }, None
+        
+        now = time.monotonic()
+        urls = {}
+        expires_at = None
+        missing = []
+        with self._signed_url_lock:
+            for blob_path in dict.fromkeys(blob_paths):
+                cached = self._signed_urls.get((bucket_name, blob_path, expiration))
+                if cached and cached[1] > now:
+                    urls[blob_path] = cached[0]
+                    expires_at = min(expires_at or cached[2], cached[2])
+                else:
+                    missing.append(blob_path)
+        
+        if missing:
             bucket = self.client.bucket(bucket_name)
-            blob = bucket.blob(blob_path)
-            url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(seconds=expiration),
-                method="GET"
-            )
-            return url
+            # Reuse a URL until shortly before it expires, so callers always get
+            # at least `signed_url_cache_margin` seconds of validity
+            valid_until = now + max(0, expiration - settings.signed_url_cache_margin)
+            signed_at = datetime.now(timezone.utc)
+            signed = {
+                blob_path: bucket.blob(blob_path).generate_signed_url(
+                    version="v4",
+                    expiration=timedelta(seconds=expiration),
+                    method="GET"
+                )
+                for blob_path in missing
+            }
+            urls.update(signed)
+            signed_expiry = signed_at + timedelta(seconds=expiration)
+            expires_at = min(expires_at or signed_expiry, signed_expiry)
+            
+            with self._signed_url_lock:
+                if len(self._signed_urls) + len(signed) > settings.signed_url_cache_size:
+                    # Drop expired entries, then the oldest ones
+                    self._signed_urls = {
+                        key: value for key, value in self._signed_urls.items() if value[1] > now
+                    }
+                    while self._signed_urls and len(self._signed_urls) + len(signed) > settings.signed_url_cache_size:
+                        self._signed_urls.pop(next(iter(self._signed_urls)))
+                for blob_path, url in signed.items():
+                    self._signed_urls[(bucket_name, blob_path, expiration)] = (url, valid_until, signed_expiry)
+        
+        return urls, expires_at
     
     def delete_project_files(self, project_id: int):
         """Delete all files associated with a project."""
@@ -180,15 +590,69 @@ class StorageService:
                 if os.path.exists(project_path):
                     shutil.rmtree(project_path)
         else:
-            # Delete from GCS
+            # Delete from GCS in batched requests
             prefix = f"projects/{project_id}/"
-            blobs = self.originals_bucket.list_blobs(prefix=prefix)
-            for blob in blobs:
-                blob.delete()
-            
-            blobs = self.outputs_bucket.list_blobs(prefix=prefix)
-            for blob in blobs:
-                blob.delete()
+            for bucket in (self.originals_bucket, self.outputs_bucket):
+                self._delete_blobs(list(bucket.list_blobs(prefix=prefix)))
+    
+    def delete_originals(self, blob_paths: List[str]):
+        """Delete many originals (batched requests for GCS)."""
+        if self.use_local:
+            for blob_path in blob_paths:
+                self.delete_original(blob_path)
+        else:
+            self._delete_blobs([self.originals_bucket.blob(path) for path in blob_paths])
+    
+    def delete_originals_older_than(self, blob_paths: List[str], older_than: datetime) -> int:
+        """
+        Delete originals unless they were (re)written at or after `older_than`.
+
+        Each file is checked right before it is deleted (for GCS with a
+        generation precondition), so a concurrent upload to the same path
+        is never lost.
+
+        Returns:
+            Number of files deleted
+        """
+        deleted = 0
+        if self.use_local:
+            cutoff = older_than.timestamp()
+            for blob_path in blob_paths:
+                local_path = self.get_local_path(blob_path, is_output=False)
+                try:
+                    if os.path.getmtime(local_path) < cutoff:
+                        os.remove(local_path)
+                        deleted += 1
+                except FileNotFoundError:
+                    pass
+            return deleted
+
+        from google.api_core.exceptions import NotFound, PreconditionFailed
+        for blob_path in blob_paths:
+            blob = self.originals_bucket.get_blob(blob_path)
+            if blob is None or blob.updated >= older_than:
+                continue
+            try:
+                blob.delete(if_generation_match=blob.generation)
+                deleted += 1
+            except (NotFound, PreconditionFailed):
+                pass
+        return deleted
+    
+    def _delete_blobs(self, blobs: list, batch_size: int = 100):
+        """Delete GCS blobs, up to `batch_size` per HTTP request (the batch API limit)."""
+        from google.api_core.exceptions import NotFound
+        for start in range(0, len(blobs), batch_size):
+            try:
+                with self.client.batch():
+                    for blob in blobs[start:start + batch_size]:
+                        blob.delete()
+            except NotFound:
+                # Already gone; the rest of the batch was still applied
+                pass
+    
+    async def delete_project_files_async(self, project_id: int):
+        await self.run_async(self.delete_project_files, project_id)
     
     def get_local_path(self, blob_path: str, is_output: bool = True) -> str:
         """Get the local filesystem path for a stored file."""
@@ -196,5 +660,49 @@ class StorageService:
         return os.path.join(self.local_base_path, folder, blob_path)
 
 
-# Global storage service instance
-storage_service = StorageService()
+_storage_service: Optional[StorageService] = None
+_storage_pid: Optional[int] = None
+_storage_lock = threading.Lock()
+
+
+def get_storage_service() -> StorageService:
+    """
+    Return the process-wide StorageService, building it on first use.
+    
+    Construction (GCS client, bucket handles, local folders) is deferred
+    until storage is actually needed, and redone in a forked child so a
+    worker never reuses its parent's GCS connections.
+    """
+    global _storage_service, _storage_pid
+    pid = os.getpid()
+    if _storage_service is None or _storage_pid != pid:
+        with _storage_lock:
+            if _storage_service is None or _storage_pid != pid:
+                _storage_service = StorageService()
+                _storage_pid = pid
+    return _storage_service
+
+
+def warm_up_storage(background: bool = True):
+    """
+    Build the StorageService ahead of the first request or task.
+    
+    Args:
+        background: Build on a daemon thread so startup is not delayed;
+            callers needing storage meanwhile wait for the same instance
+    """
+    if background:
+        threading.Thread(target=get_storage_service, name="storage-warm-up", daemon=True).start()
+    else:
+        get_storage_service()
+
+
+class _LazyStorageService:
+    """Stand-in for the global instance that builds it on first attribute access."""
+    
+    def __getattr__(self, name):
+        return getattr(get_storage_service(), name)
+
+
+# Global storage service instance (built lazily, see get_storage_service)
+storage_service = _LazyStorageService()
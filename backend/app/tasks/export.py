@@ -0,0 +1,99 @@
+"""Background tasks for exporting complete books."""
+import logging
+import os
+import tempfile
+import zipfile
+from typing import Dict
+from app.celery_app import celery_app
+from app.models.db_models import Project
+from app.services.book_assembly import book_assembler
+from app.services.storage import storage_service
+from app.tasks.translation import DBTask
+
+logger = logging.getLogger(__name__)
+
+BOOK_FILENAME = "book.pdf"
+ARTIFACTS_FILENAME = "artifacts.zip"
+
+
+def export_blob_paths(project_id: int, export_key: str, include_artifacts: bool) -> Dict[str, str]:
+    """Storage paths (outputs bucket) of the files making up an export."""
+    paths = {"book_path": f"projects/{project_id}/exports/{export_key}/{BOOK_FILENAME}"}
+    if include_artifacts:
+        paths["artifacts_path"] = f"projects/{project_id}/exports/{export_key}/{ARTIFACTS_FILENAME}"
+    return paths
+
+
+@celery_app.task(
+    bind=True,
+    base=DBTask,
+    name='app.tasks.export.export_book_task',
+    time_limit=7200,  # 2 hours for very large books
+    soft_time_limit=6900
+)
+def export_book_task(self, project_id: int, include_artifacts: bool = False):
+    """
+    Build the complete book for a project and store it in the outputs bucket.
+
+    Exports are keyed by a fingerprint of the page outputs they contain, so
+    re-exporting an unchanged book returns the stored files immediately.
+
+    Args:
+        project_id: Database ID of the project
+        include_artifacts: Also bundle every page's artifacts JSON into a zip
+    """
+    db = self.db
+
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    pages = book_assembler.current_pages(db, project_id)
+    if not pages:
+        raise ValueError("No completed pages found")
+
+    export_key = book_assembler.fingerprint(pages, include_artifacts)
+    paths = export_blob_paths(project_id, export_key, include_artifacts)
+    result = {
+        'status': 'completed',
+        'project_id': project_id,
+        'export_key': export_key,
+        'pages': len(pages),
+        **paths
+    }
+
+    if all(storage_service.output_exists(path) for path in paths.values()):
+        logger.info(f"Export {export_key} for project {project_id} already stored")
+        return {**result, 'cached': True}
+
+    def report(stage: str, current: int, total: int):
+        self.update_state(
+            state='PROGRESS',
+            meta={'stage': stage, 'current': current, 'total': total}
+        )
+
+    book_path = book_assembler.assemble(
+        db,
+        project_id,
+        progress=lambda done, total: report('merging', done, total)
+    )
+    storage_service.upload_export(book_path, project_id, export_key, BOOK_FILENAME)
+
+    if include_artifacts:
+        artifact_paths = [
+            f"projects/{project_id}/outputs/page_{page['page_number']}_artifacts.json"
+            for page in pages
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bundle_path = os.path.join(temp_dir, ARTIFACTS_FILENAME)
+            with zipfile.ZipFile(bundle_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+                downloads = storage_service.iter_output_downloads(artifact_paths, temp_dir)
+                for index, local_path in downloads:
+                    report('artifacts', index, len(pages))
+                    if local_path:
+                        bundle.write(local_path, arcname=os.path.basename(artifact_paths[index]))
+            storage_service.upload_export(bundle_path, project_id, export_key, ARTIFACTS_FILENAME)
+
+    logger.info(f"✅ Exported book for project {project_id} ({len(pages)} pages, key {export_key})")
+
+    return {**result, 'cached': False}
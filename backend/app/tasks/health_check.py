@@ -1,23 +1,66 @@
 """
 Health Check Tasks
 Automatically detect and recover stuck pages to prevent system lockups.
+Pages whose worker died are found through their expired processing lease
+within seconds; the slower sweeps catch pages that never got that far.
 """
 from celery import shared_task
+from sqlalchemy import or_
+from sqlalchemy.sql import func
 from datetime import datetime, timedelta, timezone
 from app.database import SessionLocal
-from app.models.db_models import Page, PageStatus
+from app.models.db_models import Page, PageStatus, PageJob, PageJobStatus
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@shared_task(name="app.tasks.health_check.recover_expired_leases")
+def recover_expired_leases():
+    """
+    Requeue pages whose worker stopped renewing its processing lease.
+
+    Workers renew the lease every few seconds while they process a page, so
+    an expired lease means the worker died or hung. Such pages go back to
+    QUEUED and are requeued (resuming from their stage checkpoints); pages
+    that already lost `page_max_attempts` workers are marked FAILED.
+    """
+    from app.services.page_lease import page_leases
+    from app.tasks.translation import enqueue_page
+
+    db = SessionLocal()
+
+    try:
+        requeued, failed = page_leases.expire(db)
+        db.commit()
+
+        for page_id, project_id in requeued:
+            enqueue_page(page_id, project_id, interactive=False)
+
+        if requeued or failed:
+            logger.warning(
+                f"Recovered {len(requeued) + failed} pages with expired leases "
+                f"({len(requeued)} requeued, {failed} failed)"
+            )
+
+        return {"success": True, "requeued": len(requeued), "failed": failed}
+
+    except Exception as e:
+        logger.error(f"Error during lease recovery: {e}")
+        db.rollback()
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
 @shared_task(name="app.tasks.health_check.recover_stuck_pages")
 def recover_stuck_pages():
     """
     Detect and recover pages stuck in PROCESSING or QUEUED status.
 
     A page is considered stuck if:
-    - Status is PROCESSING for more than 30 minutes
+    - Status is PROCESSING for more than 30 minutes without a lease (pages
+      with a lease are handled by recover_expired_leases)
     - Status is QUEUED for more than 10 minutes (should be picked up quickly)
 
     Recovery action: Reset to UPLOADED with error message explaining the issue.
@@ -32,59 +75,54 @@ def recover_stuck_pages():
         processing_timeout = now - timedelta(minutes=30)
         queued_timeout = now - timedelta(minutes=10)
 
-        # Find stuck PROCESSING pages
+        # Recover stuck PROCESSING pages
         stuck_processing = db.query(Page).filter(
             Page.status == PageStatus.PROCESSING,
+            Page.lease_expires_at.is_(None),
             Page.updated_at < processing_timeout
-        ).all()
+        ).update({
+            Page.status: PageStatus.UPLOADED,
+            Page.error_message: (
+                "Automatically recovered from stuck PROCESSING status "
+                "(stuck for more than 30 minutes). Ready to retry."
+            )
+        }, synchronize_session=False)
 
-        # Find stuck QUEUED pages
+        # Recover stuck QUEUED pages. Pages waiting in the scheduler backlog are
+        # not stuck, and admitted ones are timed from their dispatch, not from queueing
+        backlog = db.query(PageJob.page_id).filter(or_(
+            PageJob.status == PageJobStatus.PENDING,
+            PageJob.dispatched_at >= queued_timeout
+        ))
         stuck_queued = db.query(Page).filter(
             Page.status == PageStatus.QUEUED,
-            Page.updated_at < queued_timeout
-        ).all()
-
-        total_recovered = 0
-
-        # Recover stuck PROCESSING pages
-        for page in stuck_processing:
-            age_minutes = (now - page.updated_at).total_seconds() / 60
-            logger.warning(
-                f"Recovering stuck PROCESSING page {page.id} "
-                f"(page #{page.page_number}, stuck for {age_minutes:.1f} minutes)"
+            Page.updated_at < queued_timeout,
+            ~Page.id.in_(backlog)
+        ).update({
+            Page.status: PageStatus.UPLOADED,
+            Page.error_message: (
+                "Automatically recovered from stuck QUEUED status "
+                "(stuck for more than 10 minutes). Ready to retry."
             )
-            page.status = PageStatus.UPLOADED
-            page.error_message = (
-                f"Automatically recovered from stuck PROCESSING status "
-                f"(stuck for {age_minutes:.1f} minutes). Ready to retry."
-            )
-            total_recovered += 1
+        }, synchronize_session=False)
 
-        # Recover stuck QUEUED pages
-        for page in stuck_queued:
-            age_minutes = (now - page.updated_at).total_seconds() / 60
-            logger.warning(
-                f"Recovering stuck QUEUED page {page.id} "
-                f"(page #{page.page_number}, stuck for {age_minutes:.1f} minutes)"
-            )
-            page.status = PageStatus.UPLOADED
-            page.error_message = (
-                f"Automatically recovered from stuck QUEUED status "
-                f"(stuck for {age_minutes:.1f} minutes). Ready to retry."
-            )
-            total_recovered += 1
+        total_recovered = stuck_processing + stuck_queued
 
         if total_recovered > 0:
             db.commit()
-            logger.info(f"✅ Recovered {total_recovered} stuck pages")
+            logger.warning(
+                f"✅ Recovered {total_recovered} stuck pages "
+                f"({stuck_processing} processing, {stuck_queued} queued)"
+            )
         else:
+            db.rollback()
             logger.debug("No stuck pages found")
 
         return {
             "success": True,
             "recovered": total_recovered,
-            "processing": len(stuck_processing),
-            "queued": len(stuck_queued)
+            "processing": stuck_processing,
+            "queued": stuck_queued
         }
 
     except Exception as e:
@@ -107,17 +145,15 @@ def cleanup_old_errors():
         # Clear error messages from FAILED pages older than 7 days
         old_threshold = datetime.now(timezone.utc) - timedelta(days=7)
 
-        old_failed = db.query(Page).filter(
+        # Archive error message but keep status
+        count = db.query(Page).filter(
             Page.status == PageStatus.FAILED,
             Page.updated_at < old_threshold,
-            Page.error_message.isnot(None)
-        ).all()
-
-        count = 0
-        for page in old_failed:
-            # Archive error message but keep status
-            page.error_message = f"[Archived] {page.error_message[:100]}..."
-            count += 1
+            Page.error_message.isnot(None),
+            ~Page.error_message.startswith("[Archived]")
+        ).update({
+            Page.error_message: "[Archived] " + func.substr(Page.error_message, 1, 100) + "..."
+        }, synchronize_session=False)
 
         if count > 0:
             db.commit()
@@ -131,3 +167,104 @@ def cleanup_old_errors():
         return {"success": False, "error": str(e)}
     finally:
         db.close()
+
+
+@shared_task(name="app.tasks.health_check.cleanup_unreferenced_content")
+def cleanup_unreferenced_content():
+    """
+    Delete original images that no page has referenced for a day.
+
+    Page deletes and image replacements only drop a reference; the grace
+    period lets a re-upload of the same image reuse the blob instead.
+    """
+    from app.services.content_store import content_store
+
+    db = SessionLocal()
+
+    try:
+        deleted = content_store.collect_garbage(db)
+        if deleted:
+            logger.info(f"Deleted {deleted} unreferenced original images")
+        return {"success": True, "deleted": deleted}
+
+    except Exception as e:
+        logger.error(f"Error during content cleanup: {e}")
+        db.rollback()
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.health_check.cleanup_stale_staging")
+def cleanup_stale_staging():
+    """
+    Clean up direct uploads left in staging after their session expired.
+
+    Files uploaded but never finalized (and partial local uploads) are
+    deleted. Files that a finalized page still points at are not: their
+    adoption never completed, so it is started again instead.
+    """
+    from app.config import settings
+    from app.services.storage import STAGING_GLOB, storage_service
+    from app.tasks.ingest import adopt_uploaded_pages_task
+
+    db = SessionLocal()
+
+    try:
+        # The upload token expires with the session, so nothing staged before
+        # then can still be finalized
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.upload_session_expire_minutes + 60)
+        stale = storage_service.list_originals(STAGING_GLOB, older_than=cutoff)
+        if not stale:
+            return {"success": True, "deleted": 0, "readopted": 0}
+
+        pending = {}
+        for page_id, project_id in db.query(Page.id, Page.project_id).filter(
+            Page.original_image_path.in_(stale),
+            Page.image_hash.is_(None),
+            Page.status == PageStatus.UPLOADED
+        ):
+            pending.setdefault(project_id, []).append(page_id)
+        referenced = {
+            path for (path,) in db.query(Page.original_image_path).filter(Page.original_image_path.in_(stale))
+        }
+
+        orphans = [path for path in stale if path not in referenced]
+        storage_service.delete_originals(orphans)
+        for project_id, page_ids in pending.items():
+            adopt_uploaded_pages_task.apply_async(args=[project_id, page_ids])
+
+        readopted = sum(len(page_ids) for page_ids in pending.values())
+        logger.info(f"Deleted {len(orphans)} stale staged uploads, re-adopting {readopted} pages")
+        return {"success": True, "deleted": len(orphans), "readopted": readopted}
+
+    except Exception as e:
+        logger.error(f"Error during staging cleanup: {e}")
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.health_check.reconcile_project_counters")
+def reconcile_project_counters():
+    """
+    Recompute project page counters from the pages table.
+
+    The counters are maintained incrementally with every page change; this
+    only corrects drift (see app.services.project_counters).
+    """
+    from app.services.project_counters import project_counters
+
+    db = SessionLocal()
+
+    try:
+        corrected = project_counters.reconcile(db)
+        db.commit()
+        return {"success": True, "corrected": corrected}
+
+    except Exception as e:
+        logger.error(f"Error during counter reconciliation: {e}")
+        db.rollback()
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
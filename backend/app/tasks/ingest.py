@@ -0,0 +1,260 @@
+"""Background tasks for multi-page document (PDF/TIFF) ingestion."""
+import io
+import os
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from app.celery_app import celery_app
+from app.config import settings
+from app.models.db_models import Page, Project, PageStatus, ProjectStatus
+from app.services.storage import is_staged, storage_service
+from app.services.content_store import content_store
+from app.tasks.translation import DBTask
+from app.tasks.scheduler import submit_pages
+
+logger = logging.getLogger(__name__)
+
+PDF_EXTENSIONS = ('.pdf',)
+TIFF_EXTENSIONS = ('.tif', '.tiff')
+SUPPORTED_EXTENSIONS = PDF_EXTENSIONS + TIFF_EXTENSIONS
+
+
+class DocumentRasterizer:
+    """
+    Renders the pages of a multi-page PDF or TIFF one at a time.
+
+    PDF pages are rendered by poppler (one pdftoppm call per page), TIFF frames
+    are decoded from a per-thread file handle, so pages can be rendered from a
+    thread pool without ever loading the whole document.
+    """
+
+    def __init__(self, path: str, dpi: int):
+        self.path = path
+        self.dpi = dpi
+        self.is_pdf = path.lower().endswith(PDF_EXTENSIONS)
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+        self.page_count = self._count_pages()
+
+    def _tiff(self):
+        """Per-thread TIFF handle (PIL images are not safe to seek concurrently)."""
+        handle = getattr(self._local, 'handle', None)
+        if handle is None:
+            from PIL import Image
+            handle = Image.open(self.path)
+            self._local.handle = handle
+            with self._lock:
+                self._handles.append(handle)
+        return handle
+
+    def _count_pages(self) -> int:
+        if self.is_pdf:
+            from pdf2image import pdfinfo_from_path
+            return int(pdfinfo_from_path(self.path)["Pages"])
+        return getattr(self._tiff(), "n_frames", 1)
+
+    def render_png(self, index: int) -> bytes:
+        """Render page `index` (0-based) to PNG bytes."""
+        if self.is_pdf:
+            from pdf2image import convert_from_path
+            image = convert_from_path(
+                self.path,
+                dpi=self.dpi,
+                first_page=index + 1,
+                last_page=index + 1
+            )[0]
+        else:
+            image = self._tiff()
+            image.seek(index)
+            if image.mode not in ("RGB", "L", "1"):
+                image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def close(self):
+        with self._lock:
+            for handle in self._handles:
+                handle.close()
+            self._handles = []
+
+
+@celery_app.task(
+    bind=True,
+    base=DBTask,
+    name='app.tasks.ingest.ingest_document_task',
+    time_limit=21600,  # 6 hours for very large scans
+    soft_time_limit=21000
+)
+def ingest_document_task(self, project_id: int, document_path: str, start_page: int,
+                         dpi: int = None, auto_process: bool = True):
+    """
+    Split a stored multi-page document into page images and create their pages.
+
+    Pages are rasterized in batches on a thread pool; each batch is uploaded,
+    inserted with a single commit and (optionally) queued for processing
+    before the next batch is rendered. The source document is deleted once
+    every page is created; after a failure it is kept (for inspection or a
+    retry) until the project is deleted.
+
+    Args:
+        project_id: Database ID of the project
+        document_path: Storage path of the uploaded PDF/TIFF (originals bucket)
+        start_page: Page number assigned to the first page of the document
+        dpi: Rasterization resolution for PDF pages (default: settings.ingest_dpi)
+        auto_process: Queue every created page for translation
+    """
+    db = self.db
+    dpi = dpi or settings.ingest_dpi
+    batch_size = max(1, settings.ingest_batch_size)
+    stem = Path(document_path).stem
+    created_ids = []
+
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_path = storage_service.download_original(
+            document_path,
+            os.path.join(temp_dir, f"source{Path(document_path).suffix.lower()}")
+        )
+        rasterizer = DocumentRasterizer(local_path, dpi)
+
+        try:
+            total = rasterizer.page_count
+            last_page = start_page + total - 1
+            logger.info(f"Ingesting {total} pages from {document_path} as pages {start_page}-{last_page}")
+
+            conflict = db.query(Page.page_number).filter(
+                Page.project_id == project_id,
+                Page.page_number >= start_page,
+                Page.page_number <= last_page
+            ).first()
+            if conflict:
+                raise ValueError(f"Page {conflict.page_number} already exists in this project")
+
+
+            initial_status = PageStatus.QUEUED if auto_process else PageStatus.UPLOADED
+
+            with ThreadPoolExecutor(max_workers=settings.ingest_workers) as executor:
+                for batch_start in range(0, total, batch_size):
+                    indices = range(batch_start, min(total, batch_start + batch_size))
+                    images = list(executor.map(rasterizer.render_png, indices))
+
+                    # Content-addressed: re-ingesting the same document stores nothing new
+                    stored = content_store.store_many(db, [
+                        (io.BytesIO(png), f"{stem}_p{index + 1}.png")
+                        for index, png in zip(indices, images)
+                    ])
+
+                    pages = [
+                        Page(
+                            project_id=project_id,
+                            page_number=start_page + index,
+                            original_image_path=content.blob_path,
+                            image_hash=content.sha256,
+                            status=initial_status
+                        )
+                        for index, content in zip(indices, stored)
+                    ]
+                    db.add_all(pages)
+                    if project.status == ProjectStatus.CREATED:
+                        project.status = ProjectStatus.PROCESSING
+                    db.flush()
+                    batch_ids = [page.id for page in pages]
+                    if auto_process:
+                        # Commits the pages together with their backlog entries
+                        submit_pages(db, project_id, batch_ids)
+                    else:
+                        db.commit()
+                    created_ids.extend(batch_ids)
+
+                    self.update_state(
+                        state='PROGRESS',
+                        meta={
+                            'current': len(created_ids),
+                            'total': total,
+                            'status': 'ingesting'
+                        }
+                    )
+        finally:
+            rasterizer.close()
+
+    # The pages hold their own images now
+    storage_service.delete_original(document_path)
+
+    logger.info(f"✅ Ingested {len(created_ids)} pages into project {project_id}")
+
+    return {
+        'status': 'completed',
+        'project_id': project_id,
+        'pages_created': len(created_ids),
+        'page_ids': created_ids,
+        'first_page': start_page,
+        'last_page': start_page + len(created_ids) - 1
+    }
+
+
+@celery_app.task(
+    bind=True,
+    base=DBTask,
+    name='app.tasks.ingest.adopt_uploaded_pages_task'
+)
+def adopt_uploaded_pages_task(self, project_id: int, page_ids: list, auto_process: bool = False):
+    """
+    Move directly-uploaded page images from staging into content-addressed storage.
+
+    Pages created by the direct upload flow point at their staged file until
+    this task has hashed it, and are not processed before that (see
+    queue_pages). Files are adopted one by one: a page whose staged file is
+    missing or unreadable is marked FAILED without holding up the others.
+    The staged files are deleted afterwards.
+
+    Args:
+        project_id: Database ID of the project
+        page_ids: Pages created by the upload finalize call
+        auto_process: Queue the pages for translation once adopted
+    """
+    db = self.db
+
+    pages = db.query(Page).filter(
+        Page.id.in_(page_ids),
+        Page.project_id == project_id,
+        Page.image_hash.is_(None)
+    ).order_by(Page.page_number).all()
+    pages = [page for page in pages if is_staged(page.original_image_path)]
+
+    staged = [page.original_image_path for page in pages]
+    stored = content_store.adopt_many(db, staged)
+
+    adopted = []
+    for page, content in zip(pages, stored):
+        if content is None:
+            page.status = PageStatus.FAILED
+            page.error_message = "Uploaded image is missing or unreadable; upload it again"
+            continue
+        page.original_image_path = content.blob_path
+        page.image_hash = content.sha256
+        if auto_process:
+            page.status = PageStatus.QUEUED
+        adopted.append(page)
+    if auto_process and adopted:
+        submit_pages(db, project_id, [page.id for page in adopted])
+    else:
+        db.commit()
+
+    storage_service.delete_originals(staged)
+
+    logger.info(f"✅ Adopted {len(adopted)} of {len(pages)} uploaded pages into project {project_id}")
+
+    return {
+        'status': 'completed',
+        'project_id': project_id,
+        'pages_adopted': len(adopted),
+        'pages_failed': len(pages) - len(adopted)
+    }
@@ -0,0 +1,92 @@
+"""Background tasks for the fair-share page scheduler."""
+import logging
+from typing import Iterable, List
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.db_models import Page, PageStatus
+from app.services.page_lease import page_leases
+from app.services.scheduler import fair_scheduler
+from app.services.storage import STAGING_GLOB
+from app.tasks.translation import DBTask, enqueue_page
+
+logger = logging.getLogger(__name__)
+
+
+def _dispatch(db: Session) -> int:
+    """Admit pending jobs, commit the claims, then enqueue the admitted pages."""
+    fair_scheduler.reap(db)
+    admitted = fair_scheduler.dispatch(db)
+    db.commit()
+
+    for job in admitted:
+        enqueue_page(job.page_id, job.project_id, interactive=False)
+
+    if admitted:
+        logger.info(f"Admitted {len(admitted)} pages from the backlog")
+    return len(admitted)
+
+
+def submit_pages(db: Session, project_id: int, page_ids: Iterable[int]) -> int:
+    """
+    Add pages to the backlog and commit, then admit what the quotas allow.
+
+    Returns:
+        Number of jobs added
+    """
+    added = fair_scheduler.submit(db, project_id, page_ids)
+    db.commit()
+    dispatch_page_jobs.delay()
+    return added
+
+
+def queue_pages(db: Session, project_id: int, *criteria) -> List[int]:
+    """
+    Mark a project's pages matching `criteria` QUEUED and add them to the backlog.
+
+    Set-based: one UPDATE ... RETURNING picks the pages (skipping pages being
+    processed right now, and direct uploads not adopted yet - the adopt task
+    deletes their staged file) and one INSERT records their jobs. The caller
+    commits, then calls dispatch_page_jobs.delay() to admit them.
+
+    Returns:
+        IDs of the queued pages, in page order
+    """
+    queued = db.execute(
+        update(Page).where(
+            Page.project_id == project_id,
+            page_leases.available_filter(),
+            Page.original_image_path.notlike(STAGING_GLOB.replace("*", "%")),
+            *criteria
+        ).values(status=PageStatus.QUEUED)
+        .returning(Page.id, Page.page_number)
+        .execution_options(synchronize_session=False)
+    ).all()
+    page_ids = [page_id for page_id, _ in sorted(queued, key=lambda row: row[1])]
+    fair_scheduler.submit(db, project_id, page_ids)
+    return page_ids
+
+
+def release_page_job(page_id: int):
+    """Free the slot of a finished bulk page and admit the next pending page."""
+    db = SessionLocal()
+    try:
+        if fair_scheduler.release(db, page_id):
+            db.commit()
+            _dispatch(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to release scheduler slot of page {page_id}: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    base=DBTask,
+    name='app.tasks.scheduler.dispatch_page_jobs'
+)
+def dispatch_page_jobs(self):
+    """Admit pending backlog pages into Celery (also run periodically by beat)."""
+    return {'admitted': _dispatch(self.db)}
@@ -4,10 +4,17 @@ import sys
 import logging
 from pathlib import Path
 from celery import Task
-from app.celery_app import celery_app
+from sqlalchemy.orm import Session
+from app.celery_app import (
+    celery_app, QUEUE_INTERACTIVE, QUEUE_BATCH,
+    PRIORITY_INTERACTIVE, PRIORITY_DEFAULT, PRIORITY_LOWEST
+)
+from app.config import settings
 from app.database import SessionLocal
 from app.models.db_models import Page, Project, PageStatus
-from app.services.storage import storage_service
+from app.services.storage import is_staged, storage_service
+from app.services.page_lease import page_leases
+from app.services.page_checkpoints import StorageCheckpoint
 from datetime import datetime
 
 # Add src directory to path for BookTranslator import
@@ -40,16 +47,30 @@ class DBTask(Task):
             self._db = None
 
 
+def _result_status(page: Page) -> PageStatus:
+    """Status of a page with a stored result, based on its quality score."""
+    if page.quality_score is not None and page.quality_score < 70:
+        return PageStatus.NEEDS_REVIEW
+    return PageStatus.COMPLETED
+
+
 @celery_app.task(bind=True, base=DBTask, name='app.tasks.translation.process_page_task')
-def process_page_task(self, page_id: int, project_id: int):
+def process_page_task(self, page_id: int, project_id: int, force: bool = False):
     """
     Process a single page: OCR, translate, generate PDF.
+
+    Runs at most once at a time per page (see app.services.page_lease) and is
+    skipped when the stored result was produced from identical inputs.
     
     Args:
         page_id: Database ID of the page
         project_id: Database ID of the project
+        force: Reprocess even if the stored result is up to date
     """
     db = self.db
+    lease_owner = page_leases.new_owner()
+    owns_page = True
+    heartbeat = None
     
     try:
         # Get page from database
@@ -62,14 +83,62 @@ def process_page_task(self, page_id: int, project_id: int):
         if not project:
             raise ValueError(f"Project {project_id} not found")
         
-        # Update status to processing
-        page.status = PageStatus.PROCESSING
-        db.commit()
+        if is_staged(page.original_image_path):
+            # Direct upload not adopted yet: its staged file is about to be
+            # deleted, and the adopt task queues the page itself once done
+            owns_page = False
+            from app.tasks.scheduler import release_page_job
+            release_page_job(page_id)
+            logger.info(f"Page {page_id} is still being uploaded, skipping")
+            return {
+                'status': 'not_ready',
+                'page_id': page_id,
+                'page_number': page.page_number
+            }
+
+        fingerprint = page_leases.fingerprint(page, project)
+        if not force and page.output_pdf_path and page.result_fingerprint == fingerprint:
+            # This task never takes the lease, so its finally must not release anything
+            owns_page = False
+            # Restore the result status unless a (forced) run holds the page right now
+            restored = db.query(Page).filter(
+                Page.id == page_id,
+                page_leases.available_filter()
+            ).update({Page.status: _result_status(page)}, synchronize_session=False)
+            db.commit()
+            if not restored:
+                logger.info(f"Page {page_id} is already being processed, skipping duplicate")
+                return {
+                    'status': 'duplicate',
+                    'page_id': page_id,
+                    'page_number': page.page_number
+                }
+
+            # Free this page's own fair-share slot (no-op for pages queued interactively)
+            from app.tasks.scheduler import release_page_job
+            release_page_job(page_id)
+            logger.info(f"Page {page_id} is up to date, skipping")
+            return {
+                'status': 'skipped',
+                'page_id': page_id,
+                'page_number': page.page_number
+            }
+
+        # Take the lease (and PROCESSING status); another task may hold it already
+        if not page_leases.acquire(db, page_id, lease_owner):
+            owns_page = False
+            logger.info(f"Page {page_id} is already being processed, skipping duplicate")
+            return {
+                'status': 'duplicate',
+                'page_id': page_id,
+                'page_number': page.page_number
+            }
+        heartbeat = page_leases.heartbeat(page_id, lease_owner)
+        db.refresh(page)
         
         logger.info(f"Starting processing for page {page_id} (page #{page.page_number})")
         
         # Download image from GCS if needed
-        from app.config import settings
         # Try to find the image locally first (fallback for hybrid storage)
         local_path = storage_service.get_local_path(
             page.original_image_path,
@@ -129,10 +198,26 @@ def process_page_task(self, page_id: int, project_id: int):
             output_dir,
             book_context=project.book_context or '',
             source_language=source_lang,
-            target_language=target_lang
+            target_language=target_lang,
+            # Stages finished by an interrupted earlier run are resumed
+            checkpoint=StorageCheckpoint(project_id, page_id, fingerprint),
+            # Originals are content-addressed, so pages with identical images share
+            # a file name; outputs are named per page instead
+            page_name=f"p{project_id}_{page_id}"
         )
 
         results = translator.process_page(verbose=True)
+        if heartbeat.lost:
+            # Another run owns the page now (checked again under lock before any write)
+            owns_page = False
+            logger.warning(f"Lost the lease on page {page_id} during processing; discarding this run's result")
+            return {
+                'status': 'lease_lost',
+                'page_id': page_id,
+                'page_number': page.page_number
+            }
+        if results.get('resumed_stages'):
+            logger.info(f"Page {page_id} resumed stages from checkpoint: {', '.join(results['resumed_stages'])}")
 
         # Store detected language at page level
         if results.get('detected_language'):
@@ -162,7 +247,7 @@ def process_page_task(self, page_id: int, project_id: int):
             trans_text = results.get('steps', {}).get('translation', {}).get('preview', '')
             
             # If OCR/translation preview not available, try to read from saved files
-            stem = Path(image_path).stem
+            stem = translator.page_name
             if not ocr_text:
                 japanese_file = os.path.join(output_dir, f"{stem}_japanese.txt")
                 if os.path.exists(japanese_file):
@@ -254,25 +339,31 @@ def process_page_task(self, page_id: int, project_id: int):
             
             # Update page in database
             # Set status based on quality score
-            if page.quality_score is not None and page.quality_score < 70:
-                page.status = PageStatus.NEEDS_REVIEW
+            page.status = _result_status(page)
+            if page.status == PageStatus.NEEDS_REVIEW:
                 logger.warning(f"Page {page_id} marked as NEEDS_REVIEW (quality score: {page.quality_score})")
-            else:
-                page.status = PageStatus.COMPLETED
 
             page.ocr_text = ocr_text
             page.translated_text = trans_text
             page.output_pdf_path = output_gcs_path
+            page.result_fingerprint = fingerprint
+            page.attempts = 0
             page.processed_at = datetime.utcnow()
             
-            # Update project progress
-            completed = db.query(Page).filter(
-                Page.project_id == project_id,
-                Page.status == PageStatus.COMPLETED
-            ).count()
-            project.completed_pages = completed
+            # Only the lease holder may write the result; a newer run owns it otherwise
+            if not page_leases.fence(db, page_id, lease_owner):
+                db.rollback()
+                owns_page = False
+                logger.warning(f"Lost the lease on page {page_id} before saving; discarding this run's result")
+                return {
+                    'status': 'lease_lost',
+                    'page_id': page_id,
+                    'page_number': page.page_number
+                }
             
+            # Project progress counters follow the status change in the same commit
             db.commit()
+            StorageCheckpoint.clear(project_id, page_id)
             
             logger.info(f"✅ Page {page_id} completed successfully")
             
@@ -308,9 +399,14 @@ def process_page_task(self, page_id: int, project_id: int):
             logger.error(f"❌ Page {page_id} failed: {error_msg}")
             logger.debug(f"Full results structure: {results}")
             
-            page.status = PageStatus.FAILED
-            page.error_message = error_msg[:500]  # Limit error message length
-            db.commit()
+            if page_leases.fence(db, page_id, lease_owner):
+                page.status = PageStatus.FAILED
+                page.error_message = error_msg[:500]  # Limit error message length
+                page.attempts = 0
+                db.commit()
+            else:
+                db.rollback()
+                owns_page = False
             
             raise Exception(error_msg)
     
@@ -319,79 +415,121 @@ def process_page_task(self, page_id: int, project_id: int):
         logger.exception(f"Error processing page {page_id}")
         
         try:
+            db.rollback()
+            if owns_page and not page_leases.fence(db, page_id, lease_owner):
+                # The lease expired and the page was handed to a newer run
+                owns_page = False
+                db.rollback()
             page = db.query(Page).filter(Page.id == page_id).first()
-            if page:
+            if page and owns_page:
                 page.status = PageStatus.FAILED
                 page.error_message = str(e)
+                page.attempts = 0
                 db.commit()
         except Exception as db_error:
             logger.error(f"Failed to update page status: {db_error}")
         
         raise
 
+    finally:
+        if heartbeat:
+            heartbeat.stop()
+        if owns_page:
+            try:
+                page_leases.release(db, page_id, lease_owner)
+            except Exception as lease_error:
+                logger.error(f"Failed to release lease of page {page_id}: {lease_error}")
+
+            # Free the page's fair-share slot (no-op for pages queued interactively)
+            from app.tasks.scheduler import release_page_job
+            release_page_job(page_id)
+
+
+def enqueue_page(page_id: int, project_id: int, interactive: bool = True, position: int = 0,
+                 force: bool = False):
+    """
+    Queue one page for processing.
+
+    Interactive pages (a user waiting on a single page) go to the interactive
+    queue at top priority. Bulk pages go to the batch queue with a priority
+    that drops every `batch_priority_band` pages of their submission, so the
+    first pages of a small book are taken before the tail of a large one.
+
+    Args:
+        page_id: Database ID of the page
+        project_id: Database ID of the project
+        interactive: Single-page request rather than part of a bulk submission
+        position: Index of the page within its bulk submission
+        force: Reprocess even if the stored result is up to date
+    """
+    if interactive:
+        queue, priority = QUEUE_INTERACTIVE, PRIORITY_INTERACTIVE
+    else:
+        band = position // max(1, settings.batch_priority_band)
+        queue, priority = QUEUE_BATCH, min(PRIORITY_DEFAULT + band, PRIORITY_LOWEST)
+
+    return process_page_task.apply_async(
+        args=[page_id, project_id],
+        kwargs={'force': force} if force else None,
+        task_id=f"page_{page_id}",
+        queue=queue,
+        priority=priority
+    )
+
+
+def queue_interactive_page(db: Session, page: Page, force: bool = False):
+    """
+    Mark a page QUEUED and publish its interactive task.
+
+    The status is committed first, so the worker always finds the page
+    QUEUED. If publishing then fails (broker down), the previous status is
+    restored - unless a worker took the page meanwhile - and the error
+    re-raised, instead of leaving the page QUEUED with no task behind it
+    until the stuck-page sweep.
+
+    Returns:
+        The Celery AsyncResult of the published task
+    """
+    previous_status = page.status
+    page.status = PageStatus.QUEUED
+    db.commit()
+
+    try:
+        return enqueue_page(page.id, page.project_id, force=force)
+    except Exception:
+        db.query(Page).filter(
+            Page.id == page.id,
+            Page.status == PageStatus.QUEUED,
+            page_leases.available_filter()
+        ).update({Page.status: previous_status}, synchronize_session=False)
+        db.commit()
+        raise
+
 
 @celery_app.task(
     bind=True,
     base=DBTask,
-    name='app.tasks.translation.process_batch_task',
-    time_limit=21600,  # 6 hours for batch processing
-    soft_time_limit=21000  # 5 hours 50 minutes soft limit
+    name='app.tasks.translation.process_batch_task'
 )
 def process_batch_task(self, project_id: int, page_ids: list):
     """
-    Process multiple pages in sequence.
+    Submit multiple pages to the fair-share scheduler backlog.
+
+    Pages then run as individual tasks on the batch queue, in parallel
+    across workers and admitted round-robin with other projects' pages
+    within the owner's quota (see app.services.scheduler).
     
     Args:
         project_id: Database ID of the project
         page_ids: List of page IDs to process
     """
-    db = self.db
-    results = []
-    
-    logger.info(f"Starting batch processing for {len(page_ids)} pages in project {project_id}")
-    
-    for i, page_id in enumerate(page_ids, 1):
-        try:
-            logger.info(f"Processing page {i}/{len(page_ids)}: {page_id}")
-            
-            # Update progress
-            self.update_state(
-                state='PROGRESS',
-                meta={
-                    'current': i,
-                    'total': len(page_ids),
-                    'page_id': page_id,
-                    'status': 'processing'
-                }
-            )
-            
-            # Process the page
-            # Execute synchronously using apply() to ensure proper context
-            task_result = process_page_task.apply(args=[page_id, project_id])
-            
-            if task_result.failed():
-                raise task_result.result
-                
-            result = task_result.result
-            results.append(result)
-            
-        except Exception as e:
-            logger.error(f"Failed to process page {page_id}: {e}")
-            results.append({
-                'status': 'failed',
-                'page_id': page_id,
-                'error': str(e)
-            })
-    
-    # Calculate statistics
-    completed = sum(1 for r in results if r['status'] == 'completed')
-    failed = len(results) - completed
-    
-    logger.info(f"Batch processing complete: {completed} succeeded, {failed} failed")
-    
+    from app.tasks.scheduler import submit_pages
+
+    added = submit_pages(self.db, project_id, page_ids)
+    logger.info(f"Submitted {added} pages of project {project_id} to the scheduler backlog")
+
     return {
         'total': len(page_ids),
-        'completed': completed,
-        'failed': failed,
-        'results': results
+        'queued': added,
+        'task_ids': [f"page_{page_id}" for page_id in page_ids]
     }
@@ -0,0 +1,103 @@
+"""
+Database migration to add content-addressed original images.
+Creates the content_blobs reference table and the pages.image_hash column.
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+
+def upgrade():
+    """Add content_blobs table and image_hash column to pages table."""
+    print("Starting migration: Adding content-addressed storage...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Creating content_blobs table...")
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS content_blobs (
+                    sha256 VARCHAR(64) PRIMARY KEY,
+                    blob_path VARCHAR(500) NOT NULL,
+                    size_bytes BIGINT NOT NULL,
+                    ref_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+                );
+            """))
+
+            print("  2. Adding image_hash column to pages...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                ADD COLUMN IF NOT EXISTS image_hash VARCHAR(64) NULL
+                REFERENCES content_blobs (sha256);
+            """))
+
+            print("  3. Indexing pages.image_hash...")
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_pages_image_hash ON pages (image_hash);
+            """))
+
+            # Existing pages keep their per-project paths (image_hash stays NULL)
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Remove content-addressed storage (for rollback)."""
+    print("Starting rollback: Removing content-addressed storage...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Removing image_hash column and content_blobs table...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                DROP COLUMN IF EXISTS image_hash;
+            """))
+            connection.execute(text("""
+                DROP TABLE IF EXISTS content_blobs;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for content-addressed storage")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (remove table and column)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
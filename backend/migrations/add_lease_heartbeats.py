@@ -0,0 +1,92 @@
+"""
+Database migration for heartbeat-renewed page leases.
+Adds the attempts counter to pages and indexes lease expiry for the recovery sweep.
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+
+def upgrade():
+    """Add attempts column and lease expiry index to pages table."""
+    print("Starting migration: Adding lease heartbeats...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Adding attempts to pages...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+            """))
+
+            print("  2. Indexing pages.lease_expires_at...")
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_pages_lease_expires_at ON pages (lease_expires_at);
+            """))
+
+            # Leases taken before this migration are an hour long; they expire
+            # normally and are then picked up by the recovery sweep
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Remove lease heartbeat fields (for rollback)."""
+    print("Starting rollback: Removing lease heartbeats...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Dropping lease expiry index...")
+            connection.execute(text("""
+                DROP INDEX IF EXISTS ix_pages_lease_expires_at;
+            """))
+
+            print("  2. Dropping attempts from pages...")
+            connection.execute(text("""
+                ALTER TABLE pages DROP COLUMN IF EXISTS attempts;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for lease heartbeats")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (remove column and index)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,133 @@
+"""
+Database migration to move large page text out of the pages table.
+Creates page_contents, copies ocr_text, translated_text, quality_issues and
+quality_recommendations into it and drops those columns from pages.
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+CONTENT_COLUMNS = ("ocr_text", "translated_text", "quality_issues", "quality_recommendations")
+
+
+def upgrade():
+    """Move page text columns to the page_contents table."""
+    print("Starting migration: Moving page text to page_contents...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Creating page_contents table...")
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS page_contents (
+                    page_id INTEGER PRIMARY KEY REFERENCES pages (id) ON DELETE CASCADE,
+                    ocr_text TEXT NULL,
+                    translated_text TEXT NULL,
+                    quality_issues TEXT NULL,
+                    quality_recommendations TEXT NULL
+                );
+            """))
+
+            remaining = {
+                row[0] for row in connection.execute(text("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_name = 'pages' AND column_name IN
+                        ('ocr_text', 'translated_text', 'quality_issues', 'quality_recommendations');
+                """))
+            }
+            if remaining != set(CONTENT_COLUMNS):
+                print("     pages text columns already moved, skipping copy")
+            else:
+                print("  2. Copying page text...")
+                copied = connection.execute(text("""
+                    INSERT INTO page_contents (page_id, ocr_text, translated_text, quality_issues, quality_recommendations)
+                    SELECT id, ocr_text, translated_text, quality_issues, quality_recommendations
+                    FROM pages
+                    WHERE ocr_text IS NOT NULL OR translated_text IS NOT NULL
+                       OR quality_issues IS NOT NULL OR quality_recommendations IS NOT NULL
+                    ON CONFLICT (page_id) DO NOTHING;
+                """)).rowcount
+                print(f"     copied text of {copied} pages")
+
+                print("  3. Dropping text columns from pages...")
+                connection.execute(text("""
+                    ALTER TABLE pages
+                    DROP COLUMN ocr_text,
+                    DROP COLUMN translated_text,
+                    DROP COLUMN quality_issues,
+                    DROP COLUMN quality_recommendations;
+                """))
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+            print("   Run VACUUM FULL pages (during a quiet period) to reclaim the space of the dropped columns.")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Move page text back into the pages table (for rollback)."""
+    print("Starting rollback: Moving page text back to pages...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Adding text columns to pages...")
+            for column in CONTENT_COLUMNS:
+                connection.execute(text(f"ALTER TABLE pages ADD COLUMN IF NOT EXISTS {column} TEXT NULL;"))
+
+            print("  2. Copying page text back...")
+            connection.execute(text("""
+                UPDATE pages AS p SET
+                    ocr_text = c.ocr_text,
+                    translated_text = c.translated_text,
+                    quality_issues = c.quality_issues,
+                    quality_recommendations = c.quality_recommendations
+                FROM page_contents AS c
+                WHERE c.page_id = p.id;
+            """))
+
+            print("  3. Dropping page_contents table...")
+            connection.execute(text("""
+                DROP TABLE IF EXISTS page_contents;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for the page_contents table")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (move text back to pages)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,114 @@
+"""
+Database migration to add incremental project page counters.
+Creates the project_page_counts table and the triggers on pages that keep it
+(and projects.total_pages / completed_pages) current, then backfills the counts.
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+from app.models.db_models import PAGE_COUNT_TRIGGERS
+
+
+def upgrade():
+    """Add project_page_counts table and page counting triggers."""
+    print("Starting migration: Adding project page counters...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Creating project_page_counts table...")
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS project_page_counts (
+                    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+                    status pagestatus NOT NULL,
+                    pages INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (project_id, status)
+                );
+            """))
+
+            # Block page writes until the triggers exist and the backfill is done
+            connection.execute(text("""
+                LOCK TABLE pages IN SHARE ROW EXCLUSIVE MODE;
+            """))
+
+            print("  2. Creating page counting triggers...")
+            connection.exec_driver_sql(PAGE_COUNT_TRIGGERS)
+
+            print("  3. Backfilling counters from pages...")
+            connection.execute(text("""
+                INSERT INTO project_page_counts (project_id, status, pages)
+                SELECT project_id, status, count(*) FROM pages GROUP BY project_id, status
+                ON CONFLICT (project_id, status) DO UPDATE SET pages = EXCLUDED.pages;
+            """))
+            connection.execute(text("""
+                UPDATE projects AS p SET
+                    total_pages = (SELECT count(*) FROM pages WHERE project_id = p.id),
+                    completed_pages = (
+                        SELECT count(*) FROM pages WHERE project_id = p.id AND status = 'COMPLETED'
+                    );
+            """))
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Remove project page counters (for rollback)."""
+    print("Starting rollback: Removing project page counters...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Dropping page counting triggers...")
+            for trigger in ("pages_count_insert", "pages_count_update", "pages_count_delete"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON pages;"))
+            connection.execute(text("""
+                DROP FUNCTION IF EXISTS count_project_pages();
+            """))
+
+            print("  2. Dropping project_page_counts table...")
+            connection.execute(text("""
+                DROP TABLE IF EXISTS project_page_counts;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for project page counters")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (remove triggers and table)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
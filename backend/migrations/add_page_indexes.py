@@ -0,0 +1,121 @@
+"""
+Database migration to add composite indexes on pages.
+Adds a unique constraint on (project_id, page_number) and indexes for
+status-filtered listings and the stuck-page sweeps.
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+
+def upgrade():
+    """Add composite indexes to pages table."""
+    print("Starting migration: Adding page indexes...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Checking for duplicate page numbers...")
+            duplicates = connection.execute(text("""
+                SELECT project_id, page_number, count(*) AS copies
+                FROM pages
+                GROUP BY project_id, page_number
+                HAVING count(*) > 1
+                ORDER BY project_id, page_number;
+            """)).fetchall()
+            if duplicates:
+                for project_id, page_number, copies in duplicates[:20]:
+                    print(f"     project {project_id}, page {page_number}: {copies} rows")
+                raise RuntimeError(
+                    f"{len(duplicates)} duplicate page numbers; renumber or delete them before migrating"
+                )
+
+            print("  2. Adding unique constraint on (project_id, page_number)...")
+            connection.execute(text("""
+                DO $$ BEGIN
+                    ALTER TABLE pages
+                    ADD CONSTRAINT uq_pages_project_id_page_number UNIQUE (project_id, page_number);
+                EXCEPTION
+                    WHEN duplicate_table OR duplicate_object THEN null;
+                END $$;
+            """))
+
+            print("  3. Indexing pages by (project_id, status, page_number)...")
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_pages_project_id_status_page_number
+                ON pages (project_id, status, page_number);
+            """))
+
+            print("  4. Indexing pages by (status, updated_at)...")
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_pages_status_updated_at ON pages (status, updated_at);
+            """))
+
+            print("  5. Refreshing planner statistics...")
+            connection.execute(text("""
+                ANALYZE pages;
+            """))
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Remove composite page indexes (for rollback)."""
+    print("Starting rollback: Removing page indexes...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Dropping indexes and unique constraint...")
+            connection.execute(text("""
+                DROP INDEX IF EXISTS ix_pages_status_updated_at;
+            """))
+            connection.execute(text("""
+                DROP INDEX IF EXISTS ix_pages_project_id_status_page_number;
+            """))
+            connection.execute(text("""
+                ALTER TABLE pages DROP CONSTRAINT IF EXISTS uq_pages_project_id_page_number;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for composite page indexes")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (remove indexes and constraint)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
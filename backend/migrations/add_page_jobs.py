@@ -0,0 +1,112 @@
+"""
+Database migration to add the fair-share scheduler backlog.
+Creates the page_jobs table (one row per bulk page waiting for or holding a slot).
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+
+def upgrade():
+    """Add page_jobs table."""
+    print("Starting migration: Adding scheduler backlog...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Creating pagejobstatus enum type...")
+            connection.execute(text("""
+                DO $$ BEGIN
+                    CREATE TYPE pagejobstatus AS ENUM ('PENDING', 'DISPATCHED');
+                EXCEPTION
+                    WHEN duplicate_object THEN null;
+                END $$;
+            """))
+
+            print("  2. Creating page_jobs table...")
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS page_jobs (
+                    id SERIAL PRIMARY KEY,
+                    page_id INTEGER NOT NULL UNIQUE REFERENCES pages (id) ON DELETE CASCADE,
+                    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+                    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+                    status pagejobstatus NOT NULL DEFAULT 'PENDING',
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+                    dispatched_at TIMESTAMP WITH TIME ZONE NULL
+                );
+            """))
+
+            print("  3. Indexing page_jobs...")
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_page_jobs_id ON page_jobs (id);
+            """))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_page_jobs_project_id ON page_jobs (project_id);
+            """))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_page_jobs_user_id ON page_jobs (user_id);
+            """))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_page_jobs_status ON page_jobs (status);
+            """))
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Remove the scheduler backlog (for rollback)."""
+    print("Starting rollback: Removing scheduler backlog...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Dropping page_jobs table and pagejobstatus type...")
+            connection.execute(text("""
+                DROP TABLE IF EXISTS page_jobs;
+            """))
+            connection.execute(text("""
+                DROP TYPE IF EXISTS pagejobstatus;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for the scheduler backlog")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (remove table)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,96 @@
+"""
+Database migration to add idempotent page processing fields.
+Adds the processing lease and result fingerprint columns to pages.
+Run this script to update existing database schema.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+
+def upgrade():
+    """Add lease and fingerprint columns to pages table."""
+    print("Starting migration: Adding page leases...")
+
+    with engine.connect() as connection:
+        # Start transaction
+        trans = connection.begin()
+
+        try:
+            print("  1. Adding lease_owner to pages...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(64) NULL;
+            """))
+
+            print("  2. Adding lease_expires_at to pages...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE NULL;
+            """))
+
+            print("  3. Adding result_fingerprint to pages...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                ADD COLUMN IF NOT EXISTS result_fingerprint VARCHAR(64) NULL;
+            """))
+
+            # Existing results have no fingerprint and are reprocessed when requested
+
+            # Commit transaction
+            trans.commit()
+            print("✅ Migration completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+
+def downgrade():
+    """Remove page lease fields (for rollback)."""
+    print("Starting rollback: Removing page leases...")
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+
+        try:
+            print("  1. Removing lease and fingerprint columns from pages...")
+            connection.execute(text("""
+                ALTER TABLE pages
+                DROP COLUMN IF EXISTS lease_owner,
+                DROP COLUMN IF EXISTS lease_expires_at,
+                DROP COLUMN IF EXISTS result_fingerprint;
+            """))
+
+            trans.commit()
+            print("✅ Rollback completed successfully!")
+
+        except Exception as e:
+            trans.rollback()
+            print(f"❌ Rollback failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for page leases")
+    parser.add_argument(
+        "--downgrade",
+        action="store_true",
+        help="Rollback the migration (remove columns)"
+    )
+
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+    else:
+        upgrade()
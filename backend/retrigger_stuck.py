@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent / "backend"))
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.models.db_models import Page, PageStatus, Project
-from app.tasks.translation import process_page_task
+from app.tasks.translation import enqueue_page
 import os
 
 # Database connection
@@ -46,10 +46,7 @@ def main():
                     continue
 
                 # Queue the page task
-                task = process_page_task.apply_async(
-                    args=[page.id, page.project_id],
-                    queue='celery'
-                )
+                task = enqueue_page(page.id, page.project_id, interactive=False, position=queued_count)
 
                 queued_count += 1
                 print(f"  ✅ Page {page.id} (page #{page.page_number}) queued - Task ID: {task.id}")
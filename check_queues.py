@@ -8,7 +8,7 @@ def check_queues():
         keys = r.keys('*')
         print(f"All keys: {keys}")
         
-        for queue in ['celery', 'translation']:
+        for queue in ['interactive', 'batch', 'exports', 'maintenance']:
             length = r.llen(queue)
             print(f"Queue '{queue}' length: {length}")
             if length > 0:
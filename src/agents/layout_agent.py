@@ -6,8 +6,8 @@ import os
 import json
 import base64
 from typing import Dict, List, Any, Optional
-from google import genai
 from PIL import Image
+from clients import gemini_api_key, get_genai_client
 
 class LayoutAgent:
     """
@@ -15,13 +15,15 @@ class LayoutAgent:
     Identifies regions: Diagrams, Text Blocks, Tables, Headers/Footers.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
+    def __init__(self, api_key: Optional[str] = None, client=None):
+        self.api_key = api_key or gemini_api_key(prefer_google=True)
+        if client is not None:
+            self.client = client
+        elif not self.api_key:
             print("Warning: GOOGLE_API_KEY/GEMINI_API_KEY not found. LayoutAgent will fail if called.")
             self.client = None
         else:
-            self.client = genai.Client(api_key=self.api_key)
+            self.client = get_genai_client(self.api_key)
 
         # Use 2.5 Flash (newest, excellent vision capabilities, fast)
         # Set LAYOUT_MODEL env var to override
@@ -6,17 +6,19 @@ import os
 import base64
 import json
 import concurrent.futures
-from google import genai
 from PIL import Image
 
 from artifacts.schemas import BBox, TableArtifact, TableCell
+from clients import gemini_api_key, get_genai_client
 
 
 class TableAgent:
-    def __init__(self) -> None:
-        self.api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        if self.api_key:
-            self.client = genai.Client(api_key=self.api_key)
+    def __init__(self, client=None) -> None:
+        self.api_key = gemini_api_key(prefer_google=True)
+        if client is not None:
+            self.client = client
+        elif self.api_key:
+            self.client = get_genai_client(self.api_key)
         else:
             self.client = None
         # Use 2.5 Flash (newest, reliable JSON output, good for complex tables)
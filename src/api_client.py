@@ -1,5 +1,6 @@
 """Client for communicating with the FastAPI backend."""
 import requests
+from datetime import datetime
 from typing import Optional, Dict, Any, BinaryIO
 import streamlit as st
 
@@ -125,7 +126,55 @@ class APIClient:
         )
         response.raise_for_status()
         return response.content
-    
+
+    def start_book_export(self, project_id: int, include_artifacts: bool = False) -> Dict[str, Any]:
+        """Start a background export of the complete book."""
+        response = requests.post(
+            f"{self.base_url}/projects/{project_id}/exports",
+            headers=self._headers(),
+            params={"include_artifacts": include_artifacts}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_book_export(self, project_id: int, task_id: str) -> Dict[str, Any]:
+        """Get export progress (and download URLs once completed)."""
+        response = requests.get(
+            f"{self.base_url}/projects/{project_id}/exports/{task_id}",
+            headers=self._headers()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def export_book(self, project_id: int, poll_interval: float = 2.0, timeout: float = 1800) -> bytes:
+        """
+        Export the complete book in the background and download it.
+
+        Returns:
+            Merged PDF bytes
+        """
+        import time
+        from urllib.parse import unquote, urlparse
+
+        export = self.start_book_export(project_id)
+        deadline = time.time() + timeout
+        while export["status"] != "completed":
+            if export["status"] == "failed":
+                raise RuntimeError(f"Book export failed: {export.get('error')}")
+            if time.time() > deadline:
+                raise TimeoutError("Book export did not finish in time")
+            time.sleep(poll_interval)
+            export = self.get_book_export(project_id, export["task_id"])
+
+        book_url = export["book_url"]
+        if book_url.startswith("file://"):
+            # Local storage mode returns file paths instead of signed URLs
+            with open(unquote(urlparse(book_url).path), "rb") as f:
+                return f.read()
+        response = requests.get(book_url)
+        response.raise_for_status()
+        return response.content
+
     # Pages
     def upload_page(self, project_id: int, page_number: int, file: BinaryIO, filename: str) -> Dict[str, Any]:
         """Upload page image."""
@@ -145,8 +194,153 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
+    def upload_pages_bulk(self, project_id: int, files: list,
+                          page_numbers: list = None) -> Dict[str, Any]:
+        """
+        Upload many page images in a single request.
+
+        Args:
+            project_id: Project ID
+            files: List of (filename, file) tuples, in page order
+            page_numbers: Optional page number per file (default: after the last page)
+
+        Returns:
+            Dictionary with created 'pages' list and 'total' count
+        """
+        multipart = [("files", (filename, file, "image/jpeg")) for filename, file in files]
+        data = {"page_numbers": page_numbers} if page_numbers else None
+        
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        
+        response = requests.post(
+            f"{self.base_url}/projects/{project_id}/pages/bulk",
+            headers=headers,
+            files=multipart,
+            data=data
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def upload_pages_direct(self, project_id: int, files: list, page_numbers: list = None,
+                            auto_process: bool = False, chunk_size: int = 8 * 1024 * 1024) -> Dict[str, Any]:
+        """
+        Upload page images straight to storage, then create the pages.
+
+        Each file goes to its own resumable upload session (GCS, or the
+        backend's local stand-in) in chunks, resuming after interruptions.
+
+        Args:
+            project_id: Project ID
+            files: List of (filename, file) tuples, in page order
+            page_numbers: Optional page number per file (default: after the last page)
+            auto_process: Queue the pages for translation once stored
+            chunk_size: Bytes per request (a multiple of 256 KiB)
+
+        Returns:
+            Dictionary with created 'pages' list and 'total' count
+        """
+        import mimetypes
+
+        infos = []
+        for index, (filename, file) in enumerate(files):
+            file.seek(0, 2)
+            info = {
+                "filename": filename,
+                "size": file.tell(),
+                "content_type": mimetypes.guess_type(filename)[0] or "image/jpeg"
+            }
+            if page_numbers:
+                info["page_number"] = page_numbers[index]
+            infos.append(info)
+
+        response = requests.post(
+            f"{self.base_url}/projects/{project_id}/pages/uploads",
+            headers=self._headers(),
+            json={"files": infos}
+        )
+        response.raise_for_status()
+        sessions = response.json()["uploads"]
+
+        for (filename, file), info, session in zip(files, infos, sessions):
+            self._resumable_upload(session["upload_url"], file, info["size"], info["content_type"], chunk_size)
+
+        response = requests.post(
+            f"{self.base_url}/projects/{project_id}/pages/uploads/finalize",
+            headers=self._headers(),
+            json={"upload_ids": [session["upload_id"] for session in sessions], "auto_process": auto_process}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _resumable_upload(upload_url: str, file: BinaryIO, size: int, content_type: str,
+                          chunk_size: int, max_retries: int = 5):
+        """PUT a file to a resumable upload session in Content-Range chunks."""
+        offset = 0
+        retries = 0
+        while True:
+            file.seek(offset)
+            chunk = file.read(chunk_size) if offset < size else b""
+            if chunk:
+                content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+            else:
+                content_range = f"bytes */{size}"  # Status query / empty file
+            try:
+                response = requests.put(
+                    upload_url,
+                    data=chunk,
+                    headers={"Content-Range": content_range, "Content-Type": content_type}
+                )
+            except requests.RequestException:
+                retries += 1
+                if retries > max_retries:
+                    raise
+                # Ask the session how much arrived, then resume from there
+                offset = size
+                continue
+
+            if response.status_code in (200, 201):
+                return
+            if response.status_code == 308:
+                persisted = response.headers.get("Range")
+                offset = int(persisted.split("-")[1]) + 1 if persisted else 0
+                continue
+            response.raise_for_status()
+    
+    def ingest_document(self, project_id: int, file: BinaryIO, filename: str,
+                        start_page: int = None, dpi: int = None) -> Dict[str, Any]:
+        """
+        Upload a multi-page PDF/TIFF; the backend splits it into pages.
+
+        Returns:
+            Dictionary with the ingest 'task_id' and the assigned 'start_page'
+        """
+        content_type = "application/pdf" if filename.lower().endswith(".pdf") else "image/tiff"
+        files = {"file": (filename, file, content_type)}
+        data = {}
+        if start_page is not None:
+            data["start_page"] = start_page
+        if dpi is not None:
+            data["dpi"] = dpi
+        
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        
+        response = requests.post(
+            f"{self.base_url}/projects/{project_id}/pages/ingest",
+            headers=headers,
+            files=files,
+            data=data
+        )
+        response.raise_for_status()
+        return response.json()
+    
     def list_pages(self, project_id: int, skip: int = 0, limit: int = 20,
-                   status_filter: str = None) -> Dict[str, Any]:
+                   status_filter: str = None, after_page_number: int = None,
+                   include_total: bool = True, fields: str = "full") -> Dict[str, Any]:
         """
         Get project pages with pagination and optional filtering.
 
@@ -155,13 +349,18 @@ class APIClient:
             skip: Number of pages to skip (for pagination)
             limit: Maximum pages to return (default 20, max 500)
             status_filter: Optional comma-separated status filter (e.g., "COMPLETED,NEEDS_REVIEW")
+            after_page_number: Continue after this page number ('next_cursor' of the previous call); skip is ignored
+            include_total: Whether to return the number of matching pages
+            fields: "full", or "summary" to leave out the OCR/translation text
 
         Returns:
-            Dictionary with 'pages' list and 'total' count
+            Dictionary with 'pages' list, 'total' count and 'next_cursor'
         """
-        params = {"skip": skip, "limit": limit}
+        params = {"skip": skip, "limit": limit, "include_total": include_total, "fields": fields}
         if status_filter:
             params["status_filter"] = status_filter
+        if after_page_number is not None:
+            params["after_page_number"] = after_page_number
 
         response = requests.get(
             f"{self.base_url}/projects/{project_id}/pages",
@@ -169,7 +368,7 @@ class APIClient:
             params=params
         )
         response.raise_for_status()
-        return response.json()  # Returns {'pages': [...], 'total': N}
+        return response.json()  # Returns {'pages': [...], 'total': N, 'next_cursor': M}
     
     def get_page(self, project_id: int, page_id: int) -> Dict[str, Any]:
         """Get page details."""
@@ -190,6 +389,34 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
+    def get_download_urls(self, project_id: int, file_type: str = "original", page_ids: list = None,
+                          skip: int = 0, limit: int = 100, status_filter: str = None) -> Dict[str, Any]:
+        """
+        Get signed URLs for many pages in one request.
+
+        Returns:
+            Dict with 'urls' (page ID -> signed URL; pages without the file are
+            omitted) and 'expires_at' (UTC datetime the first URL expires, or
+            None if they never do)
+        """
+        params = {"file_type": file_type, "skip": skip, "limit": limit}
+        if page_ids:
+            params["page_ids"] = page_ids
+        if status_filter:
+            params["status_filter"] = status_filter
+        response = requests.get(
+            f"{self.base_url}/projects/{project_id}/pages/download-urls",
+            params=params,
+            headers=self._headers()
+        )
+        response.raise_for_status()
+        result = response.json()
+        expires_at = result.get("expires_at")
+        return {
+            "urls": {int(page_id): url for page_id, url in result["urls"].items()},
+            "expires_at": datetime.fromisoformat(expires_at.replace("Z", "+00:00")) if expires_at else None
+        }
+    
     def update_page(self, project_id: int, page_id: int, status: str = None,
                    ocr_text: str = None, translated_text: str = None,
                    output_pdf_path: str = None) -> Dict[str, Any]:
@@ -132,3 +132,25 @@ class ChartArtifact(ArtifactBase):
 
 def artifacts_to_dict(artifacts: List[ArtifactBase]) -> List[Dict[str, Any]]:
     return [a.to_dict() for a in artifacts]
+
+
+def artifacts_from_dict(items: List[Dict[str, Any]]) -> List[ArtifactBase]:
+    """Rebuild artifacts from artifacts_to_dict output."""
+    artifacts: List[ArtifactBase] = []
+    for d in items:
+        common = {"id": d["id"], "bbox": BBox(**d["bbox"]), "meta": d.get("meta", {})}
+        kind = d.get("type")
+        if kind == TableArtifact.type:
+            artifacts.append(TableArtifact(
+                **common, rows=d.get("rows", 0), cols=d.get("cols", 0),
+                cells=[TableCell(**c) for c in d.get("cells", [])],
+            ))
+        elif kind == DiagramArtifact.type:
+            artifacts.append(DiagramArtifact(
+                **common, annotations=[DiagramAnnotation(**a) for a in d.get("annotations", [])],
+            ))
+        elif kind == ChartArtifact.type:
+            artifacts.append(ChartArtifact(**common, spec=d.get("spec", {})))
+        else:
+            artifacts.append(ArtifactBase(**common))
+    return artifacts
@@ -18,8 +18,8 @@ class ChartTranslator:
     - Uses enhanced cleaning for grid lines.
     """
     
-    def __init__(self, processing_mode="enhanced"):
-        self.ocr = GoogleOCR()
+    def __init__(self, processing_mode="enhanced", ocr=None):
+        self.ocr = ocr or GoogleOCR()
         self.processing_mode = processing_mode
         
         try:
@@ -164,9 +164,10 @@ class ChartTranslator:
         finally:
             if os.path.exists(temp_path): os.remove(temp_path)
 
-    def process_charts(self, image_path, chart_regions, translator, output_dir, book_context=None):
+    def process_charts(self, image_path, chart_regions, translator, output_dir, book_context=None,
+                       base_name=None):
         os.makedirs(output_dir, exist_ok=True)
-        base_name = os.path.splitext(os.path.basename(image_path))[0]
+        base_name = base_name or os.path.splitext(os.path.basename(image_path))[0]
         results = []
         
         for i, region in enumerate(chart_regions):
@@ -0,0 +1,68 @@
+"""
+Pipeline Checkpoints
+Persist the output of each completed page stage so an interrupted run can
+resume from the last finished stage instead of repeating OCR and model calls.
+
+A checkpoint stores JSON documents (stage results) and files (rendered
+diagram/chart images) per stage name. BookTranslator only uses the four
+methods below, so any object providing them can be passed in (the backend
+stores them in the outputs bucket).
+"""
+
+import json
+import os
+import shutil
+from typing import Optional
+
+
+class PipelineCheckpoint:
+    """No-op checkpoint: nothing is saved and every stage runs"""
+
+    def load(self, stage: str) -> Optional[dict]:
+        """Saved result of `stage`, or None if the stage has not completed"""
+        return None
+
+    def save(self, stage: str, data: dict):
+        """Record the JSON-serializable result of a completed stage"""
+
+    def save_file(self, stage: str, name: str, local_path: str):
+        """Keep a file produced by `stage` under `name`"""
+
+    def load_file(self, stage: str, name: str, local_path: str) -> bool:
+        """Restore a saved file to `local_path`; False if it is missing"""
+        return False
+
+
+class DirectoryCheckpoint(PipelineCheckpoint):
+    """Checkpoint kept in a local directory: {directory}/{stage}.json and {directory}/{stage}/{name}"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, stage: str) -> Optional[dict]:
+        path = os.path.join(self.directory, f"{stage}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, stage: str, data: dict):
+        path = os.path.join(self.directory, f"{stage}.json")
+        # Write then rename so a crash never leaves a truncated stage behind
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def save_file(self, stage: str, name: str, local_path: str):
+        stage_dir = os.path.join(self.directory, stage)
+        os.makedirs(stage_dir, exist_ok=True)
+        shutil.copy2(local_path, os.path.join(stage_dir, name))
+
+    def load_file(self, stage: str, name: str, local_path: str) -> bool:
+        path = os.path.join(self.directory, stage, name)
+        if not os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+        shutil.copy2(path, local_path)
+        return True
@@ -0,0 +1,111 @@
+"""
+Per-process registry of Google API clients
+
+Building a client sets up credentials, TLS and (for Vision) a gRPC channel,
+so every component shares one long-lived client per process instead of
+creating its own for each page. The Gemini client keeps its HTTP connection
+pool warm between calls; the Vision client keeps its channel open.
+
+Clients are keyed by process id: a forked worker child never reuses the
+parent's sockets or gRPC channel, it builds its own on first use.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+_clients: Dict[Tuple, object] = {}
+_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_environment():
+    """Load .env once and make a relative credentials path absolute"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    project_root = Path(__file__).parent.parent.resolve()
+    load_dotenv(project_root / '.env')
+    creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    if creds_path and not os.path.isabs(creds_path):
+        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(project_root / creds_path)
+    _env_loaded = True
+
+
+def _get_or_create(kind: str, key, factory):
+    registry_key = (os.getpid(), kind, key)
+    client = _clients.get(registry_key)
+    if client is None:
+        with _lock:
+            client = _clients.get(registry_key)
+            if client is None:
+                _load_environment()
+                client = factory()
+                _clients[registry_key] = client
+    return client
+
+
+def gemini_api_key(prefer_google: bool = False) -> Optional[str]:
+    """
+    Gemini API key from GEMINI_API_KEY or GOOGLE_API_KEY
+
+    Args:
+        prefer_google: Check GOOGLE_API_KEY first (the layout and table
+            agents always have, so a deployment setting both keeps using
+            the same key for them)
+    """
+    _load_environment()
+    if prefer_google:
+        return os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY')
+    return os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+
+
+def get_genai_client(api_key: str = None):
+    """
+    Shared google-genai client
+
+    Args:
+        api_key: API key (default: GEMINI_API_KEY or GOOGLE_API_KEY)
+
+    Raises:
+        ValueError: If no API key is configured
+    """
+    api_key = api_key or gemini_api_key()
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY not found in environment")
+
+    def create():
+        from google import genai
+        return genai.Client(api_key=api_key)
+
+    return _get_or_create('genai', api_key, create)
+
+
+def get_vision_client():
+    """Shared Cloud Vision ImageAnnotatorClient"""
+    def create():
+        from google.cloud import vision
+        return vision.ImageAnnotatorClient()
+
+    return _get_or_create('vision', None, create)
+
+
+def get_translate_client():
+    """Shared Cloud Translate (v2) client"""
+    def create():
+        from google.cloud import translate_v2 as translate
+        return translate.Client()
+
+    return _get_or_create('translate', None, create)
+
+
+def warm_up_clients():
+    """Build the Gemini and Vision clients now (e.g. when a worker process starts)"""
+    for factory in (get_genai_client, get_vision_client):
+        try:
+            factory()
+        except Exception as e:
+            print(f"Warning: could not pre-build {factory.__name__[4:]}: {e}")
@@ -20,7 +20,7 @@ class DiagramTranslator:
     - Creates clean diagram images with translated labels
     """
     
-    def __init__(self, google_credentials_path=None, processing_mode="enhanced"):
+    def __init__(self, google_credentials_path=None, processing_mode="enhanced", ocr=None):
         """Initialize with Google OCR for diagram text extraction
         
         Args:
@@ -28,9 +28,10 @@ class DiagramTranslator:
             processing_mode: "enhanced" | "light" | "raw". Controls how aggressively
                 the background is processed. Default is "enhanced" for highest
                 contrast and clean white background.
+            ocr: GoogleOCR to use (default: one on the shared Vision client)
         """
         # GoogleOCR handles credentials internally via env vars, so we don't pass path
-        self.ocr = GoogleOCR()
+        self.ocr = ocr or GoogleOCR()
 
         # How diagrams are processed visually
         self.processing_mode = processing_mode
@@ -388,7 +389,8 @@ class DiagramTranslator:
                 except:
                     pass
     
-    def process_diagrams(self, image_path, diagram_regions, translator, output_dir, book_context=None):
+    def process_diagrams(self, image_path, diagram_regions, translator, output_dir, book_context=None,
+                         base_name=None):
         """
         Process multiple diagram regions and save translated versions
         
@@ -398,13 +400,14 @@ class DiagramTranslator:
             translator: Translator instance
             output_dir: Directory to save translated diagrams
             book_context: Optional global context about the book
+            base_name: Prefix of the saved images (default: the image file name)
         
         Returns:
             List of paths to translated diagram images
         """
         os.makedirs(output_dir, exist_ok=True)
         
-        base_name = os.path.splitext(os.path.basename(image_path))[0]
+        base_name = base_name or os.path.splitext(os.path.basename(image_path))[0]
         translated_diagrams = []
         
         for i, region in enumerate(diagram_regions):
@@ -4,9 +4,9 @@ Uses Google Gemini 2.5 Flash for intelligent, context-aware translation
 """
 
 import os
-from pathlib import Path
-from dotenv import load_dotenv
-from google import genai
+import queue
+import threading
+from clients import gemini_api_key, get_genai_client
 
 
 class GeminiTranslator:
@@ -15,16 +15,17 @@ class GeminiTranslator:
     Provides context-aware translation with proper formatting
     """
     
-    def __init__(self, model_name=None):
-        """Initialize Gemini translator"""
-        # Load environment variables
-        project_root = Path(__file__).parent.parent.resolve()
-        load_dotenv(project_root / '.env')
+    def __init__(self, model_name=None, client=None):
+        """
+        Initialize Gemini translator
 
-        # Get API key
-        api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+        Args:
+            model_name: Gemini model (default: TRANSLATION_MODEL env var)
+            client: genai.Client to use (default: the shared per-process client)
+        """
+        api_key = gemini_api_key()
 
-        if not api_key:
+        if client is None and not api_key:
             raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY not found in environment")
 
         # Use 2.5 Flash for FAST translations with good quality
@@ -35,7 +36,7 @@ class GeminiTranslator:
 
         # Initialize client
         try:
-            self.client = genai.Client(api_key=api_key)
+            self.client = client or get_genai_client(api_key)
             self.model_name = model_name
             self.available = True
             print(f"[OK] Gemini {model_name} initialized for translation")
@@ -75,6 +76,45 @@ class GeminiTranslator:
         except Exception as e:
             raise Exception(f"Gemini translation failed: {str(e)}")
     
+    def translate_text_stream(self, text: str, context: str = None, source_lang: str = 'ja', target_lang: str = 'en'):
+        """
+        Translate text with Gemini streaming, yielding paragraphs as they complete
+
+        Args:
+            text: Text to translate
+            context: Additional context (e.g., "technical manual", "diagram labels")
+            source_lang: Source language (default: 'ja' for Japanese)
+            target_lang: Target language (default: 'en' for English)
+
+        Yields:
+            Translated paragraphs, in order, as soon as the model closes them
+            with a blank line
+        """
+        if not self.available:
+            raise RuntimeError("Gemini translator not available")
+
+        if not text or not text.strip():
+            return
+
+        prompt = self._build_translation_prompt(text, context, source_lang, target_lang)
+
+        try:
+            buffer = ""
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt
+            ):
+                buffer += chunk.text or ""
+                # A blank line closes a paragraph; everything before it is final
+                while '\n\n' in buffer:
+                    paragraph, buffer = buffer.split('\n\n', 1)
+                    if paragraph.strip():
+                        yield paragraph.strip()
+            if buffer.strip():
+                yield buffer.strip()
+        except Exception as e:
+            raise Exception(f"Gemini streaming translation failed: {str(e)}")
+
     def _build_translation_prompt(self, text: str, context: str, source_lang: str, target_lang: str) -> str:
         """Build optimized prompt for Gemini translation"""
         
@@ -259,6 +299,68 @@ ORGANIZED TEXT (with \\n\\n between paragraphs):"""
         print(f"Translation saved to {output_path}")
 
 
+class TranslationStream:
+    """
+    Iterable of translated paragraphs that fills up in the background
+
+    Consumes a paragraph generator (e.g. GeminiTranslator.translate_text_stream)
+    on a worker thread so the caller can run other pipeline stages meanwhile,
+    then lay out paragraphs as they arrive. Iterating blocks only until the
+    next paragraph is available. Intended for a single consumer thread.
+    """
+
+    _DONE = object()
+
+    def __init__(self, paragraphs):
+        self.paragraphs = []
+        self._queue = queue.Queue()
+        self._error = None
+        self._finished = False
+        self._thread = threading.Thread(target=self._pump, args=(paragraphs,), daemon=True)
+        self._thread.start()
+
+    def _pump(self, paragraphs):
+        try:
+            for paragraph in paragraphs:
+                self._queue.put(paragraph)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._queue.put(self._DONE)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index < len(self.paragraphs):
+                yield self.paragraphs[index]
+                index += 1
+                continue
+            if self._finished:
+                # Every later pass fails too, so a partial translation is never
+                # mistaken for a complete one
+                if self._error:
+                    raise self._error
+                break
+            item = self._queue.get()
+            if item is self._DONE:
+                self._finished = True
+                if self._error:
+                    raise self._error
+                break
+            self.paragraphs.append(item)
+
+    def wait(self) -> list:
+        """Block until generation finishes and return all paragraphs"""
+        for _ in self:
+            pass
+        return self.paragraphs
+
+    @property
+    def text(self) -> str:
+        """Full translation, paragraphs separated by blank lines"""
+        return "\n\n".join(self.wait())
+
+
 if __name__ == "__main__":
     # Test the Gemini translator
     try:
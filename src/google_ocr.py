@@ -3,30 +3,23 @@ Google Cloud Vision OCR Module
 Uses Google Cloud Vision API for superior Japanese OCR accuracy
 """
 
-import os
-from pathlib import Path
 from google.cloud import vision
-from dotenv import load_dotenv
+from clients import get_vision_client
 
 
 class GoogleOCR:
     """Extracts text from images using Google Cloud Vision API"""
     
-    def __init__(self):
-        """Initialize Google Cloud Vision client"""
-        # Load environment to get credentials path
-        load_dotenv()
-        
-        # Google Cloud Vision uses GOOGLE_APPLICATION_CREDENTIALS env var
-        creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        if creds_path and not os.path.isabs(creds_path):
-            # If relative path, make it absolute from project root
-            project_root = Path(__file__).parent.parent
-            creds_path = str(project_root / creds_path)
-            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = creds_path
-        
+    def __init__(self, client=None):
+        """
+        Initialize Google Cloud Vision client
+
+        Args:
+            client: ImageAnnotatorClient to use (default: the shared per-process client)
+        """
         try:
-            self.client = vision.ImageAnnotatorClient()
+            # One gRPC channel per process, shared by every OCR user
+            self.client = client or get_vision_client()
             self.available = True
         except Exception as e:
             print(f"Warning: Google Cloud Vision not available: {e}")
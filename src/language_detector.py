@@ -74,15 +74,14 @@ class LanguageDetector:
         self.ai_client = ai_client
 
         if not self.ai_client:
-            # Try to initialize Gemini client
+            # Use the shared per-process Gemini client
             try:
-                from google import genai
+                from clients import get_genai_client
                 import os
 
-                api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
                 # Use 2.0 Flash (fast, efficient for simple language detection)
                 model_name = os.getenv('LANGUAGE_MODEL', 'gemini-2.0-flash')
-                self.ai_client = genai.Client(api_key=api_key)
+                self.ai_client = get_genai_client()
                 self.model_name = model_name
                 logger.info(f"Initialized Gemini {model_name} for language detection")
             except Exception as e:
@@ -11,27 +11,18 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from layout_analysis import LayoutAnalyzer
-from ocr_extractor import TextExtractor
-from translator import TextTranslator
-from gemini_translator import GeminiTranslator
-from text_overlay import TextOverlay
-from pdf_reconstructor import PDFPageReconstructor
-from smart_layout_reconstructor import SmartLayoutReconstructor
-from diagram_translator import DiagramTranslator
-from chart_translator import ChartTranslator
-from agents.table_agent import TableAgent
-from agents.chart_agent import ChartAgent
-from agents.diagram_agent import DiagramAgent
-from agents.layout_agent import LayoutAgent
-from artifacts.schemas import artifacts_to_dict
+# Pipeline stages are imported where they are used: most pages never need the
+# chart/diagram translators or Tesseract, and a worker should not pay for
+# reportlab, cv2 or the Google clients before it knows what a page contains.
+from ocr_backends import get_ocr_backend
 
 
 class BookTranslator:
     """Main orchestrator for the book translation pipeline"""
 
     def __init__(self, image_path: str, output_dir: str = "output", book_context: str = None,
-                 source_language: str = "auto", target_language: str = "en"):
+                 source_language: str = "auto", target_language: str = "en",
+                 stream_translation: bool = None, checkpoint=None, page_name: str = None):
         """
         Initialize the book translator
 
@@ -41,31 +32,99 @@ class BookTranslator:
             book_context: Optional global context about the book (e.g. "4-stroke engine manual")
             source_language: Source language code (ISO 639-1) or 'auto' for detection
             target_language: Target language code (ISO 639-1)
+            stream_translation: Stream prose translation paragraph by paragraph and lay it
+                out while the diagram/table stages run (defaults to STREAM_TRANSLATION env var)
+            checkpoint: Where completed stages are saved and resumed from
+                (see checkpoints.PipelineCheckpoint; default: no checkpointing)
+            page_name: Prefix of the output files (default: the image file name). Pass a
+                unique name when several pages can share one image file
         """
         self.image_path = image_path
         self.output_dir = output_dir
-        self.page_name = Path(image_path).stem
+        self.page_name = page_name or Path(image_path).stem
         self.book_context = book_context
         self.source_language = source_language
         self.target_language = target_language
+        if stream_translation is None:
+            stream_translation = os.getenv('STREAM_TRANSLATION', 'false').lower() in ('1', 'true', 'yes')
+        self.stream_translation = stream_translation
+        if checkpoint is None:
+            from checkpoints import PipelineCheckpoint
+            checkpoint = PipelineCheckpoint()
+        self.checkpoint = checkpoint
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Initialize components
-        self.text_extractor = TextExtractor()
+        # Initialize components (OCR engines are built when first used)
+        self.ocr_backend = get_ocr_backend()
+        self._text_extractor = None
+        self._layout_analyzer = None
+
+        from agents.layout_agent import LayoutAgent
         self.layout_agent = LayoutAgent()
         
         # Try Gemini first, fall back to Google Translate
         try:
+            from gemini_translator import GeminiTranslator
             self.translator = GeminiTranslator()
             print("[OK] Using Gemini 3 Pro Preview for intelligent translation")
         except Exception as e:
             print(f"[INFO] Gemini not available ({e}), using Google Translate")
+            from translator import TextTranslator
             self.translator = TextTranslator()
-        
-        self.layout_analyzer = LayoutAnalyzer(image_path)
+
+    @property
+    def text_extractor(self):
+        """Legacy Tesseract/Vision extractor, built on first access"""
+        if self._text_extractor is None:
+            from ocr_extractor import TextExtractor
+            self._text_extractor = TextExtractor()
+        return self._text_extractor
+
+    @property
+    def layout_analyzer(self):
+        """Heuristic OpenCV layout analyzer, built on first access"""
+        if self._layout_analyzer is None:
+            from layout_analysis import LayoutAnalyzer
+            self._layout_analyzer = LayoutAnalyzer(self.image_path)
+        return self._layout_analyzer
     
+    def _save_rendered(self, stage: str, items: list):
+        """Checkpoint translated diagrams/charts: their images as PNG files, the rest as JSON"""
+        import tempfile
+        entries = []
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                for item in items:
+                    name = f"{Path(item['path']).stem}.png"
+                    image_path = os.path.join(temp_dir, name)
+                    item['image'].save(image_path, format='PNG')
+                    self.checkpoint.save_file(stage, name, image_path)
+                    entry = {key: value for key, value in item.items() if key not in ('image', 'path')}
+                    entry['file'] = name
+                    entries.append(entry)
+        except Exception as e:
+            print(f"  ! Could not checkpoint {stage}: {e}")
+            return
+        self.checkpoint.save(stage, {'items': entries})
+
+    def _load_rendered(self, stage: str, saved: dict, output_dir: str):
+        """Translated diagrams/charts from a checkpoint, or None if any image is missing"""
+        from PIL import Image
+        os.makedirs(output_dir, exist_ok=True)
+        items = []
+        for entry in saved['items']:
+            entry = dict(entry)
+            path = os.path.join(output_dir, entry.pop('file'))
+            if not self.checkpoint.load_file(stage, os.path.basename(path), path):
+                return None
+            image = Image.open(path)
+            image.load()
+            entry.update(path=path, image=image)
+            items.append(entry)
+        return items
+
     def process_page(self, verbose: bool = True) -> dict:
         """
         Process a single page through the complete pipeline
@@ -79,27 +138,52 @@ class BookTranslator:
         results = {
             'image_path': self.image_path,
             'page_name': self.page_name,
-            'steps': {}
+            'steps': {},
+            'resumed_stages': []
         }
+
+        def resume(stage: str):
+            """Saved output of a stage finished by an earlier run, if any"""
+            data = self.checkpoint.load(stage)
+            if data is not None:
+                results['resumed_stages'].append(stage)
+                if verbose:
+                    print(f"  + Resumed '{stage}' from checkpoint")
+            return data
         
         try:
             # Step 1: Preliminary OCR and Layout Analysis
             if verbose:
                 print(f"\n[1/6] Extracting text and analyzing page layout...")
             
-            from google_ocr import GoogleOCR
-            ocr = GoogleOCR()
-            ocr_result = ocr.extract_text_with_boxes(self.image_path)
+            # Vision when reachable, tiled Tesseract otherwise (same box schema)
+            saved = resume('ocr')
+            if saved is not None:
+                ocr_result = saved['ocr_result']
+                results['ocr_backend'] = saved['backend']
+            else:
+                ocr_result = self.ocr_backend.extract_text_with_boxes(self.image_path)
+                results['ocr_backend'] = getattr(self.ocr_backend, 'last_backend', None) or self.ocr_backend.name
+                self.checkpoint.save('ocr', {'ocr_result': ocr_result, 'backend': results['ocr_backend']})
             text_boxes = ocr_result.get('text_boxes', [])
+            if verbose:
+                print(f"  + OCR backend: {results['ocr_backend']} ({len(text_boxes)} text boxes)")
             
             # Use smart reconstructor to identify diagram/table regions early
+            from smart_layout_reconstructor import SmartLayoutReconstructor
             smart_reconstructor = SmartLayoutReconstructor(self.image_path)
             
             # Phase 1: AI Layout Analysis (Gemini Vision)
             if verbose:
                 print(f"  + Running AI Layout Analysis...")
             
-            layout_result = self.layout_agent.detect_layout(self.image_path)
+            saved = resume('layout')
+            if saved is not None:
+                layout_result = saved['layout_result']
+            else:
+                layout_result = self.layout_agent.detect_layout(self.image_path)
+                if layout_result.get("success"):
+                    self.checkpoint.save('layout', {'layout_result': layout_result})
             
             if layout_result.get("success"):
                 if verbose:
@@ -149,7 +233,13 @@ class BookTranslator:
             detected_language = None
             detection_confidence = None
 
-            if self.source_language == 'auto' and japanese_text.strip():
+            auto_detect = self.source_language == 'auto' and bool(japanese_text.strip())
+            saved = resume('language') if auto_detect else None
+            if saved is not None:
+                detected_language = saved['detected_language']
+                detection_confidence = saved['detection_confidence']
+                actual_source_lang = detected_language
+            elif auto_detect:
                 if verbose:
                     print(f"\n[1.5/6] Detecting source language...")
 
@@ -166,6 +256,10 @@ class BookTranslator:
 
                     # Use detected language as source
                     actual_source_lang = detected_language
+                    self.checkpoint.save('language', {
+                        'detected_language': detected_language,
+                        'detection_confidence': detection_confidence
+                    })
                 except Exception as e:
                     if verbose:
                         print(f"  ! Language detection failed: {e}. Defaulting to 'ja'")
@@ -183,19 +277,39 @@ class BookTranslator:
             if self.book_context:
                 translation_context = f"{translation_context}. Book Context: {self.book_context}"
 
-            english_text = self.translator.translate_text(
-                japanese_text,
-                context=translation_context,
-                source_lang=actual_source_lang,
-                target_lang=self.target_language
-            )
+            # In streaming mode the translation keeps generating in the background
+            # while the artifact stages run; the reconstructor consumes it lazily
+            translation_stream = None
+            saved = resume('translation')
+            if saved is not None:
+                english_text = saved['english_text']
+            elif self.stream_translation and hasattr(self.translator, 'translate_text_stream'):
+                from gemini_translator import TranslationStream
+                translation_stream = TranslationStream(self.translator.translate_text_stream(
+                    japanese_text,
+                    context=translation_context,
+                    source_lang=actual_source_lang,
+                    target_lang=self.target_language
+                ))
+                english_text = None
+            else:
+                english_text = self.translator.translate_text(
+                    japanese_text,
+                    context=translation_context,
+                    source_lang=actual_source_lang,
+                    target_lang=self.target_language
+                )
+                self.checkpoint.save('translation', {'english_text': english_text})
 
             # Store detection results in results dict
             results['detected_language'] = detected_language
             results['detection_confidence'] = detection_confidence
             
             if verbose:
-                print(f"  + Translation complete ({len(english_text)} characters)")
+                if translation_stream is not None:
+                    print(f"  + Translation streaming in background")
+                else:
+                    print(f"  + Translation complete ({len(english_text)} characters)")
             
             # Step 4: Create Clean PDF with Smart Layout
             if verbose:
@@ -216,6 +330,13 @@ class BookTranslator:
                 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
                 
                 def run_table_detection():
+                    saved = resume('tables')
+                    if saved is not None:
+                        from artifacts.schemas import artifacts_from_dict
+                        return artifacts_from_dict(saved['tables']), artifacts_from_dict(saved['charts'])
+
+                    from agents.table_agent import TableAgent
+                    from agents.chart_agent import ChartAgent
                     table_agent = TableAgent()
                     chart_agent = ChartAgent()
                     
@@ -255,6 +376,12 @@ class BookTranslator:
                     future = executor.submit(run_table_detection)
                     try:
                         tables, charts = future.result(timeout=90)
+                        if 'tables' not in results['resumed_stages']:
+                            from artifacts.schemas import artifacts_to_dict
+                            self.checkpoint.save('tables', {
+                                'tables': artifacts_to_dict(tables),
+                                'charts': artifacts_to_dict(charts)
+                            })
                     except FutureTimeout:
                         if verbose:
                             print(f"    ! Table detection timed out (>90s), setting tables and charts to empty lists.")
@@ -276,16 +403,23 @@ class BookTranslator:
             if diagram_regions:
                 if verbose:
                     print(f"\n[4b/6] Translating diagram labels...")
-                # Use enhanced processing mode for crisp diagrams
-                diagram_translator = DiagramTranslator(processing_mode="enhanced")
                 diagram_output_dir = f"{self.output_dir}/diagrams"
-                translated_diagrams = diagram_translator.process_diagrams(
-                    self.image_path,
-                    diagram_regions,
-                    self.translator,
-                    diagram_output_dir,
-                    book_context=self.book_context
-                )
+                saved = resume('diagrams')
+                if saved is not None:
+                    translated_diagrams = self._load_rendered('diagrams', saved, diagram_output_dir)
+                if translated_diagrams is None:
+                    # Use enhanced processing mode for crisp diagrams
+                    from diagram_translator import DiagramTranslator
+                    diagram_translator = DiagramTranslator(processing_mode="enhanced")
+                    translated_diagrams = diagram_translator.process_diagrams(
+                        self.image_path,
+                        diagram_regions,
+                        self.translator,
+                        diagram_output_dir,
+                        book_context=self.book_context,
+                        base_name=self.page_name
+                    )
+                    self._save_rendered('diagrams', translated_diagrams)
                 if verbose:
                     print(f"  + Translated {len(translated_diagrams)} diagram(s)")
 
@@ -294,20 +428,28 @@ class BookTranslator:
             if chart_regions:
                 if verbose:
                     print(f"\n[4c/6] Translating chart labels...")
-                chart_translator = ChartTranslator()
                 chart_output_dir = f"{self.output_dir}/charts"
-                translated_charts = chart_translator.process_charts(
-                    self.image_path,
-                    chart_regions,
-                    self.translator,
-                    chart_output_dir,
-                    book_context=self.book_context
-                )
+                saved = resume('charts')
+                if saved is not None:
+                    translated_charts = self._load_rendered('charts', saved, chart_output_dir)
+                if translated_charts is None:
+                    from chart_translator import ChartTranslator
+                    chart_translator = ChartTranslator()
+                    translated_charts = chart_translator.process_charts(
+                        self.image_path,
+                        chart_regions,
+                        self.translator,
+                        chart_output_dir,
+                        book_context=self.book_context,
+                        base_name=self.page_name
+                    )
+                    self._save_rendered('charts', translated_charts)
                 if verbose:
                     print(f"  + Translated {len(translated_charts)} charts(s)")
             
             # Normalize diagram artifacts
             try:
+                from agents.diagram_agent import DiagramAgent
                 diagram_artifacts = DiagramAgent().from_translated_diagrams(translated_diagrams)
             except Exception as e:
                 if verbose:
@@ -315,10 +457,17 @@ class BookTranslator:
                 diagram_artifacts = []
             
             # Split previously translated prose into paragraphs
-            translated_paragraphs = english_text.split('\n\n')
+            if translation_stream is not None:
+                # Organizing needs the whole text, so streamed paragraphs are laid out as-is
+                translated_paragraphs = translation_stream
+            else:
+                translated_paragraphs = english_text.split('\n\n')
             
             # Use Gemini to organize paragraphs for better layout (if available)
-            if hasattr(self.translator, 'organize_paragraphs') and hasattr(self.translator, 'available') and self.translator.available:
+            saved = resume('paragraphs') if translation_stream is None else None
+            if saved is not None:
+                translated_paragraphs = saved['paragraphs']
+            elif translation_stream is None and hasattr(self.translator, 'organize_paragraphs') and hasattr(self.translator, 'available') and self.translator.available:
                 try:
                     if verbose:
                         print(f"\n[3/6] Organizing paragraphs with Gemini for better layout...")
@@ -326,6 +475,7 @@ class BookTranslator:
                         translated_paragraphs, 
                         context=translation_context
                     )
+                    self.checkpoint.save('paragraphs', {'paragraphs': translated_paragraphs})
                     if verbose:
                         print(f"  + Organized into {len(translated_paragraphs)} well-structured paragraphs")
                 except Exception as e:
@@ -339,7 +489,10 @@ class BookTranslator:
             
             try:
                 if verbose:
-                    print(f"  + Reconstructing PDF page with {len(translated_paragraphs)} paragraphs...")
+                    if translation_stream is not None:
+                        print(f"  + Reconstructing PDF page from streamed paragraphs...")
+                    else:
+                        print(f"  + Reconstructing PDF page with {len(translated_paragraphs)} paragraphs...")
                 
                 # Build full page Japanese text for page number extraction
                 full_page_japanese = "\n".join([box.get('text', '') for box in text_boxes if box.get('text')])
@@ -376,6 +529,12 @@ class BookTranslator:
                     traceback.print_exc()
             
             # Record PDF creation result
+            if translation_stream is not None:
+                # Waits for any paragraphs the layout did not need; raises if the
+                # translation failed, so a partial one is never checkpointed
+                english_text = translation_stream.text
+                self.checkpoint.save('translation', {'english_text': english_text})
+
             results['steps']['pdf_creation'] = {
                 'success': pdf_creation_success,
                 'output_file': f"{self.page_name}_translated.pdf",
@@ -394,6 +553,7 @@ class BookTranslator:
             
             # Provide serializable artifact details
             try:
+                from artifacts.schemas import artifacts_to_dict
                 results['steps']['artifact_details'] = {
                     'tables': artifacts_to_dict(tables),
                     'charts': artifacts_to_dict(charts),
@@ -415,10 +575,9 @@ class BookTranslator:
             if verbose:
                 print(f"\n[5/6] Saving translation results...")
             
-            self.text_extractor.save_ocr_results(
-                japanese_text,
-                f"{self.output_dir}/{self.page_name}_japanese.txt"
-            )
+            # Written directly: building the legacy extractor would start Tesseract
+            with open(f"{self.output_dir}/{self.page_name}_japanese.txt", 'w', encoding='utf-8') as f:
+                f.write(japanese_text)
             
             self.translator.save_translation(
                 japanese_text,
@@ -482,6 +641,11 @@ def main():
         help='Output directory (default: output)'
     )
     
+    parser.add_argument(
+        '--checkpoint-dir',
+        help='Save completed stages here and resume from them on the next run'
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
@@ -494,7 +658,12 @@ def main():
         print(f"Error: Input file not found: {args.input}")
         sys.exit(1)
     
-    translator = BookTranslator(args.input, args.output)
+    checkpoint = None
+    if args.checkpoint_dir:
+        from checkpoints import DirectoryCheckpoint
+        checkpoint = DirectoryCheckpoint(args.checkpoint_dir)
+    
+    translator = BookTranslator(args.input, args.output, checkpoint=checkpoint)
     results = translator.process_page(verbose=not args.quiet)
     
     sys.exit(0 if results['success'] else 1)
@@ -0,0 +1,222 @@
+"""
+OCR Backends
+Interchangeable OCR engines that all return the GoogleOCR box schema:
+{'full_text': str, 'text_boxes': [{'text', 'x', 'y', 'w', 'h', 'confidence'}]}
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Union
+
+
+class OCRBackend:
+    """Base class for OCR engines used by the page pipeline"""
+
+    name = "base"
+
+    def __init__(self):
+        self.available = False
+
+    def extract_text_with_boxes(self, image_path: str) -> Dict:
+        """
+        Extract text with word bounding boxes
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Dict with full_text and text_boxes list
+        """
+        raise NotImplementedError
+
+
+class VisionOCRBackend(OCRBackend):
+    """Google Cloud Vision document text detection"""
+
+    name = "vision"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            from google_ocr import GoogleOCR
+            self.ocr = GoogleOCR()
+            self.available = self.ocr.available
+        except Exception as e:
+            print(f"Warning: Google Cloud Vision backend unavailable: {e}")
+            self.ocr = None
+
+    def extract_text_with_boxes(self, image_path: str) -> Dict:
+        if not self.available:
+            raise RuntimeError("Google Cloud Vision API not available")
+        return self.ocr.extract_text_with_boxes(image_path)
+
+
+class TesseractOCRBackend(OCRBackend):
+    """
+    Offline Tesseract OCR over a grid of page tiles
+
+    The page is split into rows x columns tiles (with an overlap margin so
+    words on a seam are seen whole by one tile) and the tiles are recognized
+    concurrently on pooled engines. A word is kept only by the tile whose
+    core area contains its center, so nothing is reported twice.
+    """
+
+    name = "tesseract"
+
+    # Scripts written without spaces between words
+    CJK_LANGUAGES = ('jpn', 'jpn_vert', 'chi_sim', 'chi_tra', 'chi_sim_vert', 'chi_tra_vert')
+
+    def __init__(self, language: str = None, tile_rows: int = None, tile_cols: int = None,
+                 overlap: int = 40, max_workers: int = None):
+        """
+        Args:
+            language: Tesseract language code (default: TESSERACT_LANG or 'jpn')
+            tile_rows: Horizontal bands per page (default: OCR_TILE_ROWS or min(4, CPU count))
+            tile_cols: Vertical columns per page (default: OCR_TILE_COLS or 1)
+            overlap: Pixels each tile extends into its neighbours
+            max_workers: Tiles recognized in parallel (default: number of tiles)
+        """
+        super().__init__()
+        self.language = language or os.getenv('TESSERACT_LANG', 'jpn')
+        self.tile_rows = tile_rows or int(os.getenv('OCR_TILE_ROWS', min(4, os.cpu_count() or 1)))
+        self.tile_cols = tile_cols or int(os.getenv('OCR_TILE_COLS', 1))
+        self.overlap = overlap
+        self.max_workers = max_workers
+
+        try:
+            from ocr_extractor import configure_tesseract
+            from tesseract_pool import get_tesseract_pool
+            _, tessdata_dir = configure_tesseract()
+            self.pool = get_tesseract_pool(tessdata_dir)
+            self.available = True
+        except Exception as e:
+            print(f"Warning: Tesseract backend unavailable: {e}")
+            self.pool = None
+
+    def _tiles(self, height: int, width: int) -> List[Dict]:
+        """Tile grid in reading order (column by column, top to bottom)"""
+        tiles = []
+        for col in range(self.tile_cols):
+            x0 = width * col // self.tile_cols
+            x1 = width * (col + 1) // self.tile_cols
+            for row in range(self.tile_rows):
+                y0 = height * row // self.tile_rows
+                y1 = height * (row + 1) // self.tile_rows
+                tiles.append({
+                    'core': (x0, y0, x1, y1),
+                    'crop': (max(0, x0 - self.overlap), max(0, y0 - self.overlap),
+                             min(width, x1 + self.overlap), min(height, y1 + self.overlap))
+                })
+        return tiles
+
+    def _recognize_tile(self, image, tile: Dict) -> List[List[Dict]]:
+        """OCR one tile; returns its kept boxes grouped by text line, in page coordinates"""
+        cx0, cy0, cx1, cy1 = tile['crop']
+        x0, y0, x1, y1 = tile['core']
+        result = self.pool.recognize(image[cy0:cy1, cx0:cx1], language=self.language, with_lines=True)
+
+        lines = {}
+        for box in result['text_boxes']:
+            box['x'] += cx0
+            box['y'] += cy0
+            center_x = box['x'] + box['w'] / 2
+            center_y = box['y'] + box['h'] / 2
+            if not (x0 <= center_x < x1 and y0 <= center_y < y1):
+                continue
+            lines.setdefault(box.pop('line'), []).append(box)
+        return [lines[line] for line in sorted(lines)]
+
+    def extract_text_with_boxes(self, image_path: str) -> Dict:
+        if not self.available:
+            raise RuntimeError("Tesseract OCR not available")
+
+        import cv2
+
+        image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Could not read image: {image_path}")
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        tiles = self._tiles(*binary.shape[:2])
+        workers = self.max_workers or len(tiles)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tile_lines = list(executor.map(lambda tile: self._recognize_tile(binary, tile), tiles))
+
+        separator = '' if self.language in self.CJK_LANGUAGES else ' '
+        text_boxes = []
+        text_lines = []
+        for lines in tile_lines:
+            for line in lines:
+                text_boxes.extend(line)
+                text_lines.append(separator.join(box['text'] for box in line))
+
+        return {
+            'full_text': "\n".join(text_lines),
+            'text_boxes': text_boxes
+        }
+
+
+class FallbackOCRBackend(OCRBackend):
+    """
+    Tries backends in order, moving on when one is unavailable or fails
+
+    Backends may be given as classes (or other zero-argument factories); those
+    are only constructed when every backend before them has failed, so e.g.
+    the Tesseract pool is not started while Vision is answering.
+    """
+
+    def __init__(self, backends: List[Union[OCRBackend, Callable[[], OCRBackend]]]):
+        super().__init__()
+        self.backends = list(backends)
+        self.available = bool(self.backends)
+        self.name = "+".join(b.name for b in self.backends) or "none"
+        self.last_backend = None
+        self._lock = threading.Lock()
+
+    def _backend(self, index: int) -> OCRBackend:
+        """Backend at `index`, constructing it on first use"""
+        backend = self.backends[index]
+        if not isinstance(backend, OCRBackend):
+            with self._lock:
+                backend = self.backends[index]
+                if not isinstance(backend, OCRBackend):
+                    backend = backend()
+                    self.backends[index] = backend
+        return backend
+
+    def extract_text_with_boxes(self, image_path: str) -> Dict:
+        if not self.available:
+            raise RuntimeError("No OCR backend available")
+
+        last_error = RuntimeError("No OCR backend available")
+        for index in range(len(self.backends)):
+            backend = self._backend(index)
+            if not backend.available:
+                continue
+            try:
+                result = backend.extract_text_with_boxes(image_path)
+                self.last_backend = backend.name
+                return result
+            except Exception as e:
+                print(f"  ! {backend.name} OCR failed ({e}), trying next backend")
+                last_error = e
+        raise last_error
+
+
+def get_ocr_backend(preference: str = None) -> OCRBackend:
+    """
+    Build the OCR backend for the pipeline
+
+    Args:
+        preference: 'auto' (Vision, degrading to Tesseract), 'vision' or 'tesseract'
+            (default: OCR_BACKEND env var or 'auto')
+    """
+    preference = (preference or os.getenv('OCR_BACKEND', 'auto')).lower()
+
+    if preference == 'vision':
+        return VisionOCRBackend()
+    if preference == 'tesseract':
+        return TesseractOCRBackend()
+    return FallbackOCRBackend([VisionOCRBackend(), TesseractOCRBackend])
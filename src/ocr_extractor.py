@@ -9,8 +9,8 @@ import numpy as np
 from typing import List, Tuple, Dict
 import os
 from pathlib import Path
-import subprocess
 from dotenv import load_dotenv
+from tesseract_pool import get_tesseract_pool
 
 # Try to import Google OCR
 try:
@@ -20,6 +20,63 @@ except ImportError:
     GOOGLE_OCR_AVAILABLE = False
 
 
+def configure_tesseract() -> Tuple[str, str]:
+    """
+    Point pytesseract at the configured Tesseract install and locate tessdata
+
+    Returns:
+        (tesseract_cmd, tessdata_dir)
+    """
+    # Load environment variables to get Tesseract path (fallback)
+    load_dotenv()
+    tesseract_path = os.getenv('TESSERACT_PATH')
+    
+    if tesseract_path and os.path.exists(tesseract_path):
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+        # Ensure TESSDATA_PREFIX is set so tesseract can find language data
+        exe_tessdata = os.path.join(os.path.dirname(tesseract_path), 'tessdata')
+        # Only set TESSDATA_PREFIX here if it's not already set (respect .env or user overrides)
+        if not os.getenv('TESSDATA_PREFIX'):
+            if os.path.isdir(exe_tessdata):
+                os.environ['TESSDATA_PREFIX'] = exe_tessdata
+            else:
+                # Fallback: set to parent directory of executable (some installs use this)
+                os.environ['TESSDATA_PREFIX'] = os.path.dirname(tesseract_path)
+    else:
+        print("Warning: TESSERACT_PATH not found or invalid in .env file. "
+              "Assuming 'tesseract' is in the system PATH.")
+
+        # Try a common installation tessdata path as a last resort
+        common_tessdata = "C:\\Program Files\\Tesseract-OCR\\tessdata"
+        if os.path.isdir(common_tessdata):
+            os.environ['TESSDATA_PREFIX'] = common_tessdata
+
+    # Determine tessdata dir to pass explicitly to tesseract calls
+    project_root = Path(__file__).resolve().parents[1]
+    project_tess = project_root / 'tessdata'
+    env_tess = os.getenv('TESSDATA_PREFIX')
+    # Prefer explicit env var if set and valid
+    if env_tess and os.path.isdir(env_tess):
+        tessdata_dir = env_tess
+    # Prefer project-local tessdata if it exists (we may have downloaded traineddata here)
+    elif project_tess.is_dir():
+        tessdata_dir = str(project_tess)
+    else:
+        # fallback to any common installed tessdata directory
+        common_tessdata = "C:\\Program Files\\Tesseract-OCR\\tessdata"
+        if os.path.isdir(common_tessdata):
+            tessdata_dir = common_tessdata
+        else:
+            tessdata_dir = str(project_tess)
+    # tesseract command path (used by pytesseract when tesserocr is unavailable)
+    if tesseract_path and os.path.exists(tesseract_path):
+        tesseract_cmd = tesseract_path
+    else:
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+    return tesseract_cmd, tessdata_dir
+
+
 class TextExtractor:
     """Extracts text from images using Tesseract OCR"""
     
@@ -43,53 +100,10 @@ class TextExtractor:
         if not self.google_ocr:
             print("[WARNING] Using Tesseract OCR (lower quality for Japanese)")
         
-        # Load environment variables to get Tesseract path (fallback)
-        load_dotenv()
-        tesseract_path = os.getenv('TESSERACT_PATH')
-        
-        if tesseract_path and os.path.exists(tesseract_path):
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
-
-            # Ensure TESSDATA_PREFIX is set so tesseract can find language data
-            tessdata_dir = os.path.join(os.path.dirname(tesseract_path), 'tessdata')
-            # Only set TESSDATA_PREFIX here if it's not already set (respect .env or user overrides)
-            if not os.getenv('TESSDATA_PREFIX'):
-                if os.path.isdir(tessdata_dir):
-                    os.environ['TESSDATA_PREFIX'] = tessdata_dir
-                else:
-                    # Fallback: set to parent directory of executable (some installs use this)
-                    os.environ['TESSDATA_PREFIX'] = os.path.dirname(tesseract_path)
-        else:
-            print("Warning: TESSERACT_PATH not found or invalid in .env file. "
-                  "Assuming 'tesseract' is in the system PATH.")
-
-            # Try a common installation tessdata path as a last resort
-            common_tessdata = "C:\\Program Files\\Tesseract-OCR\\tessdata"
-            if os.path.isdir(common_tessdata):
-                os.environ['TESSDATA_PREFIX'] = common_tessdata
+        self.tesseract_cmd, self.tessdata_dir = configure_tesseract()
 
-        # Determine tessdata dir to pass explicitly to tesseract calls
-        project_root = Path(__file__).resolve().parents[1]
-        project_tess = project_root / 'tessdata'
-        env_tess = os.getenv('TESSDATA_PREFIX')
-        # Prefer explicit env var if set and valid
-        if env_tess and os.path.isdir(env_tess):
-            self.tessdata_dir = env_tess
-        # Prefer project-local tessdata if it exists (we may have downloaded traineddata here)
-        elif project_tess.is_dir():
-            self.tessdata_dir = str(project_tess)
-        else:
-            # fallback to any common installed tessdata directory
-            common_tessdata = "C:\\Program Files\\Tesseract-OCR\\tessdata"
-            if os.path.isdir(common_tessdata):
-                self.tessdata_dir = common_tessdata
-            else:
-                self.tessdata_dir = str(project_tess)
-        # store tesseract command path to use in subprocess calls
-        if tesseract_path and os.path.exists(tesseract_path):
-            self.tesseract_cmd = tesseract_path
-        else:
-            self.tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+        # Shared long-lived engines for the Tesseract fallback
+        self.tesseract_pool = get_tesseract_pool(self.tessdata_dir)
     
     def extract_text(self, image_path: str, language: str = 'jpn') -> str:
         """
@@ -133,28 +147,8 @@ class TextExtractor:
         # 3. Simple binary threshold (Otsu's method - automatic threshold selection)
         _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         
-        # Try using tesseract CLI with explicit tessdata dir and PSM mode for better results
-        try:
-            # Save preprocessed image to temp file
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                tmp_path = tmp.name
-                cv2.imwrite(tmp_path, binary)
-            
-            # Use PSM 4 (single column of text) which works well for book pages
-            cmd = [self.tesseract_cmd, '--tessdata-dir', self.tessdata_dir, tmp_path, 'stdout', '-l', language, '--psm', '4']
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-            text = proc.stdout.decode('utf-8', errors='ignore')
-            
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
-            return text
-        except Exception as e:
-            # Fallback to pytesseract if CLI call fails
-            config = '--psm 4'
-            return pytesseract.image_to_string(binary, lang=language, config=config)
+        # Use PSM 4 (single column of text) which works well for book pages
+        return self.tesseract_pool.recognize(binary, language=language, psm=4)['full_text']
     
     def extract_text_with_boxes(self, image_path: str, language: str = 'jpn') -> Dict:
         """
@@ -183,29 +177,26 @@ class TextExtractor:
         height = int(binary.shape[0] * scale_percent / 100)
         binary_scaled = cv2.resize(binary, (width, height), interpolation=cv2.INTER_CUBIC)
         
-        # Get detailed data
-        config = f'--tessdata-dir "{self.tessdata_dir}"'
-        data = pytesseract.image_to_data(binary_scaled, lang=language, config=config, output_type=pytesseract.Output.DICT)
+        # Single OCR pass gives both the boxes and the full text
+        # Only include text with confidence > 30%
+        result = self.tesseract_pool.recognize(binary_scaled, language=language, min_confidence=30)
         
         # Scale back the coordinates to original image size
         scale_factor = 100 / scale_percent
         
         text_boxes = []
-        for i in range(len(data['text'])):
-            if data['conf'][i] > 30:  # Only include text with confidence > 30%
-                box = {
-                    'text': data['text'][i],
-                    'x': int(data['left'][i] * scale_factor),
-                    'y': int(data['top'][i] * scale_factor),
-                    'w': int(data['width'][i] * scale_factor),
-                    'h': int(data['height'][i] * scale_factor),
-                    'confidence': data['conf'][i]
-                }
-                text_boxes.append(box)
+        for box in result['text_boxes']:
+            text_boxes.append({
+                'text': box['text'],
+                'x': int(box['x'] * scale_factor),
+                'y': int(box['y'] * scale_factor),
+                'w': int(box['w'] * scale_factor),
+                'h': int(box['h'] * scale_factor),
+                'confidence': box['confidence']
+            })
         
-        full_text = pytesseract.image_to_string(binary_scaled, lang=language, config=config)
         return {
-            'full_text': full_text,
+            'full_text': result['full_text'],
             'text_boxes': text_boxes
         }
     
@@ -235,24 +226,7 @@ class TextExtractor:
         height = int(binary.shape[0] * scale_percent / 100)
         binary_scaled = cv2.resize(binary, (width, height), interpolation=cv2.INTER_CUBIC)
         
-        # Try using tesseract CLI on a temporary file to ensure tessdata dir is honored
-        try:
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                tmp_path = tmp.name
-                from PIL import Image
-                Image.fromarray(binary_scaled).save(tmp_path)
-            cmd = [self.tesseract_cmd, '--tessdata-dir', self.tessdata_dir, tmp_path, 'stdout', '-l', language]
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-            text = proc.stdout.decode('utf-8', errors='ignore')
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
-            return text
-        except Exception:
-            config = f'--tessdata-dir "{self.tessdata_dir}"'
-            return pytesseract.image_to_string(binary_scaled, lang=language, config=config)
+        return self.tesseract_pool.recognize(binary_scaled, language=language)['full_text']
     
     def save_ocr_results(self, text: str, output_path: str):
         """
@@ -455,7 +455,9 @@ class SmartLayoutReconstructor:
         line_height = font_size * line_height_multiplier
         current_y = self.page_height - self.margin_top
         at_page_top = True
-        paragraph_index = 0
+        # Paragraphs may be a list or a stream that is still being generated;
+        # pull them one at a time so layout can start before translation ends
+        paragraph_iter = iter(translated_paragraphs or [])
         legend_items = []
         
         # INITIALIZE table_queue
@@ -609,9 +611,8 @@ class SmartLayoutReconstructor:
                 # Render Paragraphs
                 section_para_count = len(self._group_into_paragraphs(section.get('boxes', [])))
                 for _ in range(section_para_count):
-                    if paragraph_index >= len(translated_paragraphs): break
-                    para_text = translated_paragraphs[paragraph_index]
-                    paragraph_index += 1
+                    para_text = next(paragraph_iter, None)
+                    if para_text is None: break
                     
                     para_text_clean = para_text.strip()
                     para_text_no_html = re.sub(r'<\s*br\s*/?>', '\n', para_text_clean, flags=re.IGNORECASE)
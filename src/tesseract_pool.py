@@ -0,0 +1,228 @@
+"""
+Tesseract Engine Pool
+Keeps initialized Tesseract engines alive between calls so the offline OCR
+fallback does not pay process start-up and traineddata loading per image
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+import numpy as np
+
+# Prefer the in-process tesserocr API; fall back to pytesseract (one CLI call per pass)
+try:
+    import tesserocr
+    from PIL import Image
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class EngineUnavailable(RuntimeError):
+    """A tesserocr engine could not be created (missing language data, bad path)"""
+
+
+class TesseractPool:
+    """
+    Pool of long-lived Tesseract engines
+
+    Engines are created lazily per (language, page segmentation mode) and
+    reused; at most `size` engines exist per key, so concurrent callers on
+    different threads each get their own engine (tesserocr releases the GIL
+    while recognizing). Every recognition is a single OCR pass that yields
+    both the full text and the word boxes, fed from in-memory images.
+    """
+
+    def __init__(self, tessdata_dir: str = None, size: int = None):
+        """
+        Args:
+            tessdata_dir: Directory containing *.traineddata files
+            size: Maximum engines per (language, psm) (default: TESSERACT_POOL_SIZE or CPU count)
+        """
+        # A directory that does not exist would make every engine fail to start
+        self.tessdata_dir = tessdata_dir if tessdata_dir and os.path.isdir(tessdata_dir) else None
+        self.size = size or int(os.getenv('TESSERACT_POOL_SIZE', os.cpu_count() or 2))
+        self._engines = {}  # (language, psm) -> idle engines (most recently used last)
+        self._created = {}  # (language, psm) -> number of engines created
+        self._unavailable = set()  # (language, psm) keys whose engine could not be created
+        self._changed = threading.Condition()  # Guards the above; notified when an engine frees up or fails
+
+    @contextmanager
+    def engine(self, language: str = 'jpn', psm: int = 3):
+        """
+        Borrow an initialized tesserocr engine, creating one if the pool has room
+
+        Waits for an idle engine when the pool is full. Raises
+        EngineUnavailable (also in waiting threads) once creating an engine
+        for this language has failed.
+        """
+        key = (language, psm)
+        with self._changed:
+            idle = self._engines.setdefault(key, [])
+            while True:
+                if key in self._unavailable:
+                    raise EngineUnavailable(f"Cannot start Tesseract for '{language}'")
+                if idle:
+                    api, create = idle.pop(), False
+                    break
+                if self._created.get(key, 0) < self.size:
+                    self._created[key] = self._created.get(key, 0) + 1
+                    create = True
+                    break
+                self._changed.wait()
+
+        if create:
+            try:
+                kwargs = {'lang': language, 'psm': psm}
+                if self.tessdata_dir:
+                    kwargs['path'] = self.tessdata_dir
+                api = tesserocr.PyTessBaseAPI(**kwargs)
+            except Exception as e:
+                with self._changed:
+                    self._created[key] -= 1
+                    self._unavailable.add(key)
+                    # Threads waiting for this engine must not wait forever
+                    self._changed.notify_all()
+                raise EngineUnavailable(f"Cannot start Tesseract for '{language}': {e}") from e
+
+        try:
+            yield api
+        finally:
+            api.Clear()
+            with self._changed:
+                idle.append(api)
+                # One condition serves every key, so wake all waiters
+                self._changed.notify_all()
+
+    def recognize(self, image: np.ndarray, language: str = 'jpn', psm: int = 3,
+                  min_confidence: float = 30, with_lines: bool = False) -> Dict:
+        """
+        Run one OCR pass over an in-memory image
+
+        Args:
+            image: Grayscale or BGR image as numpy array
+            language: Tesseract language code
+            psm: Page segmentation mode
+            min_confidence: Drop word boxes at or below this confidence (0-100)
+            with_lines: Add a 'line' index to each box (text line it belongs to)
+
+        Returns:
+            Dict with 'full_text' and 'text_boxes' (text, x, y, w, h, confidence)
+        """
+        if TESSEROCR_AVAILABLE and (language, psm) not in self._unavailable:
+            try:
+                return self._recognize_tesserocr(image, language, psm, min_confidence, with_lines)
+            except EngineUnavailable as e:
+                logger.warning(f"{e}; using pytesseract instead")
+        return self._recognize_pytesseract(image, language, psm, min_confidence, with_lines)
+
+    def _recognize_tesserocr(self, image, language, psm, min_confidence, with_lines):
+        if len(image.shape) == 3:
+            # OpenCV images are BGR
+            image = image[:, :, ::-1]
+        pil_image = Image.fromarray(np.ascontiguousarray(image))
+
+        text_boxes = []
+        with self.engine(language, psm) as api:
+            api.SetImage(pil_image)
+            api.Recognize()
+            full_text = api.GetUTF8Text()
+
+            word_level = tesserocr.RIL.WORD
+            line_index = -1
+            iterator = api.GetIterator()
+            for word in tesserocr.iterate_level(iterator, word_level):
+                if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line_index += 1
+                text = word.GetUTF8Text(word_level)
+                confidence = word.Confidence(word_level)
+                bbox = word.BoundingBox(word_level)
+                if not text or bbox is None or confidence <= min_confidence:
+                    continue
+                x1, y1, x2, y2 = bbox
+                box = {
+                    'text': text,
+                    'x': x1,
+                    'y': y1,
+                    'w': x2 - x1,
+                    'h': y2 - y1,
+                    'confidence': confidence
+                }
+                if with_lines:
+                    box['line'] = line_index
+                text_boxes.append(box)
+
+        return {
+            'full_text': full_text,
+            'text_boxes': text_boxes
+        }
+
+    def _recognize_pytesseract(self, image, language, psm, min_confidence, with_lines):
+        import pytesseract
+
+        config = f'--psm {psm}'
+        if self.tessdata_dir:
+            config = f'--tessdata-dir "{self.tessdata_dir}" {config}'
+        data = pytesseract.image_to_data(image, lang=language, config=config, output_type=pytesseract.Output.DICT)
+
+        # Rebuild the plain text from the same pass instead of a second image_to_string call
+        paragraphs = []
+        lines = {}
+        line_ids = {}
+        text_boxes = []
+        for i in range(len(data['text'])):
+            text = data['text'][i]
+            if not text or not text.strip():
+                continue
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            par_key = line_key[:2]
+            if par_key not in lines:
+                lines[par_key] = {}
+                paragraphs.append(par_key)
+            lines[par_key].setdefault(line_key[2], []).append(text)
+            line_ids.setdefault(line_key, len(line_ids))
+
+            confidence = float(data['conf'][i])
+            if confidence <= min_confidence:
+                continue
+            box = {
+                'text': text,
+                'x': int(data['left'][i]),
+                'y': int(data['top'][i]),
+                'w': int(data['width'][i]),
+                'h': int(data['height'][i]),
+                'confidence': confidence
+            }
+            if with_lines:
+                box['line'] = line_ids[line_key]
+            text_boxes.append(box)
+
+        full_text = "\n\n".join(
+            "\n".join(" ".join(words) for words in lines[par_key].values())
+            for par_key in paragraphs
+        )
+        return {
+            'full_text': full_text,
+            'text_boxes': text_boxes
+        }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_tesseract_pool(tessdata_dir: str = None) -> TesseractPool:
+    """Return the process-wide engine pool for a tessdata directory"""
+    key = (os.getpid(), tessdata_dir)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            # Engines never cross a fork: a forked worker builds its own pool
+            pool = TesseractPool(tessdata_dir)
+            _pools[key] = pool
+        return pool
@@ -3,11 +3,8 @@ Translation Module for Book Translator
 Uses Google Cloud Translate API for translation
 """
 
-import os
 from typing import List, Dict
-from pathlib import Path
-from dotenv import load_dotenv
-from google.cloud import translate_v2 as translate
+from clients import get_translate_client
 
 
 class TextTranslator:
@@ -15,19 +12,9 @@ class TextTranslator:
     
     def __init__(self):
         """Initialize the translator with Google Cloud Translate API"""
-        # Load environment variables from .env file (from project root)
-        project_root = Path(__file__).parent.parent.resolve()
-        load_dotenv(project_root / '.env')
-        
-        # Google Cloud Translate uses GOOGLE_APPLICATION_CREDENTIALS env var
-        creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        if creds_path and not os.path.isabs(creds_path):
-            # If relative path, make it absolute from project root
-            creds_path = str(project_root / creds_path)
-            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = creds_path
-        
+        # The shared client loads .env and resolves GOOGLE_APPLICATION_CREDENTIALS
         try:
-            self.client = translate.Client()
+            self.client = get_translate_client()
             self.available = True
             print("[OK] Google Translate API initialized")
         except Exception as e:
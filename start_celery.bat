@@ -12,6 +12,6 @@ REM Activate virtual environment
 call ..\venv\Scripts\activate.bat
 
 REM Start Celery worker
-celery -A app.celery_app worker --loglevel=info --pool=solo -Q translation
+celery -A app.celery_app worker --loglevel=info --pool=solo -Q interactive,batch,exports,maintenance
 
 pause
@@ -15,7 +15,7 @@ def start_worker():
         "worker",
         "--loglevel=info",
         "--pool=solo",  # Windows-compatible pool
-        "-Q", "translation",
+        "-Q", "interactive,batch,exports,maintenance",
         "--concurrency=1"
     ]
     
@@ -0,0 +1,64 @@
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.abspath("src"))
+
+import pytest
+
+import tesseract_pool
+from tesseract_pool import EngineUnavailable, TesseractPool
+
+
+class FailingEngine:
+    """Stands in for tesserocr.PyTessBaseAPI: fails once `release` is set"""
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def __init__(self, **kwargs):
+        FailingEngine.started.set()
+        FailingEngine.release.wait(5)
+        raise RuntimeError("Failed loading language 'jpn'")
+
+
+class FakeTesserocr:
+    PyTessBaseAPI = FailingEngine
+
+
+def test_waiter_is_woken_when_engine_creation_fails(monkeypatch):
+    monkeypatch.setattr(tesseract_pool, "tesserocr", FakeTesserocr, raising=False)
+    pool = TesseractPool(size=1)
+    errors = {}
+
+    def borrow(name):
+        try:
+            with pool.engine('jpn', 3):
+                pass
+        except EngineUnavailable as e:
+            errors[name] = e
+
+    creator = threading.Thread(target=borrow, args=("creator",))
+    creator.start()
+    assert FailingEngine.started.wait(5)
+
+    # The pool is full (one engine being created), so this thread waits
+    waiter = threading.Thread(target=borrow, args=("waiter",))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    FailingEngine.release.set()
+    creator.join(5)
+    waiter.join(5)
+
+    assert not creator.is_alive() and not waiter.is_alive()
+    assert set(errors) == {"creator", "waiter"}
+
+
+def test_missing_tessdata_dir_is_ignored(tmp_path):
+    assert TesseractPool(str(tmp_path / "missing")).tessdata_dir is None
+    assert TesseractPool(str(tmp_path)).tessdata_dir == str(tmp_path)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath("src"))
+
+import pytest
+
+from gemini_translator import TranslationStream
+
+
+def failing_paragraphs():
+    yield "First paragraph"
+    yield "Second paragraph"
+    raise RuntimeError("Gemini stream interrupted")
+
+
+def test_error_is_raised_on_every_pass():
+    stream = TranslationStream(failing_paragraphs())
+
+    # The layout consumes the stream first and hits the failure
+    consumed = []
+    with pytest.raises(RuntimeError):
+        for paragraph in stream:
+            consumed.append(paragraph)
+    assert consumed == ["First paragraph", "Second paragraph"]
+
+    # Later reads must not return the truncated translation as if complete
+    with pytest.raises(RuntimeError):
+        stream.text
+    with pytest.raises(RuntimeError):
+        stream.wait()
+
+
+def test_complete_stream_replays_paragraphs():
+    stream = TranslationStream(iter(["One", "Two"]))
+
+    assert list(stream) == ["One", "Two"]
+    assert stream.text == "One\n\nTwo"
+
+
+if __name__ == "__main__":
+    test_error_is_raised_on_every_pass()
+    test_complete_stream_replays_paragraphs()
+    print("TranslationStream tests passed")
@@ -0,0 +1,88 @@
+"""
+Measure the import cost of the page pipeline modules.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+so the numbers are cold-start costs as a Celery worker child would see them.
+The cumulative time reported for the module itself includes everything it
+pulls in transitively.
+
+Usage:
+    python tools/benchmark_imports.py                 # default module set
+    python tools/benchmark_imports.py main chart_translator --runs 5
+    python tools/benchmark_imports.py --top 15 main   # also list the heaviest dependencies
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+DEFAULT_MODULES = [
+    'main',
+    'ocr_backends',
+    'gemini_translator',
+    'agents.layout_agent',
+    'smart_layout_reconstructor',
+    'diagram_translator',
+    'chart_translator',
+    'agents.table_agent',
+    'ocr_extractor',
+]
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_profile(module: str) -> dict:
+    """Import `module` in a fresh interpreter; returns {module: cumulative_us} for everything it loaded"""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        last_line = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'unknown error'
+        raise RuntimeError(last_line)
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, _, name = match.groups()
+            profile[name] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of pipeline modules")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='Modules to import (relative to src/)')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh-interpreter runs per module (median is reported)')
+    parser.add_argument('--top', type=int, default=0, help='Also list the N heaviest dependencies of each module')
+    args = parser.parse_args()
+
+    print(f"{'module':<32} {'median ms':>10} {'min ms':>10}")
+    print('-' * 54)
+    for module in args.modules:
+        try:
+            profiles = [import_profile(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:<32} {'failed':>10}   ({e})")
+            continue
+
+        timings = [profile.get(module, 0) / 1000 for profile in profiles]
+        print(f"{module:<32} {statistics.median(timings):>10.1f} {min(timings):>10.1f}")
+
+        if args.top:
+            heaviest = sorted(
+                ((name, us) for name, us in profiles[-1].items() if name != module and '.' not in name),
+                key=lambda item: item[1], reverse=True
+            )[:args.top]
+            for name, us in heaviest:
+                print(f"    {name:<28} {us / 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Show the query plans of the hot page queries.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the queries behind page listing,
+uploads, status queueing and the recovery sweeps, and reports how each one
+reads the pages table (which index, or a sequential scan) and how long it
+took. Point it at a real project, or let it seed a synthetic one inside a
+transaction that is rolled back afterwards.
+
+Needs the backend environment (DATABASE_URL, PostgreSQL).
+
+Usage:
+    python tools/explain_page_queries.py                     # largest existing project
+    python tools/explain_page_queries.py --project-id 12
+    python tools/explain_page_queries.py --seed 50000        # synthetic project, rolled back
+    python tools/explain_page_queries.py --seed 50000 --strict --plans
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import text  # noqa: E402
+from app.database import engine  # noqa: E402
+
+QUERIES = [
+    ('list pages (page of 20)', """
+        SELECT * FROM pages WHERE project_id = :project_id
+        ORDER BY page_number LIMIT 20 OFFSET :middle
+    """),
+    ('list pages by status', """
+        SELECT * FROM pages WHERE project_id = :project_id AND status IN ('COMPLETED')
+        ORDER BY page_number LIMIT 20
+    """),
+    ('page number exists (upload)', """
+        SELECT id FROM pages WHERE project_id = :project_id AND page_number = :middle
+    """),
+    ('last page number (upload)', """
+        SELECT max(page_number) FROM pages WHERE project_id = :project_id
+    """),
+    ('pages to queue (queue-by-status)', """
+        SELECT id FROM pages WHERE project_id = :project_id AND status IN ('FAILED', 'UPLOADED')
+    """),
+    ('stuck queued pages (recovery)', """
+        SELECT id FROM pages WHERE status = 'QUEUED' AND updated_at < now() - interval '10 minutes'
+    """),
+    ('expired leases (recovery)', """
+        SELECT id FROM pages WHERE status = 'PROCESSING' AND lease_expires_at < now()
+    """),
+]
+
+
+def seed_project(connection, pages: int) -> int:
+    """Create a project with `pages` pages in mixed statuses (caller rolls back)."""
+    user_id = connection.execute(text("SELECT id FROM users ORDER BY id LIMIT 1")).scalar()
+    if user_id is None:
+        raise SystemExit("Seeding needs at least one user in the database")
+
+    project_id = connection.execute(text("""
+        INSERT INTO projects (user_id, title, status, total_pages, completed_pages)
+        VALUES (:user_id, 'explain_page_queries seed', 'PROCESSING', 0, 0)
+        RETURNING id
+    """), {"user_id": user_id}).scalar()
+
+    connection.execute(text("""
+        INSERT INTO pages (project_id, page_number, original_image_path, status, updated_at)
+        SELECT :project_id, n, 'seed/page_' || n || '.png',
+               CAST((ARRAY['COMPLETED', 'COMPLETED', 'COMPLETED', 'UPLOADED', 'FAILED', 'NEEDS_REVIEW'])[1 + n % 6]
+                    AS pagestatus),
+               now() - n * interval '1 second'
+        FROM generate_series(1, :pages) AS n
+    """), {"project_id": project_id, "pages": pages})
+    connection.execute(text("ANALYZE pages"))
+    return project_id
+
+
+def plan_nodes(node: dict):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield node
+    for child in node.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def describe_access(plan: dict) -> str:
+    """How the plan reads the pages table, e.g. 'Index Scan using ix_...' or 'Seq Scan'."""
+    accesses = []
+    for node in plan_nodes(plan):
+        if node.get('Relation Name') != 'pages':
+            continue
+        access = node['Node Type']
+        if node.get('Index Name'):
+            access += f" using {node['Index Name']}"
+        accesses.append(access)
+    return ', '.join(accesses) or '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot page queries")
+    parser.add_argument('--project-id', type=int, help='Project to query (default: the one with most pages)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed a synthetic project with N pages (rolled back)')
+    parser.add_argument('--plans', action='store_true', help='Also print the full text plans')
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 if any query scans pages sequentially')
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+        try:
+            if args.seed:
+                project_id = seed_project(connection, args.seed)
+            elif args.project_id:
+                project_id = args.project_id
+            else:
+                project_id = connection.execute(text("""
+                    SELECT project_id FROM pages GROUP BY project_id ORDER BY count(*) DESC LIMIT 1
+                """)).scalar()
+                if project_id is None:
+                    raise SystemExit("No pages in the database; use --seed N")
+
+            page_count = connection.execute(
+                text("SELECT count(*) FROM pages WHERE project_id = :project_id"), {"project_id": project_id}
+            ).scalar()
+            params = {"project_id": project_id, "middle": page_count // 2}
+            print(f"Project {project_id}: {page_count} pages\n")
+
+            print(f"{'query':<36} {'ms':>9}  access to pages")
+            print('-' * 100)
+            sequential = []
+            for name, sql in QUERIES:
+                explained = connection.execute(
+                    text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params
+                ).scalar()
+                if isinstance(explained, str):
+                    explained = json.loads(explained)
+                result = explained[0]
+                access = describe_access(result['Plan'])
+                print(f"{name:<36} {result['Execution Time']:>9.2f}  {access}")
+                if 'Seq Scan' in access:
+                    sequential.append(name)
+
+                if args.plans:
+                    for line in connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params):
+                        print(f"    {line[0]}")
+                    print()
+        finally:
+            # Never keep seeded rows (EXPLAIN ANALYZE only reads, but the seed writes)
+            trans.rollback()
+
+    if sequential:
+        print(f"\nSequential scans of pages: {', '.join(sequential)}")
+        if args.strict:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()